@@ -1,13 +1,42 @@
 from dataclasses import dataclass
-from typing import Optional, List, Tuple, Callable, Any
+from collections import deque
+from typing import Optional, List, Tuple, Callable, Any, Deque, Dict, Iterable, TYPE_CHECKING
+import json
 import os
+import sys
+import threading
 import time
-import slack_sdk
-from slack_sdk.errors import SlackApiError
-from RobotSlackNotification.messages import PrincipalMessage, ErrorMessage, build_group_mention_message, TRANSLATIONS
-from robot.libraries.BuiltIn import BuiltIn
+import uuid
+from RobotSlackNotification.messages import (
+    PrincipalMessageRenderer, build_group_mention_message, build_fixed_tests_message,
+    build_regressions_message, build_rerun_summary_message, TRANSLATIONS, RESULT_ICONS, RUNNING_TESTS_LISTED
+)
+from RobotSlackNotification.dispatcher import SlackDispatcher
+from RobotSlackNotification.coalescing import UpdateCoalescer
+from RobotSlackNotification.retry import RetryPolicy, slack_error_code, is_outage
+from RobotSlackNotification.metrics import SlackMetrics, MeteredClient
+from RobotSlackNotification.stats import SuiteStats
+from RobotSlackNotification.suite_index import SuiteGroupIndex
+from RobotSlackNotification.storage import default_cache_dir, token_hash
+from RobotSlackNotification.usergroups import UsergroupCache
+from RobotSlackNotification.parallel import ParallelRun, pabot_run_key, prune_runs
+from RobotSlackNotification.batching import FailureBatch, FailureBatcher
+from RobotSlackNotification.journal import JournalClient
+from RobotSlackNotification.failures import ErrorDedupCache, error_fingerprint
+from RobotSlackNotification.durations import DurationHistory, ProgressEstimator, format_duration, format_minutes
+from RobotSlackNotification.circuit import CircuitBreaker
+from RobotSlackNotification.heartbeat import Heartbeat
+from RobotSlackNotification.resume import ChannelResume, RunState, is_rerun, resolve_run_id
+from RobotSlackNotification.channels import ChannelRouter, ChannelState
 from functools import wraps
-import importlib.util
+
+if TYPE_CHECKING:
+    from RobotSlackNotification.async_transport import AsyncSlackTransport
+    from RobotSlackNotification.failure_store import FailureHistory
+    from RobotSlackNotification.ratelimit import RateLimitedClient
+
+# slack_sdk, BuiltIn e importlib só são importados no primeiro uso: o Robot importa a
+# biblioteca também no libdoc, no dry-run e em cada worker do pabot
 
 @dataclass
 class SlackConfig:
@@ -22,37 +51,148 @@ class SlackNotificationError(Exception):
     """Custom exception for Slack notification errors"""
     pass
 
+class CircuitOpenError(SlackNotificationError):
+    """Raised instead of calling Slack while the circuit breaker is open"""
+    pass
+
+def _builtin():
+    from robot.libraries.BuiltIn import BuiltIn
+    return BuiltIn()
+
+def _slack_api_error() -> type:
+    from slack_sdk.errors import SlackApiError
+    return SlackApiError
+
 def retry_on_slack_error(max_retries: int = 3, delay: int = 1):
+    """Retries Slack calls following a RetryPolicy.
+
+    The policy is read from the listener instance (``self.retry_policy``) at
+    call time, so it can be configured in robot_slack_config.py. Without one,
+    ``max_retries`` and ``delay`` build the default policy. When the instance
+    has ``metrics``, latency, retries and rate-limit waits are recorded there.
+    When it has a ``circuit_breaker``, every attempt goes through it and
+    CircuitOpenError is raised at once while the circuit is open.
+    """
+    default_policy = RetryPolicy(max_attempts=max_retries, base_delay=delay)
+
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            last_error = None
-            for attempt in range(max_retries):
+            instance = args[0] if args else None
+            policy = getattr(instance, "retry_policy", None) or default_policy
+            metrics = getattr(instance, "metrics", None)
+            breaker = getattr(instance, "circuit_breaker", None)
+            limiter = getattr(instance, "rate_limiter", None)
+            operation = func.__name__.lstrip("_")
+            started = time.monotonic()
+            attempt = 0
+            while True:
+                if breaker is not None and not breaker.allow():
+                    raise CircuitOpenError(f"Slack unavailable, {operation} skipped")
+                attempt_started = time.monotonic()
                 try:
-                    return func(*args, **kwargs)
-                except SlackApiError as e:
-                    last_error = e
-                    if attempt < max_retries - 1:
-                        time.sleep(delay * (attempt + 1))  # Retentativa exponencial
-                        continue
-                    raise SlackNotificationError(f"Failed after {max_retries} attempts: {str(e)}") from e
-            raise last_error
+                    response = func(*args, **kwargs)
+                    if breaker is not None:
+                        breaker.record_success(_attempt_latency(attempt_started, limiter))
+                    if metrics:
+                        latency = time.monotonic() - started
+                        metrics.record_call(operation, latency, True)
+                        _log_call(instance, f"{operation}: ok in {latency * 1000:.0f} ms ({attempt + 1} attempt(s))")
+                    return response
+                except (_slack_api_error(), OSError) as e:
+                    attempt_latency = _attempt_latency(attempt_started, limiter)
+                    if breaker is not None:
+                        # Erros da API (ex.: rate limit) mostram que o Slack está respondendo
+                        if is_outage(e):
+                            breaker.record_failure()
+                        else:
+                            breaker.record_success(attempt_latency)
+                    if not policy.is_retryable(e):
+                        _record_failure(instance, operation, started)
+                        raise SlackNotificationError(f"Non-retryable Slack error: {str(e)}") from e
+                    if breaker is not None and not breaker.closed:
+                        # O circuito abriu: não adianta esperar pela próxima tentativa
+                        _record_failure(instance, operation, started)
+                        raise CircuitOpenError(f"Slack unavailable, {operation} skipped: {str(e)}") from e
+                    attempt += 1
+                    if attempt >= policy.max_attempts:
+                        _record_failure(instance, operation, started)
+                        raise SlackNotificationError(f"Failed after {attempt} attempts: {str(e)}") from e
+                    wait = policy.next_delay(e, attempt - 1)
+                    elapsed = time.monotonic() - started
+                    if policy.time_budget is not None and elapsed + wait > policy.time_budget:
+                        _record_failure(instance, operation, started)
+                        raise SlackNotificationError(
+                            f"Retry budget of {policy.time_budget}s exhausted after {attempt} attempts: {str(e)}"
+                        ) from e
+                    if metrics:
+                        metrics.record_retry(operation, wait, slack_error_code(e) == "ratelimited")
+                    time.sleep(wait)
+                except Exception:
+                    if breaker is not None:
+                        breaker.release()
+                    raise
         return wrapper
     return decorator
 
-def load_slack_config():
-    from robot.libraries.BuiltIn import BuiltIn
+def _attempt_latency(started: float, limiter) -> float:
+    """Latency of one attempt, without the time spent waiting for rate-limit permits"""
+    latency = time.monotonic() - started
+    if limiter is not None:
+        latency -= limiter.take_waited()
+    return latency
+
+def _record_failure(instance, operation: str, started: float) -> None:
+    metrics = getattr(instance, "metrics", None)
+    if metrics:
+        latency = time.monotonic() - started
+        metrics.record_call(operation, latency, False)
+        _log_call(instance, f"{operation}: failed after {latency * 1000:.0f} ms")
+
+def _log_call(instance, message: str) -> None:
+    log_debug = getattr(instance, "_log_debug", None)
+    if log_debug:
+        log_debug(message)
+
+# Cache do robot_slack_config.py por caminho: (mtime, configuração já processada)
+_CONFIG_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_CONFIG_LOCK = threading.RLock()
+
+def load_slack_config(reload: bool = False):
+    """Loads robot_slack_config.py once per process and caches the result.
+
+    The file is executed again only when ``reload`` is True or when it sets
+    ``CONFIG_AUTO_RELOAD = True``, and in both cases only if its mtime changed.
+    """
     config_path = os.path.join(os.getcwd(), "robot_slack_config.py")
+    with _CONFIG_LOCK:
+        cached = _CONFIG_CACHE.get(config_path)
+        if cached is not None and not (reload or cached[1]["auto_reload"]):
+            return cached[1]
+        try:
+            mtime = os.path.getmtime(config_path)
+        except OSError:
+            mtime = None
+        if cached is not None and mtime == cached[0]:
+            return cached[1]
+        slack_config = _parse_slack_config(config_path)
+        if slack_config is None:
+            _builtin().log_to_console(
+                f"[ERROR] File robot_slack_config.py not found in the project root. "
+                f"Create the file with the necessary settings before running the tests."
+            )
+            return None
+        _CONFIG_CACHE[config_path] = (mtime, slack_config)
+        return slack_config
+
+def _parse_slack_config(config_path: str) -> Optional[Dict[str, Any]]:
+    import importlib.util
     try:
         spec = importlib.util.spec_from_file_location(
             "robot_slack_config",
             config_path
         )
         if not spec or not os.path.exists(config_path):
-            BuiltIn().log_to_console(
-                f"[ERROR] File robot_slack_config.py not found in the project root. "
-                f"Create the file with the necessary settings before running the tests."
-            )
             return None
         config = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(config)
@@ -64,31 +204,102 @@ def load_slack_config():
         return {
             "token": config.SLACK_API_TOKEN,
             "channel_id": config.SLACK_CHANNEL,
+            "api_url": getattr(config, "SLACK_API_URL", None),
+            "transport": getattr(config, "SLACK_TRANSPORT", "sync"),
+            "async_max_in_flight": getattr(config, "ASYNC_MAX_IN_FLIGHT", 4),
             "suite_groups": getattr(config, "SUITE_SLACK_GROUPS", {}),
-            "debug_logs": getattr(config, 'DEBUG_LOGS', False)
+            "suite_index": SuiteGroupIndex(getattr(config, "SUITE_SLACK_GROUPS", {})),
+            "suite_channels": getattr(config, "SUITE_SLACK_CHANNELS", {}),
+            "channel_router": ChannelRouter(getattr(config, "SUITE_SLACK_CHANNELS", {}), config.SLACK_CHANNEL),
+            "debug_logs": getattr(config, 'DEBUG_LOGS', False),
+            "auto_reload": getattr(config, "CONFIG_AUTO_RELOAD", False),
+            "async_dispatch": getattr(config, "ASYNC_DISPATCH", False),
+            "dispatch_queue_size": getattr(config, "DISPATCH_QUEUE_SIZE", 1000),
+            "dispatch_overflow": getattr(config, "DISPATCH_OVERFLOW", "block"),
+            "dispatch_flush_timeout": getattr(config, "DISPATCH_FLUSH_TIMEOUT", 60),
+            "update_min_interval": getattr(config, "UPDATE_MIN_INTERVAL", 1.0),
+            "retry_max_attempts": getattr(config, "RETRY_MAX_ATTEMPTS", 3),
+            "retry_base_delay": getattr(config, "RETRY_BASE_DELAY", 1.0),
+            "retry_max_delay": getattr(config, "RETRY_MAX_DELAY", 30.0),
+            "retry_jitter": getattr(config, "RETRY_JITTER", 0.5),
+            "retry_time_budget": getattr(config, "RETRY_TIME_BUDGET", 60.0),
+            "retry_fatal_errors": getattr(config, "RETRY_FATAL_ERRORS", []),
+            "circuit_breaker": getattr(config, "CIRCUIT_BREAKER", True),
+            "circuit_failure_threshold": getattr(config, "CIRCUIT_FAILURE_THRESHOLD", 5),
+            "circuit_slow_call_seconds": getattr(config, "CIRCUIT_SLOW_CALL_SECONDS", 10.0),
+            "circuit_reset_timeout": getattr(config, "CIRCUIT_RESET_TIMEOUT", 30.0),
+            "circuit_spool_size": getattr(config, "CIRCUIT_SPOOL_SIZE", 500),
+            "shared_rate_limit": getattr(config, "SHARED_RATE_LIMIT", False),
+            "resume_reruns": getattr(config, "RESUME_RERUNS", True),
+            "run_id": getattr(config, "RUN_ID", None),
+            "rate_limits": getattr(config, "RATE_LIMITS", {}),
+            "rate_limit_burst": getattr(config, "RATE_LIMIT_BURST", 5),
+            "channel_rate_limit": getattr(config, "CHANNEL_RATE_LIMIT", None),
+            "cache_dir": getattr(config, "CACHE_DIR", None) or default_cache_dir(),
+            "usergroup_cache_ttl": getattr(config, "USERGROUP_CACHE_TTL", 86400),
+            "team_id": getattr(config, "SLACK_TEAM_ID", None),
+            "pabot_aggregate": getattr(config, "PABOT_AGGREGATE", True),
+            "failure_batch_size": getattr(config, "FAILURE_BATCH_SIZE", 10),
+            "failure_batch_interval": getattr(config, "FAILURE_BATCH_INTERVAL", 5.0),
+            "failure_batch_max_chars": getattr(config, "FAILURE_BATCH_MAX_CHARS", 12000),
+            "error_max_chars": getattr(config, "ERROR_MAX_CHARS", 3000),
+            "error_tail_chars": getattr(config, "ERROR_TAIL_CHARS", 1000),
+            "error_dedup": getattr(config, "ERROR_DEDUP", True),
+            "error_dedup_size": getattr(config, "ERROR_DEDUP_SIZE", 1000),
+            "error_upload_full": getattr(config, "ERROR_UPLOAD_FULL", False),
+            "failure_history": getattr(config, "FAILURE_HISTORY", False),
+            "failure_history_path": getattr(config, "FAILURE_HISTORY_PATH", None),
+            "failure_history_retention_days": getattr(config, "FAILURE_HISTORY_RETENTION_DAYS", 90),
+            "show_progress": getattr(config, "SHOW_PROGRESS", True),
+            "duration_history": getattr(config, "DURATION_HISTORY", True),
+            "duration_history_size": getattr(config, "DURATION_HISTORY_SIZE", 20000),
+            "duration_history_retention_days": getattr(config, "DURATION_HISTORY_RETENTION_DAYS", 90),
+            "duration_regressions": getattr(config, "DURATION_REGRESSIONS", True),
+            "regression_min_ratio": getattr(config, "REGRESSION_MIN_RATIO", 1.5),
+            "regression_sigmas": getattr(config, "REGRESSION_SIGMAS", 3.0),
+            "regression_min_seconds": getattr(config, "REGRESSION_MIN_SECONDS", 1.0),
+            "regression_min_runs": getattr(config, "REGRESSION_MIN_RUNS", 5),
+            "show_running_tests": getattr(config, "SHOW_RUNNING_TESTS", True),
+            "heartbeat_interval": getattr(config, "HEARTBEAT_INTERVAL", 60.0),
+            "long_running_test_seconds": getattr(config, "LONG_RUNNING_TEST_SECONDS", 600),
+            "offline_mode": getattr(config, "OFFLINE_MODE", False),
+            "journal_path": getattr(config, "JOURNAL_PATH", "robot_slack_journal-{run_id}.jsonl"),
+            "journal_fsync_every": getattr(config, "JOURNAL_FSYNC_EVERY", 50),
+            "metrics_summary": getattr(config, "METRICS_SUMMARY", False),
+            "metrics_json_path": getattr(config, "METRICS_JSON_PATH", None),
+            "metrics_prometheus_path": getattr(config, "METRICS_PROMETHEUS_PATH", None)
         }
     except Exception as e:
         raise SlackNotificationError(f"Error loading robot_slack_config.py: {str(e)}")
 
-def get_slack_usergroup_ids(token):
-    from slack_sdk import WebClient
-    client = WebClient(token=token)
+def get_slack_usergroup_ids(token, client=None, cache: Optional[UsergroupCache] = None,
+                            required: Iterable[str] = (), team_id: Optional[str] = None):
+    """Resolves usergroup handles to IDs, using the on-disk cache when available.
+
+    The cache is only used if it knows every handle in ``required``; otherwise
+    the map is fetched again, since the usergroup may be newer than the cache.
+    """
+    if cache is not None:
+        cached = cache.load()
+        if cached is not None and all(handle in cached for handle in required):
+            return cached
+    if client is None:
+        from slack_sdk import WebClient
+        client = WebClient(token=token)
     try:
         # Para testar o log de erro, descomente a linha abaixo:
-        response = client.usergroups_list()
-        return {g["handle"]: g["id"] for g in response["usergroups"]}
+        response = client.usergroups_list(team_id=team_id) if team_id else client.usergroups_list()
+        usergroups = response["usergroups"]
+        handles = {g["handle"]: g["id"] for g in usergroups}
+        if cache is not None:
+            cache.store(handles, team_id=usergroups[0].get("team_id") if usergroups else None)
+        return handles
     except Exception as e:
         # Exibe log de aviso se DEBUG_LOGS estiver ativo
         try:
-            config_path = os.path.join(os.getcwd(), "robot_slack_config.py")
-            debug_logs = False
-            if os.path.exists(config_path):
-                spec = importlib.util.spec_from_file_location("robot_slack_config", config_path)
-                config = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(config)
-                debug_logs = getattr(config, 'DEBUG_LOGS', False)
-            if debug_logs:
-                BuiltIn().log_to_console(f"[WARN] Could not fetch Slack usergroups: {str(e)}")
+            slack_config = load_slack_config()
+            if slack_config and slack_config.get("debug_logs"):
+                _builtin().log_to_console(f"[WARN] Could not fetch Slack usergroups: {str(e)}")
         except Exception:
             pass
         return {}
@@ -114,39 +325,101 @@ class RobotSlackNotification:
             language=language
         )
         self.config = None
+        self.send_message = send_message
         self.language = language.lower()
         self.ROBOT_LIBRARY_LISTENER = self
         self.client = None
         self.cicd_url = cicd_url
-        self.message_timestamp: List[str] = []
-        self.status_list: List[str] = []
+        # Estado da mensagem principal de cada canal, na ordem em que foram abertos
+        self.channels: Dict[str, ChannelState] = {}
+        self.channel_router: Optional[ChannelRouter] = None
+        # Canal da suite em execução em cada nível
+        self._suite_channels: List[ChannelState] = []
+        self._channel_tests: Optional[Dict[str, List[str]]] = None
+        self.stats = SuiteStats()
         self.text_fallback = None
         self.suite_name: Optional[str] = None
-        self.count_total: int = 0
-        self.count_pass: int = 0
-        self.count_failed: int = 0
-        self.count_skipped: int = 0
         self.general_result_status: Optional[str] = None
         self.suite_result_status: Optional[str] = None
-        self.result_icons_list: Tuple[Tuple[str, str], ...] = (
-            ("white_circle", "26aa"),
-            ("large_green_circle", "1f7e2"),
-            ("red_circle", "1f534"),
-            ("large_yellow_circle", "1f7e1")
-        )
+        self.result_icons_list: Tuple[Tuple[str, str], ...] = RESULT_ICONS
         self.general_result_icon: Optional[Tuple[str, str]] = None
         self.suite_result_icon: Optional[Tuple[str, str]] = None
         self.suite_slack_groups = {}
+        self.suite_group_index = SuiteGroupIndex({})
         self.current_suite_groups = []
-        self.usergroup_handle_to_id = {}
+        self.usergroup_handle_to_id: Optional[dict] = None
+        self.usergroup_cache: Optional[UsergroupCache] = None
+        self.slack_team_id: Optional[str] = None
+        # Um handle fora do cache provoca no máximo uma nova consulta por execução
+        self._usergroups_refetched = False
         self.debug_logs = False
         self.executed_suite_groups = set()
+        self.dispatcher: Optional[SlackDispatcher] = None
+        self.dispatch_flush_timeout: Optional[float] = None
+        self.update_min_interval: float = 1.0
+        self.retry_policy: Optional[RetryPolicy] = None
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        self.rate_limiter: Optional["RateLimitedClient"] = None
+        self.run_id: Optional[str] = None
+        self.resume_run: bool = False
+        self.run_state: Optional[RunState] = None
+        # Envios recusados com o circuito aberto, reenviados quando o Slack voltar
+        self._circuit_spool: Deque[Tuple[Callable, tuple]] = deque()
+        self.circuit_dropped: int = 0
+        self.parallel: Optional[ParallelRun] = None
+        self.pabot_aggregate: bool = False
+        self.cache_dir: Optional[str] = None
+        self._batcher_settings: Dict[str, Any] = {}
+        # (chamadas por minuto, rajada) do orçamento de cada canal, quando CHANNEL_RATE_LIMIT está ativo
+        self._channel_budget: Optional[Tuple[float, float]] = None
+        self.error_dedup: Optional[ErrorDedupCache] = None
+        self.error_upload_full: bool = False
+        self.failure_history_path: Optional[str] = None
+        self.failure_history_retention_days: Optional[float] = None
+        self.failure_history: Optional["FailureHistory"] = None
+        self.show_progress: bool = False
+        self.duration_history_size: Optional[int] = None
+        self.duration_history_retention_days: Optional[float] = None
+        self._regression_settings: Optional[Dict[str, float]] = None
+        self.duration_history: Optional[DurationHistory] = None
+        self.show_running_tests: bool = False
+        self.heartbeat_interval: Optional[float] = None
+        self.long_running_test_seconds: Optional[float] = None
+        self.heartbeat: Optional[Heartbeat] = None
+        self.principal_renderer = PrincipalMessageRenderer(self.language)
+        self.metrics = SlackMetrics()
+        self.metrics_summary: bool = False
+        self.metrics_json_path: Optional[str] = None
+        self.metrics_prometheus_path: Optional[str] = None
+        self.journal: Optional[JournalClient] = None
+        self.transport: Optional["AsyncSlackTransport"] = None
+
+    @property
+    def message_timestamp(self) -> List[str]:
+        """ts of the principal messages already posted, one per channel (compatibility view)"""
+        return [state.ts for state in self.channels.values() if state.ts]
+
+    @property
+    def count_total(self) -> int:
+        return self.stats.total
+
+    @property
+    def count_pass(self) -> int:
+        return self.stats.passed
+
+    @property
+    def count_failed(self) -> int:
+        return self.stats.failed
+
+    @property
+    def count_skipped(self) -> int:
+        return self.stats.skipped
 
     def _log_debug(self, message: str):
         """Method to display debug logs when DEBUG_LOGS is enabled"""
         if self.debug_logs:
             try:
-                BuiltIn().log_to_console(f"[DEBUG] {message}")
+                _builtin().log_to_console(f"[DEBUG] {message}")
             except Exception as e:
                 # Em caso de erro, tenta usar print como fallback
                 print(f"[DEBUG] {message}")
@@ -155,7 +428,9 @@ class RobotSlackNotification:
     def _ensure_config(self):
         if self.config is not None:
             return
+        started = time.perf_counter()
         slack_config = load_slack_config()
+        self.metrics.record_timing("load_config", time.perf_counter() - started)
         if not slack_config:
             raise SlackNotificationError(
                 "File robot_slack_config.py not found. Create the file in the project root before running the tests."
@@ -169,54 +444,565 @@ class RobotSlackNotification:
             send_message=self._init_args["send_message"]
         )
         self.language = self._init_args["language"].lower()
-        self.client = slack_sdk.WebClient(token=self.config.token, timeout=30)
+        self.principal_renderer = PrincipalMessageRenderer(self.language)
+        self.metrics_summary = slack_config["metrics_summary"]
+        self.metrics_json_path = slack_config["metrics_json_path"]
+        self.metrics_prometheus_path = slack_config["metrics_prometheus_path"]
+        if slack_config["offline_mode"] and self.config.send_message:
+            # Sem envio ao Slack: tudo é gravado no journal para ser reenviado depois
+            self.journal = JournalClient(slack_config["journal_path"], slack_config["journal_fsync_every"])
+            self.client = self._metered(self.journal)
+        elif slack_config["transport"] == "async" and self.config.send_message:
+            from RobotSlackNotification.async_transport import AsyncSlackTransport
+            self.transport = AsyncSlackTransport(
+                self.config.token,
+                base_url=slack_config["api_url"],
+                timeout=30,
+                max_in_flight=slack_config["async_max_in_flight"]
+            )
+            self.client = self._metered(self.transport)
+        elif slack_config["transport"] in ("sync", "async"):
+            from slack_sdk import WebClient
+            client_args = {"base_url": slack_config["api_url"]} if slack_config["api_url"] else {}
+            self.client = self._metered(WebClient(token=self.config.token, timeout=30, **client_args))
+        else:
+            raise SlackNotificationError(
+                f"Invalid SLACK_TRANSPORT '{slack_config['transport']}'. Use 'sync' or 'async'"
+            )
+        if slack_config["shared_rate_limit"] and self.journal is None and self.config.send_message:
+            # Execuções simultâneas com o mesmo token dividem o mesmo limite de chamadas
+            from RobotSlackNotification.ratelimit import RateLimitedClient
+            self.rate_limiter = RateLimitedClient(
+                self.client,
+                slack_config["cache_dir"],
+                self.config.token,
+                rate_limits=slack_config["rate_limits"],
+                burst=slack_config["rate_limit_burst"],
+                metrics=self.metrics
+            )
+            self.client = self.rate_limiter
         self.cicd_url = self.config.cicd_url
         # Usa o nome da suite se test_title não estiver definido
         title = self.config.test_title if self.config.test_title else "Test Execution"
         self.text_fallback = f'Application under test: {title}'
         self.suite_slack_groups = slack_config["suite_groups"]
-        self.usergroup_handle_to_id = get_slack_usergroup_ids(self.config.token)
+        self.suite_group_index = slack_config["suite_index"]
+        # Os IDs dos grupos só são resolvidos no close(), se houver menção a enviar
+        self.slack_team_id = slack_config["team_id"]
+        self.usergroup_cache = UsergroupCache(
+            slack_config["cache_dir"], self.config.token, slack_config["usergroup_cache_ttl"], self.slack_team_id
+        )
         
         # Carrega a configuração de debug do slack_config
         self.debug_logs = slack_config.get("debug_logs", False)
         if self.debug_logs:
-            BuiltIn().log_to_console(f"[DEBUG] DEBUG_LOGS configuration loaded: {self.debug_logs}")
+            _builtin().log_to_console(f"[DEBUG] DEBUG_LOGS configuration loaded: {self.debug_logs}")
         
+        self.retry_policy = RetryPolicy.from_config(slack_config)
+        if slack_config["circuit_breaker"]:
+            self.circuit_breaker = CircuitBreaker(
+                failure_threshold=slack_config["circuit_failure_threshold"],
+                slow_call_seconds=slack_config["circuit_slow_call_seconds"],
+                reset_timeout=slack_config["circuit_reset_timeout"]
+            )
+            self._circuit_spool = deque(maxlen=max(1, int(slack_config["circuit_spool_size"])))
+        self.cache_dir = slack_config["cache_dir"]
+        self.pabot_aggregate = slack_config["pabot_aggregate"]
+        self.update_min_interval = slack_config["update_min_interval"]
+        # O journal do modo offline não guarda arquivos
+        self.error_upload_full = slack_config["error_upload_full"] and self.journal is None
+        self._batcher_settings = dict(
+            language=self.language,
+            max_failures=slack_config["failure_batch_size"],
+            max_interval=slack_config["failure_batch_interval"],
+            max_chars=slack_config["failure_batch_max_chars"],
+            max_error_chars=slack_config["error_max_chars"],
+            error_tail_chars=slack_config["error_tail_chars"],
+            attach_truncated=self.error_upload_full
+        )
+        self.channel_router = slack_config["channel_router"]
+        if slack_config["channel_rate_limit"]:
+            self._channel_budget = (float(slack_config["channel_rate_limit"]), slack_config["rate_limit_burst"])
+        if slack_config["error_dedup"]:
+            self.error_dedup = ErrorDedupCache(slack_config["error_dedup_size"])
+        if slack_config["failure_history"]:
+            self.failure_history_path = slack_config["failure_history_path"] or os.path.join(
+                self.cache_dir, "failure_history.sqlite"
+            )
+            self.failure_history_retention_days = slack_config["failure_history_retention_days"]
+        self.show_progress = slack_config["show_progress"]
+        if slack_config["duration_history"]:
+            self.duration_history_size = slack_config["duration_history_size"]
+            self.duration_history_retention_days = slack_config["duration_history_retention_days"]
+            if slack_config["duration_regressions"]:
+                self._regression_settings = dict(
+                    min_ratio=slack_config["regression_min_ratio"],
+                    sigmas=slack_config["regression_sigmas"],
+                    min_seconds=slack_config["regression_min_seconds"],
+                    min_runs=slack_config["regression_min_runs"]
+                )
+        if slack_config["resume_reruns"] and self.journal is None:
+            # Sem um ID da execução não há como saber se é uma reexecução
+            self.run_id = resolve_run_id(slack_config["run_id"])
+            # Só uma reexecução dos testes falhos retoma a mensagem: numa execução completa com o mesmo ID
+            # os testes que já passaram seriam contados de novo
+            self.resume_run = is_rerun(sys.argv)
+        self.show_running_tests = slack_config["show_running_tests"]
+        self.heartbeat_interval = slack_config["heartbeat_interval"]
+        self.long_running_test_seconds = slack_config["long_running_test_seconds"]
+        # O transporte assíncrono só envia em paralelo se as chamadas saírem da thread do teste
+        if (slack_config["async_dispatch"] or self.transport) and self.config.send_message:
+            self.dispatcher = SlackDispatcher(
+                max_size=slack_config["dispatch_queue_size"],
+                overflow=slack_config["dispatch_overflow"],
+                on_error=self._log_dispatch_error,
+                tick=self._on_dispatcher_tick,
+                tick_interval=max(self.update_min_interval, 0.1),
+                workers=self.transport.max_in_flight if self.transport else 1,
+                throttle=self._channel_throttle if slack_config["channel_rate_limit"] else None
+            )
+            self.dispatch_flush_timeout = slack_config["dispatch_flush_timeout"]
+            self._log_debug(
+                f"Async dispatch enabled (queue: {self.dispatcher.max_size}, overflow: {self.dispatcher.overflow}, "
+                f"workers: {self.dispatcher.workers})"
+            )
+        if self._channel_budget and not self.dispatcher:
+            # O orçamento de cada canal é aplicado pelos workers do dispatcher
+            _builtin().log_to_console(
+                '[WARN] CHANNEL_RATE_LIMIT requires ASYNC_DISPATCH or SLACK_TRANSPORT = "async"; ignored'
+            )
+            self._channel_budget = None
+
         self._log_debug("Configuration loaded successfully")
         self._log_debug(f"Debug logs: {'Enabled' if self.debug_logs else 'Disabled'}")
 
+    def _metered(self, client):
+        """Measures every API call of ``client`` when a metrics output is configured"""
+        if self.metrics_summary or self.metrics_json_path or self.metrics_prometheus_path:
+            return MeteredClient(client, self.metrics)
+        return client
+
+    def _refresh_config(self):
+        """Picks up SUITE_SLACK_GROUPS changes when CONFIG_AUTO_RELOAD is enabled"""
+        slack_config = load_slack_config()
+        if slack_config:
+            self.suite_slack_groups = slack_config["suite_groups"]
+            self.suite_group_index = slack_config["suite_index"]
+            self.channel_router = slack_config["channel_router"]
+
+    def _resolve_usergroup_ids(self, handles: Iterable[str] = ()) -> dict:
+        """Lazily resolves the usergroup handle -> ID map, reusing the listener client.
+
+        A handle missing from the map is looked up in Slack once per run.
+        """
+        handles = [handle.lstrip("@") for handle in handles]
+        known = self.usergroup_handle_to_id
+        if known is not None and (self._usergroups_refetched or all(handle in known for handle in handles)):
+            return known
+        started = time.perf_counter()
+        self.usergroup_handle_to_id = get_slack_usergroup_ids(
+            self.config.token, client=self.client, cache=self.usergroup_cache,
+            required=handles, team_id=self.slack_team_id
+        )
+        # Ainda ausente depois da consulta: o grupo não existe, não adianta buscar de novo
+        self._usergroups_refetched = known is not None or any(
+            handle not in self.usergroup_handle_to_id for handle in handles
+        )
+        self.metrics.record_timing("resolve_usergroups", time.perf_counter() - started)
+        return self.usergroup_handle_to_id
+
+    def _log_dispatch_error(self, error: Exception):
+        _builtin().log_to_console(f"[WARN] Slack notification failed in background: {str(error)}")
+
+    def _dispatch(self, func: Callable, *args) -> None:
+        """Runs a Slack call on the dispatcher thread when enabled, inline otherwise"""
+        if self._circuit_spool and self.circuit_breaker.closed:
+            self._drain_circuit_spool()
+        if self.dispatcher:
+            if not self.dispatcher.submit(self._guarded_call, func, *args, order_key=self._order_key(func, args)):
+                self._log_debug(f"Dispatch queue full, call dropped: {func.__name__}")
+            return
+        self._run_inline(func, *args)
+
+    def _order_key(self, func: Callable, args: tuple) -> Tuple[str, str]:
+        """Calls with the same key run in order, one at a time, even with several dispatcher workers"""
+        if func == self._send_principal_update:
+            return args[0].channel_id, "principal"
+        # As demais chamadas respondem na thread da mensagem principal do canal: terminam com (ts, canal)
+        return args[-1], "thread"
+
+    def _channel_throttle(self, order_key: Tuple[str, str]) -> float:
+        """Dispatcher throttle: seconds until the channel of ``order_key`` has budget for one more call"""
+        state = self.channels.get(order_key[0])
+        if state is None or state.budget is None:
+            return 0.0
+        return state.budget.try_acquire()
+
+    def _run_inline(self, func: Callable, *args) -> None:
+        try:
+            self._guarded_call(func, *args)
+        except SlackNotificationError as e:
+            # Uma falha no envio não deve interromper o listener
+            _builtin().log_to_console(f"[WARN] Slack notification failed: {str(e)}")
+
+    def _guarded_call(self, func: Callable, *args) -> None:
+        """Runs a Slack call, keeping it for later if the circuit breaker is open"""
+        try:
+            func(*args)
+        except CircuitOpenError:
+            if func == self._send_principal_update:
+                # A mensagem principal é reconstruída por inteiro no próximo envio
+                args[0].stale = True
+                return
+            if len(self._circuit_spool) == self._circuit_spool.maxlen:
+                self.circuit_dropped += 1
+            self._circuit_spool.append((func, args))
+
+    def _drain_circuit_spool(self, on_worker: bool = False) -> None:
+        """Sends the calls refused while the circuit was open, oldest first.
+
+        On the dispatcher thread (``on_worker``) the calls run right away:
+        submitting them to its own queue could block it forever.
+        """
+        while self._circuit_spool and self.circuit_breaker.closed:
+            try:
+                func, args = self._circuit_spool.popleft()
+            except IndexError:
+                # Outra thread esvaziou a fila entre o teste e o popleft
+                return
+            if on_worker:
+                try:
+                    with self.dispatcher.ordered(self._order_key(func, args)) as acquire:
+                        if not acquire():
+                            # Canal sem orçamento: a chamada volta para o início da fila e sai num próximo tick
+                            self._circuit_spool.appendleft((func, args))
+                            return
+                        self._guarded_call(func, *args)
+                except Exception as e:
+                    self._log_dispatch_error(e)
+            elif self.dispatcher:
+                if not self.dispatcher.submit(self._guarded_call, func, *args, order_key=self._order_key(func, args)):
+                    self._log_debug(f"Dispatch queue full, call dropped: {func.__name__}")
+            else:
+                self._run_inline(func, *args)
+
+    def _channel_state(self, channel_id: str) -> ChannelState:
+        """Returns the state of ``channel_id``, creating it on first use"""
+        state = self.channels.get(channel_id)
+        if state is not None:
+            return state
+        state = ChannelState(
+            channel_id,
+            UpdateCoalescer(self.update_min_interval),
+            FailureBatcher(**self._batcher_settings)
+        )
+        if self._channel_budget:
+            from RobotSlackNotification.ratelimit import TokenBucket
+            per_minute, burst = self._channel_budget
+            state.budget = TokenBucket(per_minute / 60.0, burst)
+        if self.parallel:
+            # Cada canal tem a própria mensagem compartilhada entre os workers
+            state.parallel = ParallelRun(os.path.join(self.parallel.run_dir, channel_id), self.parallel.worker_id)
+            state.parallel.publish(0, 0, 0)
+        elif self.show_progress and self._channel_tests is not None:
+            names = self._channel_tests.get(channel_id, [])
+            state.progress = ProgressEstimator(len(names), self.duration_history, names)
+        if self.run_state is not None:
+            saved = self.run_state.channel(channel_id)
+            state.resume = ChannelResume(saved)
+            if saved:
+                # Reexecução: atualiza a mensagem original em vez de publicar outra
+                state.ts = saved["ts"]
+                state.stats.passed = saved.get("passed", 0)
+                state.stats.failed = saved.get("failed", 0)
+                state.stats.skipped = saved.get("skipped", 0)
+        self.channels[channel_id] = state
+        return state
+
+    def _current_channel(self) -> ChannelState:
+        return self._suite_channels[-1]
+
+    def _request_principal_update(self, state: ChannelState, result, force: bool = False) -> None:
+        """Sends the channel's principal message through its update coalescer"""
+        payload = state.coalescer.offer((state, result, force), force=force)
+        if payload is not None:
+            self._dispatch(self._send_principal_update, *payload)
+
+    def _on_dispatcher_tick(self) -> None:
+        """Dispatcher tick: sends coalesced updates and failure batches that are due"""
+        if self._circuit_spool and self.circuit_breaker.closed:
+            self._drain_circuit_spool(on_worker=True)
+        for state in list(self.channels.values()):
+            if not state.ts:
+                continue
+            # A chave é tomada antes do lote: um lote liberado depois não pode passar à frente.
+            # Só um envio de fato consome o orçamento do canal; sem orçamento, fica para o próximo tick
+            with self.dispatcher.ordered(self._order_key(self._post_thread_message, (state.ts, state.channel_id))) as acquire:
+                if not state.uploads and state.batcher.is_due() and acquire():
+                    batch = state.batcher.take_due()
+                    if batch:
+                        self._guarded_call(self._post_thread_message, None, batch, state.ts, state.channel_id)
+                        state.uploads.extend(batch.attachments)
+                # Os arquivos do lote saem depois dele, cada um com a própria vaga no orçamento
+                while state.uploads and acquire():
+                    self._guarded_call(self._upload_error_text, *state.uploads.popleft(), state.ts, state.channel_id)
+            with self.dispatcher.ordered(self._order_key(self._send_principal_update, (state,))) as acquire:
+                if not (state.coalescer.is_due() or state.stale) or not acquire():
+                    continue
+                payload = state.coalescer.take_due()
+                if payload is None and state.stale:
+                    # Atualização recusada com o circuito aberto: também serve de teste do Slack
+                    payload = (state, None, True)
+                if payload is not None:
+                    self._guarded_call(self._send_principal_update, *payload)
+
+    def _queue_failure(self, state: ChannelState, result) -> None:
+        """Adds a failure to the channel's current batch and posts the batches that are ready"""
+        error = result.message or ""
+        # O mesmo erro já está na thread, publicado pela execução retomada
+        reported = state.resume is not None and state.resume.already_reported(result.longname, error)
+        if self.failure_history is not None:
+            previous_runs = self.failure_history.record_failure(result.longname, error)
+            if previous_runs and not reported:
+                # Falha conhecida: apenas uma linha na thread
+                with state.batch_lock:
+                    for batch in state.batcher.add_known(result.longname, previous_runs):
+                        self._post_batch(state, result, batch)
+                return
+        if reported:
+            return
+        duplicate_of = None
+        if self.error_dedup is not None:
+            duplicate_of = self.error_dedup.first_seen(error_fingerprint(error), result.longname)
+        with state.batch_lock:
+            for batch in state.batcher.add(result.longname, error, duplicate_of=duplicate_of):
+                self._post_batch(state, result, batch)
+
+    def _post_due_batches(self) -> None:
+        """Posts the failure batches whose oldest failure waited FAILURE_BATCH_INTERVAL.
+
+        Runs on the listener thread and on the heartbeat thread: the channel's
+        batch lock keeps a batch taken here from being posted after a newer
+        one released by ``_queue_failure``.
+        """
+        for state in list(self.channels.values()):
+            if not state.ts:
+                continue
+            with state.batch_lock:
+                batch = state.batcher.take_due()
+                if batch:
+                    self._post_batch(state, None, batch)
+
+    def _flush_failures(self, state: ChannelState) -> None:
+        with state.batch_lock:
+            while state.uploads:
+                self._dispatch(self._upload_error_text, *state.uploads.popleft(), state.ts, state.channel_id)
+            batch = state.batcher.take()
+            if batch:
+                self._post_batch(state, None, batch)
+
+    def _post_batch(self, state: ChannelState, result, batch: FailureBatch) -> None:
+        """Posts a failure batch, then the full text of the errors it truncated (ERROR_UPLOAD_FULL)"""
+        self._dispatch(self._post_thread_message, result, batch, state.ts, state.channel_id)
+        for scenario_name, error in batch.attachments:
+            self._dispatch(self._upload_error_text, scenario_name, error, state.ts, state.channel_id)
+
+    def _send_principal_update(self, state: ChannelState, result, force: bool = False) -> None:
+        """Builds the channel's principal message from its current counters and updates it"""
+        def send():
+            with state.lock:
+                message = self._build_principal_message(*self._principal_counters(state), state=state)
+                payload = json.dumps(message, separators=(",", ":"))
+                # Nada mudou desde o último envio: evita um chat_update desnecessário
+                if payload == state.last_payload:
+                    state.stale = False
+                    return
+                self._update_principal_message(result, state.ts, message, state.channel_id)
+                state.last_payload = payload
+                state.stale = False
+
+        if state.parallel:
+            state.parallel.publish(
+                state.stats.passed, state.stats.failed, state.stats.skipped, list(state.running.values())
+            )
+            # Se outro worker atualizou a mensagem há pouco, o próximo envio incluirá estes contadores
+            state.parallel.send_update(send, self.update_min_interval, force=force)
+            return
+        send()
+
+    def _principal_counters(self, state: ChannelState) -> Tuple[int, int, int, int]:
+        """Counters shown in a channel's principal message: the whole parallel run, or this process"""
+        if state.parallel:
+            totals = state.parallel.aggregate()
+            passed, failed, skipped = totals["passed"], totals["failed"], totals["skipped"]
+            return passed + failed + skipped, passed, failed, skipped
+        stats = state.stats
+        return stats.total, stats.passed, stats.failed, stats.skipped
+
+    def _general_status(self, state: ChannelState) -> Tuple[Tuple[str, str], str]:
+        """Icon and text of the general status shown in a channel's principal message"""
+        t = TRANSLATIONS.get(self.language, TRANSLATIONS["en"])
+        if not state.parallel:
+            return state.status or (self.result_icons_list[0], t["in_progress"])
+        # Em execução paralela o status geral depende de todos os workers
+        totals = state.parallel.aggregate()
+        if totals["active"]:
+            return self.result_icons_list[0], t["in_progress"]
+        if totals["failed"]:
+            return self.result_icons_list[2], t["status_failed"]
+        if totals["passed"]:
+            return self.result_icons_list[1], t["status_passed"]
+        return self.result_icons_list[3], t["status_skipped"]
+
+    def _history_scope(self) -> str:
+        """Identifies an execution across runs: channel + title + environment"""
+        title = self.config.test_title or self.suite_name
+        return f"{self.config.channel_id}|{title}|{self.config.environment or ''}"
+
+    def _open_run_state(self) -> None:
+        """Loads the messages posted by a previous run with the same run ID (e.g. before --rerunfailed)"""
+        # Com pabot cada worker já compartilha a mensagem pelo diretório da execução
+        if not self.run_id or self.parallel:
+            return
+        self.run_state = RunState(os.path.join(self.cache_dir, "runs"), self.run_id, self._history_scope())
+        if self.resume_run:
+            self.run_state.load()
+        if self.run_state.channels:
+            self._log_debug(f"Resuming run {self.run_id} from {self.run_state.path}")
+
+    def _save_run_state(self) -> None:
+        for state in self.channels.values():
+            if state.ts and state.resume is not None:
+                self.run_state.update_channel(
+                    state.channel_id, state.ts, state.stats.passed, state.stats.failed, state.stats.skipped,
+                    state.resume
+                )
+        try:
+            self.run_state.save()
+        except OSError as e:
+            _builtin().log_to_console(f"[WARN] Could not save the run state: {str(e)}")
+
+    def _open_failure_history(self) -> None:
+        """Opens the cross-run failure history of this execution"""
+        if not self.failure_history_path:
+            return
+        import sqlite3
+        from RobotSlackNotification.failure_store import FailureHistory
+        scope = self._history_scope()
+        # Em execução paralela todos os workers gravam como a mesma execução
+        run_key = os.path.basename(self.parallel.run_dir) if self.parallel else uuid.uuid4().hex
+        try:
+            self.failure_history = FailureHistory(
+                self.failure_history_path, scope, run_key, self.failure_history_retention_days
+            )
+        except (sqlite3.Error, OSError) as e:
+            _builtin().log_to_console(f"[WARN] Could not open the failure history: {str(e)}")
+            return
+        self._log_debug(f"Failure history loaded from {self.failure_history_path} (previous run: {self.failure_history.previous_run})")
+
+    def _start_progress(self, data) -> None:
+        """Loads the duration history and counts the tests of each channel for the progress/ETA line"""
+        if self.duration_history_size:
+            path = os.path.join(self.cache_dir, f"durations-{token_hash(self._history_scope())}.json")
+            self.duration_history = DurationHistory(
+                path, self.duration_history_size, retention_days=self.duration_history_retention_days
+            ).load()
+        # Em execução paralela cada worker só conhece as próprias suites: sem progresso
+        if self.show_progress and not self.parallel:
+            if self.channel_router.enabled:
+                self._channel_tests = self.channel_router.tests_by_channel(data)
+            else:
+                self._channel_tests = {self.config.channel_id: [test.full_name for test in data.all_tests]}
+
+    def _progress_text(self, state: ChannelState) -> Optional[str]:
+        progress = state.progress
+        if progress is None or not progress.total_tests:
+            return None
+        eta = progress.eta()
+        if not eta or eta < 1:
+            return f"{progress.percent}%"
+        t = TRANSLATIONS.get(self.language, TRANSLATIONS["en"])
+        return t["progress_eta"].format(percent=progress.percent, eta=format_duration(eta))
+
+    def _running_text(self, state: ChannelState) -> Optional[str]:
+        """Running tests of the channel with how long they have been running, longest first"""
+        if not self.show_running_tests:
+            return None
+        running = state.parallel.aggregate()["running"] if state.parallel else list(state.running.values())
+        if not running:
+            return None
+        t = TRANSLATIONS.get(self.language, TRANSLATIONS["en"])
+        now = time.time()
+        running = sorted(running, key=lambda test: test[1])
+        items = []
+        for name, started in running[:RUNNING_TESTS_LISTED]:
+            elapsed = now - started
+            text = t["running_for"].format(test=name, elapsed=format_minutes(elapsed))
+            if self.long_running_test_seconds and elapsed >= self.long_running_test_seconds:
+                text += f" ⚠️ {t['long_running']}"
+            items.append(text)
+        if len(running) > RUNNING_TESTS_LISTED:
+            items.append(t["and_more"].format(count=len(running) - RUNNING_TESTS_LISTED))
+        return ", ".join(items)
+
+    def _start_heartbeat(self) -> None:
+        if self.show_running_tests and self.heartbeat_interval:
+            self.heartbeat = Heartbeat(self.heartbeat_interval, self._heartbeat, on_error=self._log_dispatch_error)
+            self.heartbeat.start()
+
+    def _heartbeat(self) -> None:
+        """Refreshes the elapsed time of running tests through the regular update coalescer.
+
+        Without the dispatcher it also posts the failure batches that are due,
+        so a long test does not hold back the failures before it.
+        """
+        if not self.dispatcher:
+            self._post_due_batches()
+        for state in list(self.channels.values()):
+            if state.ts and state.running:
+                self._request_principal_update(state, None)
+
+    def _setup_parallel_run(self) -> None:
+        """Joins the shared principal message when running under pabot"""
+        if not self.pabot_aggregate:
+            return
+        try:
+            builtin = _builtin()
+            pabotlib_uri = builtin.get_variable_value('${PABOTLIBURI}')
+            if pabotlib_uri is None:
+                return
+            from robot.libraries.Remote import Remote
+            caller_id = builtin.get_variable_value('${CALLER_ID}')
+            run_key = pabot_run_key(caller_id, Remote(pabotlib_uri))
+        except Exception as e:
+            self._log_debug(f"Could not detect pabot run: {str(e)}")
+            return
+        worker_id = f"{os.getpid()}-{caller_id}" if caller_id else None
+        runs_dir = os.path.join(self.cache_dir, "runs")
+        self.parallel = ParallelRun(os.path.join(runs_dir, run_key), worker_id)
+        prune_runs(runs_dir, keep=self.parallel.run_dir)
+        self._log_debug(f"Pabot run detected, aggregating in {self.parallel.run_dir}")
+
     def _get_suite_groups(self, suite_name: str) -> List[str]:
         """Searches for groups configured for the suite at all levels"""
-        groups = []
-        # Divide o nome da suite em partes
-        parts = suite_name.split('.')
-        # Constrói os níveis da suite do mais alto ao mais baixo
-        for i in range(len(parts)):
-            level = '.'.join(parts[:i+1])
-            if level in self.suite_slack_groups:
-                groups.extend(self.suite_slack_groups[level])
-        return list(set(groups))  # Remove duplicatas
+        return self.suite_group_index.all_groups(suite_name)
 
     def _get_suite_groups_hierarchical(self, suite_longname):
         """
         Searches for groups in SUITE_SLACK_GROUPS from the most specific to the most generic.
         """
-        slack_config = load_slack_config()
-        suite_slack_groups = slack_config.get('suite_groups', {})
-        partes = suite_longname.split('.')
-        for i in range(len(partes), 0, -1):
-            chave = '.'.join(partes[:i])
-            grupos = suite_slack_groups.get(chave)
-            if grupos:
-                return grupos
-        return []
+        return self.suite_group_index.most_specific_groups(suite_longname)
 
     def start_suite(self, data, result):
+        # Sem envio não há nada a fazer: nem config, nem client, nem busca de grupos
+        if not self.send_message:
+            return
         self._ensure_config()
+        self._refresh_config()
         self._log_debug(f"Original suite: {result.name}")
         
         try:
-            suite_source = BuiltIn().get_variable_value('${SUITE_SOURCE}')
+            suite_source = _builtin().get_variable_value('${SUITE_SOURCE}')
             self._log_debug(f"SUITE_SOURCE: {suite_source}")
             
             if suite_source:
@@ -255,22 +1041,66 @@ class RobotSlackNotification:
         
         # Atualiza o set de grupos executados
         self.executed_suite_groups.update(self.current_suite_groups)
-        
-        if self.config.send_message and self.message_timestamp == []:
-            self._log_debug("Sending main message...")
-            message = self._build_principal_message(self.count_total, self.count_pass, self.count_failed, self.count_skipped)
-            ts = self._post_principal_message(result, message)
-            self.message_timestamp.append(ts)
-            self._log_debug(f"Message sent with timestamp: {ts}")
+
+        if not self._suite_channels and not self.channels:
+            # Primeira suite da execução
+            self._setup_parallel_run()
+            self._open_run_state()
+            self._open_failure_history()
+            self._start_progress(data)
+            self._start_heartbeat()
+
+        state = self._channel_state(self.channel_router.channel_for(result.longname))
+        state.open_suites += 1
+        state.status = None
+        state.groups.update(self.current_suite_groups)
+        self._suite_channels.append(state)
+
+        # Com roteamento, o canal só recebe mensagem quando uma suite com testes começa
+        if state.ts is None and (data.tests or not self.channel_router.enabled):
+            self._log_debug(f"Sending main message to channel {state.channel_id}...")
+            message = self._build_principal_message(*self._principal_counters(state), state=state)
+            try:
+                if state.parallel:
+                    # Apenas o primeiro worker publica a mensagem principal; os demais reutilizam o ts
+                    state.ts = state.parallel.acquire_principal(
+                        lambda: self._post_principal_message(result, message, state.channel_id)
+                    )
+                else:
+                    state.ts = self._post_principal_message(result, message, state.channel_id)
+                    state.last_payload = json.dumps(message, separators=(",", ":"))
+            except CircuitOpenError as e:
+                # Nova tentativa na próxima suite; os contadores continuam sendo contados
+                _builtin().log_to_console(f"[WARN] {str(e)}")
+                return
+            self._log_debug(f"Message sent with timestamp: {state.ts}")
+
+    def start_test(self, data, result):
+        if self.send_message and self._suite_channels:
+            self._current_channel().running[result.longname] = (result.name, time.time())
 
     def end_test(self, data, result):
-        if self.config.send_message:
+        if self.send_message:
 
-            self.status_list.append(result.status)
-            self.count_pass = self.status_list.count('PASS')
-            self.count_failed = self.status_list.count('FAIL')
-            self.count_skipped = self.status_list.count('SKIP')
-            self.count_total = len(self.status_list)
+            state = self._current_channel()
+            state.running.pop(result.longname, None)
+            elapsed = result.elapsed_time.total_seconds()
+            self.stats.add(result.status, elapsed)
+            state.stats.add(result.status, elapsed)
+            if state.resume is not None:
+                # O resultado anterior do teste reexecutado deixa de ser contado
+                previous = state.resume.test_finished(result.longname, result.status)
+                if previous is not None:
+                    state.stats.remove(previous)
+            if state.progress is not None:
+                state.progress.test_finished(result.longname)
+            if self.duration_history is not None and result.status in ("PASS", "FAIL"):
+                if result.passed and self._regression_settings is not None:
+                    # Compara com o histórico antes de incluir esta execução
+                    mean = self.duration_history.regression(result.longname, elapsed, **self._regression_settings)
+                    if mean is not None:
+                        state.regressions.append((result.longname, elapsed, mean))
+                self.duration_history.record(result.longname, elapsed)
 
             self.suite_result_status = result.status
 
@@ -281,17 +1111,30 @@ class RobotSlackNotification:
             else:
                 self.suite_result_icon = self.result_icons_list[3]
 
+            if result.passed and self.failure_history is not None:
+                if self.failure_history.record_pass(result.longname):
+                    state.fixed.append(result.longname)
+            if state.ts is None:
+                # A mensagem principal do canal não pôde ser enviada
+                return
+
             if result.failed:
-                message = self._build_error_message(result)
-                self._post_thread_message(result, message, self.message_timestamp[0])
+                self._queue_failure(state, result)
+            if not self.dispatcher:
+                # Sem o tick do dispatcher, os lotes vencidos saem ao fim de cada teste
+                self._post_due_batches()
 
-            message = self._build_principal_message(self.count_total, self.count_pass, self.count_failed, self.count_skipped)
-            self._update_principal_message(result, self.message_timestamp[0], message)
+            self._request_principal_update(state, result)
 
     def end_suite(self, data, result):
-        if not self.config.send_message:
+        if not self.send_message:
             return
 
+        if self.metrics_summary and result.parent is None:
+            # Resumo parcial no log do Robot: o close() acontece depois que o log já foi fechado
+            from robot.api import logger
+            logger.info("\n".join(self.metrics.summary_lines()))
+
         t = TRANSLATIONS.get(self.language, TRANSLATIONS["en"])
 
         if result.passed:
@@ -304,16 +1147,33 @@ class RobotSlackNotification:
             self.general_result_icon = self.result_icons_list[3]
             self.general_result_status = t["status_skipped"]
 
-        message = self._build_principal_message(self.count_total, self.count_pass, self.count_failed, self.count_skipped)
-        self._update_principal_message(result, self.message_timestamp[0], message)
+        state = self._suite_channels.pop()
+        state.open_suites -= 1
+        if state.open_suites == 0:
+            # Nenhuma suite do canal em andamento: o status do canal é final.
+            # Com roteamento, o resultado da suite inclui testes de outros canais
+            suite_result = None if self.channel_router.enabled else result
+            if state.stats.failed or (suite_result is not None and suite_result.failed):
+                state.status = (self.result_icons_list[2], t["status_failed"])
+            elif state.stats.passed or (suite_result is not None and suite_result.passed):
+                state.status = (self.result_icons_list[1], t["status_passed"])
+            else:
+                state.status = (self.result_icons_list[3], t["status_skipped"])
+        if state.ts is None:
+            return
+
+        self._flush_failures(state)
+        # Força o envio para que os contadores finais da suite sejam exatos
+        self._request_principal_update(state, result, force=True)
 
     @retry_on_slack_error(max_retries=3)
-    def _post_principal_message(self, result, message: str) -> str:
+    def _post_principal_message(self, result, message: str, channel_id: Optional[str] = None) -> str:
         try:
-            self._log_debug(f"Tentando enviar mensagem para o canal: {self.config.channel_id}")
+            channel_id = channel_id or self.config.channel_id
+            self._log_debug(f"Tentando enviar mensagem para o canal: {channel_id}")
             self._log_debug(f"Token configurado: {bool(self.config.token)}")
             response = self.client.chat_postMessage(
-                channel=self.config.channel_id,
+                channel=channel_id,
                 blocks=message,
                 text=self.text_fallback,
                 unfurl_links=False,
@@ -322,97 +1182,217 @@ class RobotSlackNotification:
             status = "sucesso" if response.get('ok') else "falha"
             self._log_debug(f"Resposta do Slack: {status} (ts: {response.get('ts', 'não disponível')})")
             return response['ts']
-        except SlackApiError as e:
+        except _slack_api_error() as e:
             self._log_debug(f"Erro ao enviar mensagem: {str(e)}")
-            BuiltIn().log_to_console(f"_post_principal_message: Erro na API do Slack: {e.response['error']}")
+            _builtin().log_to_console(f"_post_principal_message: Erro na API do Slack: {e.response['error']}")
             raise
 
     @retry_on_slack_error(max_retries=3)
-    def _post_thread_message(self, result, message, message_ts) -> None:
+    def _post_thread_message(self, result, message, message_ts, channel_id: Optional[str] = None) -> None:
         try:
             self.client.chat_postMessage(
-                channel=self.config.channel_id,
+                channel=channel_id or self.config.channel_id,
                 blocks=message,
                 text=self.text_fallback,
                 thread_ts=message_ts
             )
-        except SlackApiError as e:
-            BuiltIn().log_to_console(f"_post_thread_message: Erro na API do Slack: {e.response['error']}")
+        except _slack_api_error() as e:
+            _builtin().log_to_console(f"_post_thread_message: Erro na API do Slack: {e.response['error']}")
+            raise
+
+    @retry_on_slack_error(max_retries=3)
+    def _upload_error_text(self, scenario_name: str, error_message: str, message_ts,
+                           channel_id: Optional[str] = None) -> None:
+        t = TRANSLATIONS.get(self.language, TRANSLATIONS["en"])
+        try:
+            self.client.files_upload_v2(
+                channel=channel_id or self.config.channel_id,
+                thread_ts=message_ts,
+                content=error_message,
+                filename="error.txt",
+                title=scenario_name,
+                initial_comment=t["full_error_attached"].format(scenario=scenario_name)
+            )
+        except _slack_api_error() as e:
+            _builtin().log_to_console(f"_upload_error_text: Erro na API do Slack: {e.response['error']}")
             raise
 
     @retry_on_slack_error(max_retries=3)
-    def _update_principal_message(self, result, message_timestamp, message: str) -> None:
+    def _update_principal_message(self, result, message_timestamp, message: str,
+                                  channel_id: Optional[str] = None) -> None:
         try:
             self.client.chat_update(
-                channel=self.config.channel_id,
+                channel=channel_id or self.config.channel_id,
                 blocks=message,
                 text=self.text_fallback,
                 ts=message_timestamp
             )
-        except SlackApiError as e:
-            BuiltIn().log_to_console(f"_update_principal_message: Erro na API do Slack: {e.response['error']}")
+        except _slack_api_error() as e:
+            _builtin().log_to_console(f"_update_principal_message: Erro na API do Slack: {e.response['error']}")
             raise
         
-    def _build_principal_message(self, executions, success_executions, failed_executions, skipped_executions):
-        t = TRANSLATIONS.get(self.language, TRANSLATIONS["en"])
+    def _build_principal_message(self, executions, success_executions, failed_executions, skipped_executions,
+                                 state: Optional[ChannelState] = None):
         # Usa o nome da suite se test_title não estiver definido
         title = self.config.test_title if self.config.test_title else self.suite_name
         context_header = f"{title}"
         if self.config.environment:
             context_header += f" | {self.config.environment}"
-        
-        message = PrincipalMessage(
-            context=context_header,
-            environment="",  # Não será usado no header, já está em context_header
-            cicd_url=self.cicd_url,
-            language=self.language
-        )
-        # Atualiza o status geral
-        message.blocks[2] = message.create_status_section(
-            t["general_status"],
-            self.general_result_icon,
-            t,
-            self.general_result_status
-        )
-        # Atualiza os contadores
-        message.blocks[3] = message.create_counter_section(
+
+        if state is not None:
+            general_icon, general_status = self._general_status(state)
+        else:
+            general_icon, general_status = self.general_result_icon, self.general_result_status
+        return self.principal_renderer.render(
+            context_header,
+            self.cicd_url,
+            general_icon,
+            general_status,
             executions,
             success_executions,
             failed_executions,
             skipped_executions,
-            t
+            self._progress_text(state) if state is not None else None,
+            self._running_text(state) if state is not None else None
         )
-        return message.to_dict()['blocks']
 
-    def _build_error_message(self, result):
-        message = ErrorMessage(
-            scenario_name=result.longname,
-            error_message=result.message,
-            language=self.language
-        )
-        return message.to_dict()['blocks']
+    def _export_metrics(self):
+        """Writes the Slack metrics to the console and to the configured export files"""
+        if self.config is None:
+            return
+        if self.metrics_summary:
+            _builtin().log_to_console("\n".join(self.metrics.summary_lines()))
+        try:
+            if self.metrics_json_path:
+                self.metrics.write_json(self.metrics_json_path)
+            if self.metrics_prometheus_path:
+                self.metrics.write_prometheus(self.metrics_prometheus_path)
+        except OSError as e:
+            _builtin().log_to_console(f"[WARN] Could not export Slack metrics: {str(e)}")
 
     def close(self):
         """Method called after all suites have finished"""
-        if not self.config.send_message or not self.message_timestamp:
+        try:
+            if self.heartbeat:
+                self.heartbeat.stop()
+            self._notify_close()
+        finally:
+            if self.dispatcher:
+                if not self.dispatcher.close(self.dispatch_flush_timeout):
+                    _builtin().log_to_console(
+                        f"[WARN] Slack dispatch queue not flushed within {self.dispatch_flush_timeout}s, "
+                        f"pending notifications were discarded"
+                    )
+                if self.dispatcher.dropped:
+                    _builtin().log_to_console(f"[WARN] {self.dispatcher.dropped} Slack notification(s) dropped")
+            if self.circuit_breaker is not None and self.circuit_breaker.opened:
+                unsent = len(self._circuit_spool) + self.circuit_dropped
+                _builtin().log_to_console(
+                    f"[WARN] Slack was unavailable during the run (circuit opened {self.circuit_breaker.opened} "
+                    f"time(s), {self.circuit_breaker.rejected} call(s) skipped, {unsent} notification(s) not sent)"
+                )
+            if self.transport:
+                self.transport.close()
+            if self.run_state is not None:
+                self._save_run_state()
+            if self.duration_history is not None:
+                try:
+                    self.duration_history.save()
+                except OSError as e:
+                    _builtin().log_to_console(f"[WARN] Could not save the test duration history: {str(e)}")
+            if self.failure_history is not None:
+                import sqlite3
+                try:
+                    self.failure_history.close()
+                except sqlite3.Error as e:
+                    _builtin().log_to_console(f"[WARN] Could not save the failure history: {str(e)}")
+            if self.journal:
+                self.journal.close()
+                _builtin().log_to_console(f"Slack notifications saved to journal: {self.journal.path}")
+            self._export_metrics()
+
+    def _notify_close(self):
+        if not self.send_message:
             return
 
-        # Usa apenas os grupos das suites realmente executadas
-        all_groups = set(self.executed_suite_groups)
+        if self.circuit_breaker is not None and not self.circuit_breaker.closed:
+            # Última chance de enviar: testa o Slack agora, sem esperar o fim do intervalo
+            self.circuit_breaker.try_reset()
+            if self._circuit_spool:
+                func, args = self._circuit_spool.popleft()
+                self._run_inline(func, *args)
+            if self._circuit_spool and self.circuit_breaker.closed:
+                self._drain_circuit_spool()
+        for state in self.channels.values():
+            if state.ts:
+                self._notify_channel_close(state)
+
+    def _notify_channel_close(self, state: ChannelState) -> None:
+        self._flush_failures(state)
+
+        if state.fixed:
+            self._dispatch(
+                self._post_thread_message,
+                None,
+                build_fixed_tests_message(state.fixed, self.language),
+                state.ts,
+                state.channel_id
+            )
+
+        if state.resume is not None and state.resume.resumed and (state.resume.fixed or state.resume.still_failing):
+            self._dispatch(
+                self._post_thread_message,
+                None,
+                build_rerun_summary_message(state.resume.fixed, state.resume.still_failing, self.language),
+                state.ts,
+                state.channel_id
+            )
+
+        if state.regressions:
+            self._dispatch(
+                self._post_thread_message,
+                None,
+                build_regressions_message(state.regressions, self.language),
+                state.ts,
+                state.channel_id
+            )
+
+        if state.parallel:
+            # Publica o estado final deste worker e força a atualização com o total agregado
+            state.parallel.finish(state.stats.passed, state.stats.failed, state.stats.skipped)
+            payload = state.coalescer.offer((state, None, True), force=True)
+        else:
+            # Garante que a última atualização pendente seja enviada
+            payload = state.coalescer.take()
+            if payload is None and state.stale:
+                payload = (state, None, True)
+        if payload is not None:
+            self._dispatch(self._send_principal_update, *payload)
+
+        # Usa apenas os grupos das suites realmente executadas neste canal
+        groups = set(state.groups)
+        if state.parallel and state.stats.failed > 0 and groups:
+            # Cada grupo é mencionado uma única vez na execução paralela
+            groups = state.parallel.claim_mentions(groups)
+        elif state.resume is not None and state.stats.failed > 0 and groups:
+            # Numa reexecução, os grupos já mencionados não são chamados de novo
+            groups = state.resume.claim_mentions(groups)
 
         # Se houver falhas e grupos configurados, envia menção
-        if self.count_failed > 0 and all_groups:
-            ids = [
-                self.usergroup_handle_to_id.get(handle.lstrip("@"))
-                for handle in all_groups
-            ]
-            ids = [id_ for id_ in ids if id_]
-            if ids:
-                mention_text = " ".join([f"<!subteam^{gid}>" for gid in ids])
-                plural = len(ids) > 1
-                mention_message = build_group_mention_message(mention_text, plural, self.language)
-                self._post_thread_message(
-                    None,
-                    mention_message,
-                    self.message_timestamp[0]
-                )
+        if state.stats.failed > 0 and groups:
+            # A busca dos grupos roda junto com os últimos envios quando há vários workers
+            self._dispatch(self._post_group_mentions, groups, state.ts, state.channel_id)
+
+    def _post_group_mentions(self, groups, message_ts, channel_id: Optional[str] = None) -> None:
+        """Resolves the usergroup IDs and mentions them in the thread"""
+        handle_to_id = self._resolve_usergroup_ids(groups)
+        ids = [
+            handle_to_id.get(handle.lstrip("@"))
+            for handle in groups
+        ]
+        ids = [id_ for id_ in ids if id_]
+        if ids:
+            mention_text = " ".join([f"<!subteam^{gid}>" for gid in ids])
+            plural = len(ids) > 1
+            mention_message = build_group_mention_message(mention_text, plural, self.language)
+            self._post_thread_message(None, mention_message, message_ts, channel_id)
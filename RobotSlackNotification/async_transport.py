@@ -0,0 +1,94 @@
+from concurrent.futures import Future
+from typing import Any, Optional
+import asyncio
+import threading
+
+
+class AsyncSlackTransport:
+    """Runs ``slack_sdk``'s ``AsyncWebClient`` on a private event loop thread.
+
+    Every call goes through one keep-alive ``aiohttp`` session, so connections
+    are reused across messages, and at most ``max_in_flight`` requests are
+    sent at the same time. Web API methods can be called like on ``WebClient``
+    (``transport.chat_postMessage(...)`` blocks until the response arrives),
+    which makes the transport a drop-in client for threads that send
+    concurrently; ``submit`` returns a future instead. Network errors of
+    ``aiohttp`` are raised as ``ConnectionError``, so they follow the retry
+    policy and the circuit breaker like those of ``WebClient``.
+
+    Requires ``aiohttp`` (``pip install robotframework-slacknotification[async]``).
+    """
+
+    def __init__(self, token: str, base_url: Optional[str] = None,
+                 timeout: float = 30, max_in_flight: int = 4) -> None:
+        try:
+            import aiohttp
+            from slack_sdk.web.async_client import AsyncWebClient
+        except ImportError as e:
+            raise ImportError(
+                "SLACK_TRANSPORT = \"async\" requires aiohttp: "
+                "pip install robotframework-slacknotification[async]"
+            ) from e
+        self.max_in_flight = max(1, int(max_in_flight))
+        # Erros de rede do aiohttp que não herdam de OSError
+        self._network_errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="RobotSlackNotification-transport", daemon=True
+        )
+        self._thread.start()
+        self._closed = False
+
+        async def setup():
+            # A sessão precisa ser criada dentro do loop que vai usá-la
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=60)
+            # O AsyncWebClient só aplica o timeout às sessões que ele mesmo cria
+            session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout))
+            client_args = {"base_url": base_url} if base_url else {}
+            client = AsyncWebClient(token=token, timeout=timeout, session=session, **client_args)
+            return session, client, asyncio.Semaphore(self.max_in_flight)
+
+        self._session, self._client, self._semaphore = self._run(setup())
+
+    def submit(self, method: str, **kwargs) -> Future:
+        """Starts ``method(**kwargs)`` on the event loop and returns its future"""
+        if self._closed:
+            raise RuntimeError("AsyncSlackTransport is closed")
+        return asyncio.run_coroutine_threadsafe(self._call(method, kwargs), self._loop)
+
+    def close(self, timeout: Optional[float] = 10) -> None:
+        """Closes the HTTP session and stops the event loop thread"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._run(self._session.close(), timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self._loop.close()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if not callable(getattr(self._client, name, None)):
+            raise AttributeError(name)
+
+        def call(**kwargs):
+            return self.submit(name, **kwargs).result()
+        call.__name__ = name
+        return call
+
+    async def _call(self, method: str, kwargs: dict) -> Any:
+        async with self._semaphore:
+            try:
+                return await getattr(self._client, method)(**kwargs)
+            except OSError:
+                raise
+            except self._network_errors as e:
+                # Como no WebClient, falhas de rede chegam como OSError e seguem a política de retry
+                raise ConnectionError(f"{type(e).__name__}: {str(e)}") from e
+
+    def _run(self, coroutine, timeout: Optional[float] = None) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
@@ -0,0 +1,154 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+import time
+
+from RobotSlackNotification.failures import error_fingerprint, truncate_error
+from RobotSlackNotification.messages import ErrorMessage, KnownFailuresMessage, TRANSLATIONS
+
+# Limite do Slack por mensagem
+SLACK_MAX_BLOCKS = 50
+# Cada falha ocupa 4 blocos (divisor, cenário, divisor, mensagem de erro)
+BLOCKS_PER_FAILURE = 4
+
+
+class FailureBatch(list):
+    """Blocks of one thread reply.
+
+    ``attachments`` holds the (scenario, full error) pairs of the failures
+    whose message was truncated in it, to be uploaded after the reply.
+    """
+
+    def __init__(self, blocks=(), attachments=()) -> None:
+        super().__init__(blocks)
+        self.attachments: List[Tuple[str, str]] = list(attachments)
+
+
+class FailureBatcher:
+    """Packs several failures into one thread reply.
+
+    A batch is released when it reaches ``max_failures`` entries, when the
+    next failure would not fit Slack's 50-block or ``max_chars`` limits, or
+    when its oldest failure waited ``max_interval`` seconds. Consecutive
+    failures with the same error message collapse into one grouped entry.
+
+    Error messages longer than ``max_error_chars`` keep only their head and
+    their last ``error_tail_chars`` characters. A failure passed with
+    ``duplicate_of`` shows a reference to that test instead of the message.
+    Failures added with ``add_known`` take one line each, and consecutive
+    ones share a single entry.
+
+    With ``attach_truncated``, a batch keeps the full text of the errors it
+    truncated in its ``attachments``, so they go to Slack after the batch.
+    """
+
+    def __init__(self,
+                 language: str = "en",
+                 max_failures: int = 10,
+                 max_interval: float = 5.0,
+                 max_chars: int = 12000,
+                 max_error_chars: int = 3000,
+                 error_tail_chars: int = 1000,
+                 attach_truncated: bool = False,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.language = language
+        self.max_failures = max(1, min(int(max_failures), SLACK_MAX_BLOCKS // BLOCKS_PER_FAILURE))
+        self.max_interval = max(0.0, float(max_interval))
+        self.max_chars = max_chars
+        self.max_error_chars = max_error_chars
+        self.error_tail_chars = error_tail_chars
+        self.attach_truncated = attach_truncated
+        self.clock = clock
+        self._entries: List[Dict[str, Any]] = []
+        self._chars: int = 0
+        self._started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add(self, scenario_name: str, error_message: str, duplicate_of: Optional[str] = None) -> List[FailureBatch]:
+        """Adds a failure and returns the batches (lists of blocks) ready to be posted"""
+        ready = []
+        # Compara pela impressão digital: mensagens enormes não ficam guardadas no lote
+        key = error_fingerprint(error_message)
+        with self._lock:
+            last = self._entries[-1] if self._entries else None
+            if last is not None and last.get("key") == key:
+                last["names"].append(scenario_name)
+                self._chars += len(scenario_name)
+            else:
+                if duplicate_of is not None:
+                    t = TRANSLATIONS.get(self.language, TRANSLATIONS["en"])
+                    text = t["same_error_as"].format(scenario=duplicate_of)
+                else:
+                    text = truncate_error(error_message, self.max_error_chars, self.error_tail_chars)
+                size = len(scenario_name) + len(text)
+                if self._entries and (len(self._entries) >= self.max_failures or self._chars + size > self.max_chars):
+                    ready.append(self._release())
+                entry = {"names": [scenario_name], "key": key, "error": text}
+                # Só o texto completo de erros truncados fica no lote, e só quando vai ser enviado
+                if self.attach_truncated and duplicate_of is None and len(error_message) > self.max_error_chars:
+                    entry["attachment"] = (scenario_name, error_message)
+                self._entries.append(entry)
+                self._chars += size
+                if self._started is None:
+                    self._started = self.clock()
+            if self._is_due():
+                ready.append(self._release())
+        return ready
+
+    def add_known(self, scenario_name: str, previous_runs: int) -> List[FailureBatch]:
+        """Adds a failure already reported in previous runs, shown as a single line"""
+        ready = []
+        size = len(scenario_name) + 32
+        with self._lock:
+            last = self._entries[-1] if self._entries else None
+            if last is not None and "known" in last and self._chars + size <= self.max_chars:
+                last["known"].append((scenario_name, previous_runs))
+            else:
+                if self._entries and (len(self._entries) >= self.max_failures or self._chars + size > self.max_chars):
+                    ready.append(self._release())
+                self._entries.append({"known": [(scenario_name, previous_runs)]})
+                if self._started is None:
+                    self._started = self.clock()
+            self._chars += size
+            if self._is_due():
+                ready.append(self._release())
+        return ready
+
+    def is_due(self) -> bool:
+        """True if ``take_due`` would return a batch now"""
+        with self._lock:
+            return bool(self._entries) and self._is_due()
+
+    def take_due(self) -> Optional[FailureBatch]:
+        """Returns the pending batch if its oldest failure waited long enough"""
+        with self._lock:
+            if self._entries and self._is_due():
+                return self._release()
+            return None
+
+    def take(self) -> Optional[FailureBatch]:
+        """Returns the pending batch regardless of its age"""
+        with self._lock:
+            if not self._entries:
+                return None
+            return self._release()
+
+    def _is_due(self) -> bool:
+        return self._started is not None and self.clock() - self._started >= self.max_interval
+
+    def _release(self) -> FailureBatch:
+        entries, self._entries = self._entries, []
+        self._chars = 0
+        self._started = None
+        blocks = FailureBatch(attachments=[entry["attachment"] for entry in entries if "attachment" in entry])
+        for entry in entries:
+            if "known" in entry:
+                blocks.extend(KnownFailuresMessage(entry["known"], self.language).to_dict()['blocks'])
+                continue
+            names = entry["names"]
+            message = ErrorMessage(
+                scenario_name=names[0] if len(names) == 1 else names,
+                error_message=entry["error"],
+                language=self.language
+            )
+            blocks.extend(message.to_dict()['blocks'])
+        return blocks
@@ -0,0 +1,92 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+import threading
+
+from RobotSlackNotification.batching import FailureBatcher
+from RobotSlackNotification.coalescing import UpdateCoalescer
+from RobotSlackNotification.durations import ProgressEstimator
+from RobotSlackNotification.parallel import ParallelRun
+from RobotSlackNotification.resume import ChannelResume
+from RobotSlackNotification.stats import SuiteStats
+from RobotSlackNotification.suite_index import SuiteGroupIndex
+
+if TYPE_CHECKING:
+    from RobotSlackNotification.ratelimit import TokenBucket
+
+
+class ChannelState:
+    """Principal message of one Slack channel and everything pending for it.
+
+    Every channel routed by SUITE_SLACK_CHANNELS gets its own counters,
+    update coalescer, failure batcher and, with CHANNEL_RATE_LIMIT, its own
+    call budget, so a noisy channel never delays the messages of another one.
+    """
+    __slots__ = ("channel_id", "ts", "stats", "coalescer", "batcher", "last_payload",
+                 "groups", "open_suites", "status", "parallel", "progress", "running", "regressions",
+                 "resume", "stale", "lock", "batch_lock", "uploads", "budget", "fixed")
+
+    def __init__(self, channel_id: str, coalescer: UpdateCoalescer, batcher: FailureBatcher) -> None:
+        self.channel_id = channel_id
+        self.ts: Optional[str] = None
+        self.stats = SuiteStats()
+        self.coalescer = coalescer
+        self.batcher = batcher
+        self.last_payload: Optional[str] = None
+        # Grupos das suites executadas neste canal (menção no close)
+        self.groups: Set[str] = set()
+        # Suites deste canal em andamento: o status só é final quando chega a zero
+        self.open_suites: int = 0
+        self.status: Optional[Tuple[Tuple[str, str], str]] = None
+        self.parallel: Optional[ParallelRun] = None
+        self.progress: Optional[ProgressEstimator] = None
+        # Testes em execução: longname -> (nome, início em epoch)
+        self.running: Dict[str, Tuple[str, float]] = {}
+        # Testes deste canal que falharam na execução anterior e agora passaram
+        self.fixed: List[str] = []
+        # Testes mais lentos que o histórico: (longname, duração, média)
+        self.regressions: List[Tuple[str, float, float]] = []
+        # Estado da execução retomada (RUN_ID), quando habilitado
+        self.resume: Optional[ChannelResume] = None
+        # Uma atualização foi recusada pelo circuit breaker e ainda não foi reenviada
+        self.stale: bool = False
+        # Apenas uma atualização da mensagem principal do canal por vez
+        self.lock = threading.Lock()
+        # Tirar um lote do batcher e enviá-lo é uma operação só: o heartbeat e o listener usam o mesmo batcher
+        self.batch_lock = threading.RLock()
+        # Erros completos de um lote já publicado pelo tick, à espera de orçamento: (cenário, erro)
+        self.uploads: Deque[Tuple[str, str]] = deque()
+        # Chamadas por minuto deste canal, aplicadas pelo dispatcher (CHANNEL_RATE_LIMIT)
+        self.budget: Optional["TokenBucket"] = None
+
+
+class ChannelRouter:
+    """Maps suite longnames to channels using SUITE_SLACK_CHANNELS.
+
+    Keys follow the SUITE_SLACK_GROUPS syntax (dotted prefixes, globs and
+    ``re:`` patterns) and the most specific match wins; suites without a
+    match go to ``default_channel``.
+    """
+
+    def __init__(self, suite_channels: Dict[str, str], default_channel: str) -> None:
+        self.default_channel = default_channel
+        self.enabled = bool(suite_channels)
+        self._index = SuiteGroupIndex({key: [channel] for key, channel in (suite_channels or {}).items()})
+
+    def channel_for(self, suite_longname: str) -> str:
+        if not self.enabled:
+            return self.default_channel
+        channels = self._index.most_specific_groups(suite_longname)
+        return channels[-1] if channels else self.default_channel
+
+    def tests_by_channel(self, suite) -> Dict[str, List[str]]:
+        """Longnames of the tests of a running suite model, grouped by channel"""
+        tests: Dict[str, List[str]] = {}
+        pending = [suite]
+        while pending:
+            current = pending.pop()
+            if current.tests:
+                tests.setdefault(self.channel_for(current.full_name), []).extend(
+                    test.full_name for test in current.tests
+                )
+            pending.extend(current.suites)
+        return tests
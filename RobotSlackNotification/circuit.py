@@ -0,0 +1,83 @@
+from typing import Callable, Optional
+import threading
+import time
+
+
+class CircuitBreaker:
+    """Stops calling Slack while it is down or too slow.
+
+    The circuit opens after ``failure_threshold`` consecutive failed calls;
+    calls slower than ``slow_call_seconds`` count as failures. While open,
+    ``allow()`` rejects every call without touching the network. After
+    ``reset_timeout`` seconds a single probe call is let through (half-open):
+    its success closes the circuit, its failure opens it again.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, slow_call_seconds: Optional[float] = 10.0,
+                 reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = max(0.0, float(reset_timeout))
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures: int = 0
+        # Quantas vezes o circuito abriu e quantas chamadas foram recusadas
+        self.opened: int = 0
+        self.rejected: int = 0
+        self._opened_at: float = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def closed(self) -> bool:
+        return self.state == self.CLOSED
+
+    def allow(self) -> bool:
+        """Returns True if a call may be sent to Slack now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probing:
+                # Apenas uma chamada de teste por vez enquanto meio aberto
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: float = 0.0) -> None:
+        if self.slow_call_seconds is not None and latency > self.slow_call_seconds:
+            self.record_failure()
+            return
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = self.clock()
+                self.opened += 1
+
+    def release(self) -> None:
+        """Ends a call that neither succeeded nor failed against Slack (e.g. a bug in the caller).
+
+        A half-open probe ending this way lets the next call probe again
+        instead of leaving the circuit waiting for a result that never comes.
+        """
+        with self._lock:
+            self._probing = False
+
+    def try_reset(self) -> None:
+        """Lets the next call probe Slack without waiting for ``reset_timeout``"""
+        with self._lock:
+            if self.state == self.OPEN:
+                self.state = self.HALF_OPEN
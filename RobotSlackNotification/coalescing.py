@@ -0,0 +1,54 @@
+from typing import Any, Callable, Optional
+import threading
+import time
+
+
+class UpdateCoalescer:
+    """Debounces principal-message updates.
+
+    Only the latest offered payload is kept, and it is released at most once
+    every ``min_interval`` seconds. A forced offer (end of suite, close)
+    always releases the latest payload so the final counters are exact.
+    """
+
+    def __init__(self, min_interval: float = 1.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.min_interval = max(0.0, float(min_interval))
+        self.clock = clock
+        self._pending: Optional[Any] = None
+        self._last_sent: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def offer(self, payload: Any, force: bool = False) -> Optional[Any]:
+        """Stores ``payload`` and returns the payload to send now, or None to wait"""
+        with self._lock:
+            self._pending = payload
+            if force or self._is_due():
+                return self._release()
+            return None
+
+    def is_due(self) -> bool:
+        """True if ``take_due`` would return a payload now"""
+        with self._lock:
+            return self._pending is not None and self._is_due()
+
+    def take_due(self) -> Optional[Any]:
+        """Returns the pending payload if the minimum interval has elapsed"""
+        with self._lock:
+            if self._pending is not None and self._is_due():
+                return self._release()
+            return None
+
+    def take(self) -> Optional[Any]:
+        """Returns the pending payload regardless of the interval"""
+        with self._lock:
+            if self._pending is None:
+                return None
+            return self._release()
+
+    def _is_due(self) -> bool:
+        return self._last_sent is None or self.clock() - self._last_sent >= self.min_interval
+
+    def _release(self) -> Any:
+        payload, self._pending = self._pending, None
+        self._last_sent = self.clock()
+        return payload
@@ -0,0 +1,219 @@
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterator, Optional
+import threading
+import time
+
+OVERFLOW_POLICIES = ("block", "drop_newest", "drop_oldest")
+
+
+class SlackDispatcher:
+    """Sends Slack calls from a dedicated worker thread.
+
+    Calls are kept in a bounded FIFO queue, so the listener thread only pays
+    for an enqueue. When the queue is full, ``overflow`` decides what happens:
+
+    - ``block``: wait until the worker frees a slot (no notification is lost)
+    - ``drop_newest``: discard the call being submitted
+    - ``drop_oldest``: discard the oldest queued call to make room
+
+    ``tick`` is called on the worker thread whenever the queue has been idle
+    for ``tick_interval`` seconds, which lets debounced work be sent late.
+
+    With ``workers`` > 1, calls start in FIFO order but run concurrently;
+    only the first worker runs ``tick``. Calls submitted with the same
+    ``order_key`` still run one at a time, in the order they were queued.
+
+    ``throttle(order_key)`` may return the seconds a keyed call must still
+    wait (0 when it can start); the workers skip it and run the calls of
+    other keys in the meantime.
+    """
+
+    def __init__(self,
+                 max_size: int = 1000,
+                 overflow: str = "block",
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 tick: Optional[Callable[[], None]] = None,
+                 tick_interval: float = 1.0,
+                 workers: int = 1,
+                 throttle: Optional[Callable[[Hashable], float]] = None,
+                 name: str = "RobotSlackNotification-dispatcher") -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid overflow policy '{overflow}'. Use one of: {', '.join(OVERFLOW_POLICIES)}"
+            )
+        self.max_size = max(1, int(max_size))
+        self.overflow = overflow
+        self.on_error = on_error
+        self.tick = tick
+        self.tick_interval = max(0.05, float(tick_interval))
+        self.throttle = throttle
+        self.dropped: int = 0
+        self._items = deque()
+        # Chamadas na fila + chamadas em execução
+        self._pending: int = 0
+        # Chaves com uma chamada em execução: as seguintes com a mesma chave esperam
+        self._active_keys = set()
+        # Menor espera pedida pelo throttle na última busca por uma chamada
+        self._retry_in: Optional[float] = None
+        self._closing = False
+        self._cond = threading.Condition()
+        self._workers = [
+            threading.Thread(
+                target=self._run, args=(index == 0,),
+                name=name if index == 0 else f"{name}-{index}", daemon=True
+            )
+            for index in range(max(1, int(workers)))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, func: Callable, *args, order_key: Optional[Hashable] = None, **kwargs) -> bool:
+        """Queues ``func(*args, **kwargs)``. Returns False when the call was dropped."""
+        with self._cond:
+            if self._closing:
+                self.dropped += 1
+                return False
+            while len(self._items) >= self.max_size:
+                if self.overflow == "drop_newest":
+                    self.dropped += 1
+                    return False
+                if self.overflow == "drop_oldest":
+                    self._items.popleft()
+                    self._pending -= 1
+                    self.dropped += 1
+                    break
+                self._cond.wait()
+            self._items.append((order_key, func, args, kwargs))
+            self._pending += 1
+            self._cond.notify_all()
+            return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every queued call was sent. Returns False if the deadline expired."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending:
+                if deadline is None:
+                    self._cond.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flushes the queue within ``timeout`` seconds and stops the worker.
+
+        Calls still queued when the deadline expires are discarded and counted in ``dropped``.
+        """
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closing = True
+            if not flushed:
+                self.dropped += len(self._items)
+                self._pending -= len(self._items)
+                self._items.clear()
+            self._cond.notify_all()
+        if flushed:
+            for worker in self._workers:
+                worker.join(timeout)
+        return flushed
+
+    @contextmanager
+    def ordered(self, order_key: Optional[Hashable]) -> Iterator[Callable[[], bool]]:
+        """Runs a block on the calling thread as if it were a call queued with ``order_key``.
+
+        Waits for the running call with the same key, if any, and keeps the
+        next ones from starting until the block ends. Meant for ``tick``,
+        which must not queue work behind itself. Yields ``acquire``: the block
+        calls it right before each Slack call it sends, and gets False when
+        ``throttle`` asks the key to wait (the work should be left for later).
+        Entering the block alone never takes a permit from the throttle.
+        """
+        if order_key is None:
+            yield lambda: True
+            return
+        with self._cond:
+            while order_key in self._active_keys:
+                self._cond.wait()
+            self._active_keys.add(order_key)
+        try:
+            yield lambda: not self.throttle or self.throttle(order_key) <= 0
+        finally:
+            with self._cond:
+                self._active_keys.discard(order_key)
+                self._cond.notify_all()
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return self._pending
+
+    @property
+    def workers(self) -> int:
+        return len(self._workers)
+
+    def _take(self):
+        """Removes the oldest queued call free to start now; caller holds ``_cond``"""
+        self._retry_in = None
+        # Chaves puladas nesta busca: as chamadas seguintes da mesma chave também esperam
+        waiting = set()
+        for index, item in enumerate(self._items):
+            order_key = item[0]
+            if order_key is not None:
+                if order_key in self._active_keys or order_key in waiting:
+                    continue
+                wait = self.throttle(order_key) if self.throttle else 0.0
+                if wait > 0:
+                    waiting.add(order_key)
+                    self._retry_in = wait if self._retry_in is None else min(self._retry_in, wait)
+                    continue
+                self._active_keys.add(order_key)
+            del self._items[index]
+            # Libera espaço para quem estiver bloqueado no submit
+            self._cond.notify_all()
+            return item
+        return None
+
+    def _wait_timeout(self, ticks: bool) -> Optional[float]:
+        timeouts = [self._retry_in] if self._retry_in is not None else []
+        if ticks:
+            timeouts.append(self.tick_interval)
+        return min(timeouts) if timeouts else None
+
+    def _run(self, ticks: bool = True) -> None:
+        tick = self.tick if ticks else None
+        while True:
+            with self._cond:
+                item = self._take()
+                if item is None and (self._items or not self._closing):
+                    # Chamadas na fila podem estar esperando uma chave em execução ou o throttle
+                    self._cond.wait(self._wait_timeout(tick is not None))
+                    item = self._take()
+                if item is None and self._closing and not self._items:
+                    return
+            if item is None:
+                if tick:
+                    self._call(tick)
+                continue
+            order_key, func, args, kwargs = item
+            try:
+                self._call(func, *args, **kwargs)
+            finally:
+                with self._cond:
+                    self._pending -= 1
+                    if order_key is not None:
+                        self._active_keys.discard(order_key)
+                    self._cond.notify_all()
+
+    def _call(self, func: Callable, *args, **kwargs) -> None:
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            if self.on_error:
+                try:
+                    self.on_error(e)
+                except Exception:
+                    pass
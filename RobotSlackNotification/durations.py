@@ -0,0 +1,165 @@
+from typing import Dict, List, Optional
+import math
+import time
+
+from RobotSlackNotification.filelock import FileLock
+from RobotSlackNotification.storage import read_json, write_json_atomic
+
+
+class DurationHistory:
+    """Per-test durations kept across runs in a compact JSON file.
+
+    Each test keeps an exponentially weighted mean and variance of its
+    duration, the number of samples and when it last ran: ``[mean, variance,
+    count, last_seen]``. Updates are O(1); ``save()`` merges this run's
+    samples into the file under a lock (pabot workers share it), drops the
+    tests that have not run for ``retention_days`` (removed or renamed
+    tests) and evicts the least recently run beyond ``max_entries``.
+    """
+
+    def __init__(self, path: str, max_entries: int = 20000, alpha: float = 0.3,
+                 retention_days: Optional[float] = 90) -> None:
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.alpha = alpha
+        self.retention_days = retention_days
+        self._entries: Dict[str, List[float]] = {}
+        # Testes atualizados nesta execução: só eles são gravados no save()
+        self._updated: Dict[str, List[float]] = {}
+
+    def load(self) -> "DurationHistory":
+        data = read_json(self.path)
+        if isinstance(data, dict) and isinstance(data.get("tests"), dict):
+            self._entries = data["tests"]
+        return self
+
+    def mean(self, test: str) -> Optional[float]:
+        entry = self._entries.get(test)
+        return entry[0] if entry else None
+
+    def stats(self, test: str) -> Optional[List[float]]:
+        """``[mean, variance, count, last_seen]`` of ``test``, or None if it never ran"""
+        return self._entries.get(test)
+
+    def known_means(self) -> List[float]:
+        return [entry[0] for entry in self._entries.values()]
+
+    def regression(self, test: str, duration: float, min_ratio: float = 1.5, sigmas: float = 3.0,
+                   min_seconds: float = 1.0, min_runs: int = 5) -> Optional[float]:
+        """Returns the baseline mean if ``duration`` is a regression for ``test``, otherwise None.
+
+        Must be called before the duration is recorded. The duration must be
+        at least ``min_ratio`` times the mean, ``min_seconds`` above it and
+        beyond ``sigmas`` standard deviations, with ``min_runs`` samples.
+        """
+        entry = self._entries.get(test)
+        if entry is None or entry[2] < min_runs:
+            return None
+        mean, variance = entry[0], entry[1]
+        excess = duration - mean
+        if excess < min_seconds or duration < mean * min_ratio or excess <= sigmas * math.sqrt(max(variance, 0.0)):
+            return None
+        return mean
+
+    def record(self, test: str, duration: float) -> None:
+        entry = self._entries.get(test)
+        if entry is None:
+            entry = [duration, 0.0, 1, time.time()]
+        else:
+            mean, variance, count = entry[0], entry[1], entry[2]
+            # Média e variância com peso exponencial: execuções recentes pesam mais
+            diff = duration - mean
+            increment = self.alpha * diff
+            entry = [mean + increment, (1 - self.alpha) * (variance + diff * increment), count + 1, time.time()]
+        self._entries[test] = self._updated[test] = entry
+
+    def save(self) -> None:
+        if not self._updated:
+            return
+        with FileLock(self.path + ".lock"):
+            data = read_json(self.path)
+            tests = data["tests"] if isinstance(data, dict) and isinstance(data.get("tests"), dict) else {}
+            tests.update(self._updated)
+            if self.retention_days:
+                # Testes que não rodam há muito tempo provavelmente não existem mais
+                cutoff = time.time() - self.retention_days * 86400
+                tests = {name: entry for name, entry in tests.items() if entry[3] >= cutoff}
+            if len(tests) > self.max_entries:
+                # Remove os testes que não rodam há mais tempo
+                keep = sorted(tests.items(), key=lambda item: item[1][3], reverse=True)[:self.max_entries]
+                tests = dict(keep)
+            write_json_atomic(self.path, {"version": 1, "tests": tests})
+        self._updated.clear()
+
+
+class ProgressEstimator:
+    """Percent complete and ETA of a run, updated in O(1) per finished test.
+
+    The expected duration of the whole run is summed once from the history
+    when the run starts; tests without history count as the average known
+    test. Without any history, the ETA extrapolates the average duration
+    of the tests finished so far.
+    """
+
+    def __init__(self, total_tests: int, history: Optional[DurationHistory] = None,
+                 test_names=(), clock=time.monotonic) -> None:
+        self.total_tests = total_tests
+        self.history = history
+        self.clock = clock
+        self.started = clock()
+        self.done: int = 0
+        self.expected_total: Optional[float] = None
+        self.expected_done: float = 0.0
+        self.fallback: Optional[float] = None
+        means = history.known_means() if history is not None else []
+        if means:
+            self.fallback = sum(means) / len(means)
+            self.expected_total = sum(self._expected(name) for name in test_names)
+
+    def _expected(self, test: str) -> float:
+        mean = self.history.mean(test)
+        return mean if mean is not None else self.fallback
+
+    def test_finished(self, test: str) -> None:
+        """Must be called before the test's duration is recorded in the history"""
+        self.done += 1
+        if self.expected_total is not None:
+            self.expected_done += self._expected(test)
+
+    @property
+    def percent(self) -> int:
+        if not self.total_tests:
+            return 0
+        return min(100, int(self.done * 100 / self.total_tests))
+
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until the last test finishes, or None if unknown"""
+        remaining_tests = self.total_tests - self.done
+        if remaining_tests <= 0:
+            return 0.0
+        if not self.done:
+            return self.expected_total
+        elapsed = self.clock() - self.started
+        if self.expected_total and self.expected_done > 0:
+            # Corrige a previsão pelo ritmo real desta execução
+            return max(0.0, self.expected_total - self.expected_done) * elapsed / self.expected_done
+        return remaining_tests * elapsed / self.done
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def format_minutes(seconds: float) -> str:
+    """Elapsed time with minute resolution, so the text only changes once a minute"""
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return "<1m"
+    if minutes >= 60:
+        return f"{minutes // 60}h {minutes % 60:02d}m"
+    return f"{minutes}m"
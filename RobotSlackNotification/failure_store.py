@@ -0,0 +1,124 @@
+from typing import Dict, List, Optional, Set, Tuple
+import os
+import sqlite3
+import time
+
+from RobotSlackNotification.failures import error_fingerprint, normalize_error
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    scope TEXT NOT NULL,
+    run_key TEXT NOT NULL,
+    started REAL NOT NULL,
+    PRIMARY KEY (scope, run_key)
+);
+CREATE TABLE IF NOT EXISTS failures (
+    scope TEXT NOT NULL,
+    test TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_run TEXT NOT NULL,
+    PRIMARY KEY (scope, test, fingerprint)
+);
+"""
+
+
+class FailureHistory:
+    """Cross-run store of failures, keyed by test longname and normalized error fingerprint.
+
+    The rows of ``scope`` (channel + execution title) are loaded into memory
+    when the store is opened, so each lookup is a dict access; changes are
+    written in a single transaction by ``close()``. ``scope`` keeps unrelated
+    executions posting to the same channel from mixing their histories.
+    """
+
+    def __init__(self, path: str, scope: str, run_key: str,
+                 retention_days: Optional[float] = 90, timeout: float = 10.0) -> None:
+        self.path = path
+        self.scope = scope
+        self.run_key = run_key
+        self.retention_days = retention_days
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # timeout: workers do pabot gravam no mesmo arquivo
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        # (test, fingerprint) -> [runs anteriores com a falha, última execução com a falha]
+        self._index: Dict[Tuple[str, str], List] = {}
+        self._dirty: Set[Tuple[str, str]] = set()
+        self.previous_run: Optional[str] = None
+        self._previous_failed: Set[str] = set()
+        self.fixed: List[str] = []
+        self._load()
+
+    def _load(self) -> None:
+        row = self._conn.execute(
+            "SELECT run_key FROM runs WHERE scope = ? AND run_key != ? ORDER BY started DESC LIMIT 1",
+            (self.scope, self.run_key)
+        ).fetchone()
+        self.previous_run = row[0] if row else None
+        for test, fingerprint, runs, last_run in self._conn.execute(
+            "SELECT test, fingerprint, runs, last_run FROM failures WHERE scope = ?", (self.scope,)
+        ):
+            self._index[(test, fingerprint)] = [runs, last_run]
+            if last_run == self.previous_run:
+                self._previous_failed.add(test)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs (scope, run_key, started) VALUES (?, ?, ?)",
+                (self.scope, self.run_key, time.time())
+            )
+
+    def record_failure(self, test: str, error_message: str) -> int:
+        """Records a failure and returns in how many previous runs it already happened (0: new)"""
+        key = (test, error_fingerprint(normalize_error(error_message)))
+        entry = self._index.get(key)
+        if entry is None:
+            self._index[key] = [1, self.run_key]
+            self._dirty.add(key)
+            return 0
+        runs, last_run = entry
+        if last_run == self.run_key:
+            # Já registrada nesta execução (ex.: teste repetido)
+            return runs - 1
+        entry[0], entry[1] = runs + 1, self.run_key
+        self._dirty.add(key)
+        return runs
+
+    def record_pass(self, test: str) -> bool:
+        """Marks ``test`` as fixed if it failed in the previous run; returns True in that case"""
+        if test in self._previous_failed:
+            self._previous_failed.discard(test)
+            self.fixed.append(test)
+            return True
+        return False
+
+    def close(self) -> None:
+        """Writes the failures of this run and closes the database"""
+        if self._conn is None:
+            return
+        now = time.time()
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO failures (scope, test, fingerprint, runs, first_seen, last_seen, last_run) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (scope, test, fingerprint) DO UPDATE SET "
+                    "runs = excluded.runs, last_seen = excluded.last_seen, last_run = excluded.last_run",
+                    [
+                        (self.scope, test, fingerprint, self._index[(test, fingerprint)][0], now, now, self.run_key)
+                        for test, fingerprint in self._dirty
+                    ]
+                )
+                if self.retention_days:
+                    # Falhas que não se repetem há muito tempo deixam de ser "conhecidas"
+                    cutoff = now - self.retention_days * 86400
+                    self._conn.execute("DELETE FROM failures WHERE last_seen < ?", (cutoff,))
+                    self._conn.execute("DELETE FROM runs WHERE started < ?", (cutoff,))
+        finally:
+            self._conn.close()
+            self._conn = None
+            self._dirty.clear()
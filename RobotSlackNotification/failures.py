@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import re
+
+# Texto inserido no lugar do trecho removido de uma mensagem de erro longa
+OMITTED_MARKER = "\n\n… [{count} characters omitted] …\n\n"
+
+
+def truncate_error(text: str, max_chars: int = 3000, tail_chars: int = 1000) -> str:
+    """Keeps the head and the tail of ``text`` so that it fits in ``max_chars``.
+
+    The tail usually holds the assertion or the exception that failed the
+    test, so it is kept in full (up to ``tail_chars``); the head takes the
+    rest of the budget.
+    """
+    text = text or ""
+    if max_chars is None or len(text) <= max_chars:
+        return text
+    # O marcador nunca fica maior que o calculado com o tamanho total do texto
+    budget = max(0, max_chars - len(OMITTED_MARKER.format(count=len(text))))
+    tail = min(max(0, tail_chars), budget)
+    head = budget - tail
+    marker = OMITTED_MARKER.format(count=len(text) - head - tail)
+    return text[:head] + marker + (text[-tail:] if tail else "")
+
+
+def error_fingerprint(text: str) -> str:
+    """Short hash identifying an error message"""
+    return hashlib.sha1((text or "").encode("utf-8", "replace")).hexdigest()[:16]
+
+
+# Trechos que mudam a cada execução (endereços, UUIDs, números) e não identificam o erro
+_VOLATILE_PATTERNS = (
+    (re.compile(r"0x[0-9a-fA-F]+"), "<hex>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<uuid>"),
+    (re.compile(r"\d+"), "#"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def normalize_error(text: str, max_chars: int = 4000) -> str:
+    """Removes run-specific details from an error message before fingerprinting it.
+
+    Only the head and tail of long messages are considered, so the cost does
+    not grow with the message size.
+    """
+    text = truncate_error(text or "", max_chars, max_chars // 2)
+    for pattern, replacement in _VOLATILE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+class ErrorDedupCache:
+    """Remembers which test first failed with each error message.
+
+    Only fingerprints are kept, so multi-megabyte messages are not held in
+    memory; the oldest entries are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 1000) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._first: "OrderedDict[str, str]" = OrderedDict()
+
+    def first_seen(self, fingerprint: str, scenario_name: str) -> Optional[str]:
+        """Returns the test that first reported ``fingerprint``, or None (and records it) if it is new"""
+        first = self._first.get(fingerprint)
+        if first is not None:
+            self._first.move_to_end(fingerprint)
+            return first
+        self._first[fingerprint] = scenario_name
+        if len(self._first) > self.max_entries:
+            self._first.popitem(last=False)
+        return None
+
+    def __len__(self) -> int:
+        return len(self._first)
@@ -0,0 +1,261 @@
+"""Sends the Slack report of an existing Robot Framework output.xml.
+
+Usage: ``robot-slack-from-output [options] output.xml``
+
+Useful when the listener could not be attached (rebot merges, re-runs...).
+The file is read with a streaming parser, so memory stays bounded even for
+very large outputs. Settings come from robot_slack_config.py in the current
+directory, like the listener.
+"""
+from typing import Any, Callable, Dict, List, Optional, Set
+import argparse
+import sys
+import xml.etree.ElementTree as ET
+
+from RobotSlackNotification import SlackNotificationError, RetryPolicy, load_slack_config
+from RobotSlackNotification.batching import FailureBatcher
+from RobotSlackNotification.failures import ErrorDedupCache, error_fingerprint, truncate_error
+from RobotSlackNotification.journal import JournalClient
+from RobotSlackNotification.messages import PrincipalMessageRenderer, TRANSLATIONS, RESULT_ICONS, build_group_mention_message
+from RobotSlackNotification.replay import JournalReplayer
+from RobotSlackNotification.stats import SuiteStats
+from RobotSlackNotification.suite_index import SuiteGroupIndex
+
+# Elementos cujo conteúdo é necessário; todo o resto é descartado ao terminar
+KEPT_TAGS = ("robot", "suite", "test", "status")
+
+
+class OutputSummary:
+    """Counters and suite names collected from an output.xml.
+
+    Failures are not kept here: ``parse_output`` hands each one to its
+    ``on_failure`` callback as soon as it is read.
+    """
+
+    def __init__(self) -> None:
+        self.stats = SuiteStats()
+        self.top_suite: Optional[str] = None
+        self.top_status: Optional[str] = None
+        self.suite_longnames: List[str] = []
+
+
+class FailureReplies:
+    """Packs the failures of an output.xml into thread replies while it is parsed.
+
+    Messages arrive already truncated, with the fingerprint of the full
+    message for deduplication, so memory does not grow with huge errors.
+    """
+
+    def __init__(self, slack_config: Dict[str, Any], language: str = "en") -> None:
+        self.batcher = FailureBatcher(
+            language=language,
+            max_failures=slack_config["failure_batch_size"],
+            max_interval=float("inf"),
+            max_chars=slack_config["failure_batch_max_chars"],
+            max_error_chars=slack_config["error_max_chars"],
+            error_tail_chars=slack_config["error_tail_chars"]
+        )
+        self.dedup = ErrorDedupCache(slack_config["error_dedup_size"]) if slack_config["error_dedup"] else None
+        self.batches: List[List[dict]] = []
+
+    def add(self, name: str, message: str, fingerprint: str) -> None:
+        duplicate_of = None
+        if self.dedup is not None:
+            duplicate_of = self.dedup.first_seen(fingerprint, name)
+        self.batches.extend(self.batcher.add(name, message, duplicate_of=duplicate_of))
+
+    def finish(self) -> List[List[dict]]:
+        """Every batch, including the last partial one"""
+        batch = self.batcher.take()
+        if batch:
+            self.batches.append(batch)
+        return self.batches
+
+
+def parse_output(path: str,
+                 max_error_chars: Optional[int] = 3000,
+                 error_tail_chars: int = 1000,
+                 on_failure: Optional[Callable[[str, str, str], None]] = None) -> OutputSummary:
+    """Streams through output.xml with iterparse, keeping only the current path in memory.
+
+    ``on_failure(name, truncated message, fingerprint)`` is called for each
+    failed test in the order of the file.
+    """
+    summary = OutputSummary()
+    suites: List[str] = []
+    stack: List[ET.Element] = []
+    test_name: Optional[str] = None
+    # O arquivo é fechado mesmo quando a leitura para antes do fim
+    with open(path, "rb") as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == "statistics":
+                    # Estatísticas e erros vêm depois das suites e não são usados
+                    break
+                if tag == "suite":
+                    suites.append(elem.get("name", ""))
+                    summary.suite_longnames.append(".".join(suites))
+                    if summary.top_suite is None:
+                        summary.top_suite = suites[0]
+                elif tag == "test":
+                    test_name = elem.get("name", "")
+                stack.append(elem)
+                continue
+            stack.pop()
+            parent = stack[-1] if stack else None
+            parent_tag = parent.tag if parent is not None else None
+            if tag == "status" and parent_tag == "test":
+                status = elem.get("status")
+                suite_longname = ".".join(suites)
+                summary.stats.add(status, float(elem.get("elapsed") or 0))
+                if status == "FAIL" and on_failure is not None:
+                    message = elem.text or ""
+                    on_failure(f"{suite_longname}.{test_name}",
+                               truncate_error(message, max_error_chars, error_tail_chars),
+                               error_fingerprint(message))
+            elif tag == "status" and parent_tag == "suite" and len(suites) == 1:
+                summary.top_status = elem.get("status")
+            elif tag == "suite":
+                suites.pop()
+            if tag not in KEPT_TAGS or tag in ("test", "suite"):
+                elem.clear()
+                # Remove o elemento já processado para que a árvore não cresça
+                if parent is not None:
+                    parent.remove(elem)
+    return summary
+
+
+def report_groups(summary: OutputSummary, slack_config: Dict[str, Any]) -> Set[str]:
+    """Usergroups configured for the suites of the output"""
+    index: SuiteGroupIndex = slack_config["suite_index"]
+    groups: Set[str] = set()
+    for longname in summary.suite_longnames:
+        groups.update(index.all_groups(longname))
+    return groups
+
+
+def build_report_records(summary: OutputSummary,
+                         slack_config: Dict[str, Any],
+                         failure_batches: List[List[dict]],
+                         test_title: Optional[str] = None,
+                         environment: Optional[str] = None,
+                         cicd_url: Optional[str] = None,
+                         language: str = "en",
+                         handle_to_id: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """Builds the report as journal records: principal message, failure threads and mentions"""
+    t = TRANSLATIONS.get(language, TRANSLATIONS["en"])
+    channel = slack_config["channel_id"]
+    title = test_title or summary.top_suite or "Test Execution"
+    text_fallback = f'Application under test: {test_title or "Test Execution"}'
+    context_header = f"{title} | {environment}" if environment else title
+
+    stats = summary.stats
+    if summary.top_status == "FAIL" or (summary.top_status is None and stats.failed):
+        icon, status = RESULT_ICONS[2], t["status_failed"]
+    elif summary.top_status == "PASS" or (summary.top_status is None and stats.passed):
+        icon, status = RESULT_ICONS[1], t["status_passed"]
+    else:
+        icon, status = RESULT_ICONS[3], t["status_skipped"]
+    blocks = PrincipalMessageRenderer(language).render(
+        context_header, cicd_url, icon, status, stats.total, stats.passed, stats.failed, stats.skipped
+    )
+
+    principal_ts = "journal-output-1"
+    records = [{
+        "op": "chat_postMessage",
+        "ts": principal_ts,
+        "args": {
+            "channel": channel,
+            "blocks": blocks,
+            "text": text_fallback,
+            "unfurl_links": False,
+            "unfurl_media": False
+        }
+    }]
+
+    def reply(blocks):
+        records.append({
+            "op": "chat_postMessage",
+            "ts": None,
+            "args": {"channel": channel, "blocks": blocks, "text": text_fallback, "thread_ts": principal_ts}
+        })
+
+    for batch in failure_batches:
+        reply(batch)
+
+    if stats.failed and handle_to_id:
+        ids = [handle_to_id.get(handle.lstrip("@")) for handle in report_groups(summary, slack_config)]
+        ids = [id_ for id_ in ids if id_]
+        if ids:
+            mention_text = " ".join([f"<!subteam^{gid}>" for gid in ids])
+            reply(build_group_mention_message(mention_text, len(ids) > 1, language))
+    return records
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="robot-slack-from-output",
+        description="Send the RobotSlackNotification report of an existing output.xml."
+    )
+    parser.add_argument("output", help="path of the Robot Framework output.xml")
+    parser.add_argument("--test-title", help="title of the principal message (default: top suite name)")
+    parser.add_argument("--environment", help="execution environment shown in the header")
+    parser.add_argument("--cicd-url", help="pipeline URL linked from the message")
+    parser.add_argument("--language", default="en", help="message language: en, pt-br or es")
+    parser.add_argument("--journal", help="write the report to this offline journal instead of sending it")
+    args = parser.parse_args(argv)
+
+    slack_config = load_slack_config()
+    if not slack_config:
+        print("robot_slack_config.py not found in the current directory", file=sys.stderr)
+        return 2
+    language = args.language.lower()
+    replies = FailureReplies(slack_config, language)
+    summary = parse_output(args.output, slack_config["error_max_chars"], slack_config["error_tail_chars"],
+                           on_failure=replies.add)
+
+    if args.journal:
+        client = JournalClient(args.journal)
+        handle_to_id = None
+    else:
+        import slack_sdk
+        from RobotSlackNotification import get_slack_usergroup_ids
+        from RobotSlackNotification.usergroups import UsergroupCache
+        client_args = {"base_url": slack_config["api_url"]} if slack_config["api_url"] else {}
+        client = slack_sdk.WebClient(token=slack_config["token"], timeout=30, **client_args)
+        handle_to_id = None
+        if summary.stats.failed and slack_config["suite_groups"]:
+            cache = UsergroupCache(slack_config["cache_dir"], slack_config["token"],
+                                   slack_config["usergroup_cache_ttl"], slack_config["team_id"])
+            required = [handle.lstrip("@") for handle in report_groups(summary, slack_config)]
+            handle_to_id = get_slack_usergroup_ids(slack_config["token"], client=client, cache=cache,
+                                                   required=required, team_id=slack_config["team_id"])
+
+    records = build_report_records(
+        summary,
+        slack_config,
+        replies.finish(),
+        test_title=args.test_title,
+        environment=args.environment,
+        cicd_url=args.cicd_url,
+        language=language,
+        handle_to_id=handle_to_id
+    )
+    replayer = JournalReplayer(client, RetryPolicy.from_config(slack_config))
+    try:
+        sent = replayer.replay(records)
+    except SlackNotificationError as e:
+        print(f"Sending report failed: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        if isinstance(client, JournalClient):
+            client.close()
+    stats = summary.stats
+    print(f"{stats.total} tests ({stats.passed} passed, {stats.failed} failed, {stats.skipped} skipped) "
+          f"reported with {sum(sent.values())} Slack call(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+from typing import Callable, Optional
+import threading
+
+
+class Heartbeat:
+    """Calls ``beat`` every ``interval`` seconds on a daemon thread until stopped.
+
+    It only asks for work to be done: the listener routes each beat through
+    the update coalescer, so a beat never sends more than the regular
+    update budget allows.
+    """
+
+    def __init__(self, interval: float, beat: Callable[[], None],
+                 on_error: Optional[Callable[[Exception], None]] = None) -> None:
+        self.interval = max(1.0, float(interval))
+        self.beat = beat
+        self.on_error = on_error
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="robot-slack-heartbeat", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self._stopped.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.beat()
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(e)
@@ -0,0 +1,77 @@
+from typing import Any, Dict, Iterator
+import json
+import os
+import threading
+import time
+import uuid
+
+
+# Trocado no caminho do journal pelo ID da execução: cada execução (e cada worker do pabot) grava o seu arquivo
+RUN_ID_PLACEHOLDER = "{run_id}"
+
+
+class JournalClient:
+    """Stand-in for ``slack_sdk.WebClient`` that records calls instead of sending them.
+
+    Every ``chat_postMessage``/``chat_update`` is appended as one JSON line to
+    ``path``, where ``{run_id}`` is replaced by an ID unique to this client.
+    Posted messages get a synthetic ``ts`` (unique per run) so thread
+    replies and updates can refer to them; ``replay`` resolves those later.
+    Lines are flushed on every write and fsynced every ``fsync_every`` records.
+    """
+
+    def __init__(self, path: str, fsync_every: int = 50) -> None:
+        self.run_id = uuid.uuid4().hex[:12]
+        self.path = os.path.abspath(path.replace(RUN_ID_PLACEHOLDER, self.run_id))
+        self.fsync_every = max(1, int(fsync_every))
+        self._seq = 0
+        self._unsynced = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _append(self, op: str, kwargs: Dict[str, Any]) -> str:
+        with self._lock:
+            self._seq += 1
+            ts = f"journal-{self.run_id}-{self._seq}"
+            record = {"op": op, "ts": ts, "time": time.time(), "args": kwargs}
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+            return ts
+
+    def chat_postMessage(self, **kwargs) -> Dict[str, Any]:
+        ts = self._append("chat_postMessage", kwargs)
+        return {"ok": True, "ts": ts, "channel": kwargs.get("channel")}
+
+    def chat_update(self, **kwargs) -> Dict[str, Any]:
+        self._append("chat_update", kwargs)
+        return {"ok": True, "ts": kwargs.get("ts"), "channel": kwargs.get("channel")}
+
+    def usergroups_list(self, **kwargs) -> Dict[str, Any]:
+        # Sem acesso ao Slack: as menções dependem do cache local de usergroups
+        raise OSError("usergroups.list is not available in offline mode")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """Yields the records of a journal, skipping a truncated last line"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
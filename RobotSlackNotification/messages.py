@@ -1,5 +1,9 @@
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
+import threading
+
+from RobotSlackNotification.durations import format_duration
 
 TRANSLATIONS = {
 	"en": {
@@ -18,7 +22,22 @@ TRANSLATIONS = {
 		"in_progress": "In Progress",
 		"status_passed": "Passed",
 		"status_failed": "Failed",
-		"status_skipped": "Skipped"
+		"status_skipped": "Skipped",
+		"occurrences": "Occurrences",
+		"and_more": "and {count} more",
+		"same_error_as": "Same error as: {scenario}",
+		"full_error_attached": "Full error message of {scenario}",
+		"known_failures": "Known failures (already reported in previous runs):",
+		"previous_runs": "{count} previous run(s)",
+		"fixed_since_last_run": "Fixed since the last run:",
+		"progress": "Progress:",
+		"progress_eta": "{percent}% (~{eta} remaining)",
+		"running": "Running:",
+		"running_for": "{test} for {elapsed}",
+		"long_running": "long-running",
+		"performance_regressions": "Performance regressions (slower than their history):",
+		"regression_line": "{test}: {duration} (usually {mean}, {ratio:.1f}x)",
+		"rerun_summary": "Rerun of failed tests: {fixed} now passing, {failing} still failing"
 	},
 	"pt-br": {
 		"general_status": "Status Geral:",
@@ -36,7 +55,22 @@ TRANSLATIONS = {
 		"in_progress": "Em Teste",
 		"status_passed": "Passou",
 		"status_failed": "Falhou",
-		"status_skipped": "Pulou"
+		"status_skipped": "Pulou",
+		"occurrences": "Ocorrências",
+		"and_more": "e mais {count}",
+		"same_error_as": "Mesmo erro de: {scenario}",
+		"full_error_attached": "Mensagem de erro completa de {scenario}",
+		"known_failures": "Falhas conhecidas (já reportadas em execuções anteriores):",
+		"previous_runs": "{count} execução(ões) anterior(es)",
+		"fixed_since_last_run": "Corrigidos desde a última execução:",
+		"progress": "Progresso:",
+		"progress_eta": "{percent}% (~{eta} restantes)",
+		"running": "Em execução:",
+		"running_for": "{test} há {elapsed}",
+		"long_running": "demorado",
+		"performance_regressions": "Regressões de desempenho (mais lentos que o histórico):",
+		"regression_line": "{test}: {duration} (normalmente {mean}, {ratio:.1f}x)",
+		"rerun_summary": "Reexecução dos testes com falha: {fixed} passaram, {failing} continuam falhando"
 	},
 	"es": {
 		"general_status": "Estado General:",
@@ -55,10 +89,33 @@ TRANSLATIONS = {
 		"in_progress": "En Progreso",
 		"status_passed": "Pasó",
 		"status_failed": "Falló",
-		"status_skipped": "Omitido"
+		"status_skipped": "Omitido",
+		"occurrences": "Ocurrencias",
+		"and_more": "y {count} más",
+		"same_error_as": "Mismo error que: {scenario}",
+		"full_error_attached": "Mensaje de error completo de {scenario}",
+		"known_failures": "Fallas conocidas (ya reportadas en ejecuciones anteriores):",
+		"previous_runs": "{count} ejecución(es) anterior(es)",
+		"fixed_since_last_run": "Corregidos desde la última ejecución:",
+		"progress": "Progreso:",
+		"progress_eta": "{percent}% (~{eta} restantes)",
+		"running": "En ejecución:",
+		"running_for": "{test} desde hace {elapsed}",
+		"long_running": "demorado",
+		"performance_regressions": "Regresiones de rendimiento (más lentos que su historial):",
+		"regression_line": "{test}: {duration} (normalmente {mean}, {ratio:.1f}x)",
+		"rerun_summary": "Reejecución de las pruebas fallidas: {fixed} ahora pasan, {failing} siguen fallando"
 	}
 }
 
+# Ícones de status: em andamento, sucesso, falha, pulado
+RESULT_ICONS: Tuple[Tuple[str, str], ...] = (
+	("white_circle", "26aa"),
+	("large_green_circle", "1f7e2"),
+	("red_circle", "1f534"),
+	("large_yellow_circle", "1f7e1")
+)
+
 @dataclass
 class MessageBlock:
 	type: str
@@ -119,8 +176,9 @@ class PrincipalMessage:
 			}]
 		)
 
-	def create_counter_section(self, executions: int, success: int, failed: int, skipped: int, t) -> MessageBlock:
-		return MessageBlock(
+	def create_counter_section(self, executions: int, success: int, failed: int, skipped: int, t,
+							   progress: Optional[str] = None, running: Optional[str] = None) -> MessageBlock:
+		block = MessageBlock(
 			type="rich_text",
 			elements=[{
 				"type": "rich_text_list",
@@ -147,6 +205,17 @@ class PrincipalMessage:
 				]
 			}]
 		)
+		if progress:
+			block.elements[0]["elements"].append({"type": "rich_text_section", "elements": [
+				{"type": "text", "text": t["progress"], "style": {"bold": True}},
+				{"type": "text", "text": progress}
+			]})
+		if running:
+			block.elements[0]["elements"].append({"type": "rich_text_section", "elements": [
+				{"type": "text", "text": t["running"], "style": {"bold": True}},
+				{"type": "text", "text": running}
+			]})
+		return block
 
 	def create_error_notice(self, t) -> MessageBlock:
 		return MessageBlock(
@@ -178,8 +247,47 @@ class PrincipalMessage:
 	def to_dict(self) -> Dict[str, Any]:
 		return {"blocks": [block.to_dict() for block in self.blocks]}
 
+class PrincipalMessageRenderer:
+	"""Renders principal-message blocks for repeated updates.
+
+	The static blocks (header, dividers, notices, CI/CD link) are built once
+	per header/URL and reused; only the status and counter blocks are created
+	on each render. Only the ``MAX_TEMPLATES`` most recently used headers are
+	kept.
+	"""
+	# Um cabeçalho por canal/suite ativa basta; os demais são refeitos se voltarem
+	MAX_TEMPLATES = 16
+
+	def __init__(self, language: str = "en"):
+		self.language = language
+		self.t = TRANSLATIONS.get(language, TRANSLATIONS["en"])
+		self._templates: "OrderedDict[Tuple[str, str], Tuple[PrincipalMessage, List[Dict[str, Any]]]]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	def render(self, context: str, cicd_url: str, icon: Tuple[str, str], status: str,
+			   executions: int, success: int, failed: int, skipped: int,
+			   progress: Optional[str] = None, running: Optional[str] = None) -> List[Dict[str, Any]]:
+		key = (context, cicd_url)
+		with self._lock:
+			template = self._templates.get(key)
+			if template is None:
+				message = PrincipalMessage(context=context, environment="", cicd_url=cicd_url, language=self.language)
+				template = self._templates[key] = (message, message.to_dict()["blocks"])
+				if len(self._templates) > self.MAX_TEMPLATES:
+					self._templates.popitem(last=False)
+			else:
+				self._templates.move_to_end(key)
+		message, static_blocks = template
+		blocks = list(static_blocks)
+		blocks[2] = message.create_status_section(self.t["general_status"], icon, self.t, status).to_dict()
+		blocks[3] = message.create_counter_section(executions, success, failed, skipped, self.t, progress, running).to_dict()
+		return blocks
+
 class ErrorMessage:
-	def __init__(self, scenario_name: str, error_message: str, language: str = "en"):
+	# Quantidade máxima de cenários listados em uma falha agrupada
+	MAX_LISTED_SCENARIOS = 10
+
+	def __init__(self, scenario_name: Union[str, List[str]], error_message: str, language: str = "en"):
 		t = TRANSLATIONS.get(language, TRANSLATIONS["en"])
 		self.blocks = [
 			MessageBlock(type="divider"),
@@ -187,11 +295,7 @@ class ErrorMessage:
 				type="rich_text",
 				elements=[{
 					"type": "rich_text_section",
-					"elements": [{
-						"type": "text",
-						"text": f"{t['scenario']}: {scenario_name}",
-						"style": {"bold": True}
-					}]
+					"elements": self.create_scenario_elements(scenario_name, t)
 				}]
 			),
 			MessageBlock(type="divider"),
@@ -208,9 +312,121 @@ class ErrorMessage:
 			)
 		]
 
+	def create_scenario_elements(self, scenario_name: Union[str, List[str]], t) -> List[Dict[str, Any]]:
+		if isinstance(scenario_name, str) or len(scenario_name) == 1:
+			name = scenario_name if isinstance(scenario_name, str) else scenario_name[0]
+			return [{"type": "text", "text": f"{t['scenario']}: {name}", "style": {"bold": True}}]
+		# Falhas consecutivas com a mesma mensagem de erro são agrupadas
+		listed = scenario_name[:self.MAX_LISTED_SCENARIOS]
+		lines = "\n".join(f"• {name}" for name in listed)
+		hidden = len(scenario_name) - len(listed)
+		if hidden:
+			lines += "\n" + t["and_more"].format(count=hidden)
+		return [
+			{"type": "text", "text": f"{t['scenario']}:", "style": {"bold": True}},
+			{"type": "text", "text": f"\n{lines}\n"},
+			{"type": "text", "text": f"{t['occurrences']}: ", "style": {"bold": True}},
+			{"type": "text", "text": str(len(scenario_name))}
+		]
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {"blocks": [block.to_dict() for block in self.blocks]}
+
+class KnownFailuresMessage:
+	"""One line per failure that was already reported in previous runs"""
+
+	def __init__(self, failures: List[Tuple[str, int]], language: str = "en"):
+		t = TRANSLATIONS.get(language, TRANSLATIONS["en"])
+		self.blocks = [
+			MessageBlock(type="divider"),
+			MessageBlock(
+				type="rich_text",
+				elements=[
+					{
+						"type": "rich_text_section",
+						"elements": [{"type": "text", "text": t["known_failures"], "style": {"bold": True}}]
+					},
+					{
+						"type": "rich_text_list",
+						"style": "bullet",
+						"elements": [
+							{"type": "rich_text_section", "elements": [
+								{"type": "text", "text": f"{name} "},
+								{"type": "text", "text": f"({t['previous_runs'].format(count=runs)})", "style": {"italic": True}}
+							]}
+							for name, runs in failures
+						]
+					}
+				]
+			)
+		]
+
 	def to_dict(self) -> Dict[str, Any]:
 		return {"blocks": [block.to_dict() for block in self.blocks]}
 
+# Mantém a seção abaixo do limite de 3000 caracteres do Slack
+FIXED_TESTS_LISTED = 25
+
+# Testes em execução listados na mensagem principal (vários apenas com pabot)
+RUNNING_TESTS_LISTED = 3
+
+def build_fixed_tests_message(test_names: List[str], language: str = "en") -> list:
+	t = TRANSLATIONS.get(language, TRANSLATIONS["en"])
+	listed = test_names[:FIXED_TESTS_LISTED]
+	lines = "\n".join(f"• {name}" for name in listed)
+	if len(test_names) > len(listed):
+		lines += "\n" + t["and_more"].format(count=len(test_names) - len(listed))
+	return [
+		{
+			"type": "section",
+			"text": {
+				"type": "mrkdwn",
+				"text": f":white_check_mark: *{t['fixed_since_last_run']}*\n{lines}"
+			}
+		}
+	]
+
+# Mantém a seção abaixo do limite de 3000 caracteres do Slack
+REGRESSIONS_LISTED = 20
+
+def _format_seconds(seconds: float) -> str:
+	return f"{seconds:.1f}s" if seconds < 60 else format_duration(seconds)
+
+def build_regressions_message(regressions: List[Tuple[str, float, float]], language: str = "en") -> list:
+	"""``regressions``: (test, duration, baseline mean), listed from the largest slowdown"""
+	t = TRANSLATIONS.get(language, TRANSLATIONS["en"])
+	ordered = sorted(regressions, key=lambda item: item[1] / max(item[2], 1e-9), reverse=True)
+	listed = ordered[:REGRESSIONS_LISTED]
+	lines = "\n".join(
+		"• " + t["regression_line"].format(
+			test=test, duration=_format_seconds(duration), mean=_format_seconds(mean), ratio=duration / max(mean, 1e-9)
+		)
+		for test, duration, mean in listed
+	)
+	if len(ordered) > len(listed):
+		lines += "\n" + t["and_more"].format(count=len(ordered) - len(listed))
+	return [
+		{
+			"type": "section",
+			"text": {
+				"type": "mrkdwn",
+				"text": f":turtle: *{t['performance_regressions']}*\n{lines}"
+			}
+		}
+	]
+
+def build_rerun_summary_message(fixed: int, still_failing: int, language: str = "en") -> list:
+	t = TRANSLATIONS.get(language, TRANSLATIONS["en"])
+	return [
+		{
+			"type": "section",
+			"text": {
+				"type": "mrkdwn",
+				"text": f":repeat: {t['rerun_summary'].format(fixed=fixed, failing=still_failing)}"
+			}
+		}
+	]
+
 def build_group_mention_message(mention_text: str, plural: bool, language: str = "en") -> list:
 	t = TRANSLATIONS.get(language, TRANSLATIONS["en"])
 	phrase = t["can_check_plural"] if plural else t["can_check"]
@@ -224,6 +440,14 @@ def build_group_mention_message(mention_text: str, plural: bool, language: str =
 		}
 	]
 
-# Mantendo compatibilidade com o código existente
-PRINCIPAL_MESSAGE = PrincipalMessage("pix", "sandbox", "https://github.com/stone-payments/pix-backend-testing/actions/runs/11748012173").to_dict()
-ERROR_MESSAGE = ErrorMessage("Cenário: Criar Chave PIX", "MENSAGEM DE ERRO").to_dict()
\ No newline at end of file
+# Mantendo compatibilidade com o código existente: os exemplos só são montados no primeiro acesso
+_SAMPLE_MESSAGES = {
+	"PRINCIPAL_MESSAGE": lambda: PrincipalMessage("pix", "sandbox", "https://github.com/stone-payments/pix-backend-testing/actions/runs/11748012173").to_dict(),
+	"ERROR_MESSAGE": lambda: ErrorMessage("Cenário: Criar Chave PIX", "MENSAGEM DE ERRO").to_dict()
+}
+
+def __getattr__(name: str) -> Dict[str, Any]:
+	if name not in _SAMPLE_MESSAGES:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = globals()[name] = _SAMPLE_MESSAGES[name]()
+	return value
\ No newline at end of file
@@ -0,0 +1,196 @@
+from typing import Any, Dict, List
+import json
+import os
+import threading
+import time
+
+from RobotSlackNotification.storage import write_json_atomic
+
+# Limites superiores (s) dos buckets do histograma de latência
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class OperationMetrics:
+    """Counters of one Slack API method or listener operation"""
+    __slots__ = ("calls", "errors", "retries", "ratelimit_waits", "ratelimit_wait_seconds",
+                 "bytes_sent", "latency_sum", "latency_max", "buckets")
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.errors: int = 0
+        self.retries: int = 0
+        self.ratelimit_waits: int = 0
+        self.ratelimit_wait_seconds: float = 0.0
+        self.bytes_sent: int = 0
+        self.latency_sum: float = 0.0
+        self.latency_max: float = 0.0
+        # Último bucket conta as chamadas acima do maior limite
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, latency: float) -> None:
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.__slots__ if name != "buckets"}
+        data["latency_avg"] = self.latency_sum / self.calls if self.calls else 0.0
+        data["latency_buckets"] = dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], self.buckets))
+        return data
+
+
+class SlackMetrics:
+    """Collects latency, retry, rate-limit and payload metrics of the Slack traffic"""
+
+    def __init__(self) -> None:
+        self.operations: Dict[str, OperationMetrics] = {}
+        self.timings: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _op(self, name: str) -> OperationMetrics:
+        op = self.operations.get(name)
+        if op is None:
+            op = self.operations[name] = OperationMetrics()
+        return op
+
+    def record_call(self, name: str, latency: float, ok: bool, bytes_sent: int = 0) -> None:
+        with self._lock:
+            op = self._op(name)
+            op.calls += 1
+            op.bytes_sent += bytes_sent
+            if not ok:
+                op.errors += 1
+            op.observe(latency)
+
+    def record_retry(self, name: str, wait: float, ratelimited: bool) -> None:
+        with self._lock:
+            op = self._op(name)
+            op.retries += 1
+            if ratelimited:
+                op.ratelimit_waits += 1
+                op.ratelimit_wait_seconds += wait
+
+    def record_timing(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "operations": {name: op.to_dict() for name, op in sorted(self.operations.items())},
+                "timings": dict(self.timings)
+            }
+
+    def summary_lines(self) -> List[str]:
+        data = self.to_dict()
+        lines = ["Slack notification metrics:"]
+        for name, op in data["operations"].items():
+            line = f"  {name}: {op['calls']} call(s)"
+            if op["calls"]:
+                line += f", avg {op['latency_avg'] * 1000:.0f} ms, max {op['latency_max'] * 1000:.0f} ms"
+            if op["errors"]:
+                line += f", {op['errors']} error(s)"
+            if op["retries"]:
+                line += f", {op['retries']} retry(ies)"
+            if op["ratelimit_waits"]:
+                line += f", {op['ratelimit_waits']} rate-limit wait(s) ({op['ratelimit_wait_seconds']:.1f} s)"
+            if op["bytes_sent"]:
+                line += f", {op['bytes_sent']} bytes sent"
+            lines.append(line)
+        for name, seconds in data["timings"].items():
+            lines.append(f"  {name}: {seconds * 1000:.0f} ms")
+        return lines
+
+    def to_prometheus(self) -> str:
+        """Renders the metrics in the Prometheus text exposition format (node_exporter textfile)"""
+        data = self.to_dict()
+        prefix = "robot_slack"
+        lines = []
+        counters = (
+            ("calls", "calls_total", "Slack calls"),
+            ("errors", "errors_total", "Slack calls that failed"),
+            ("retries", "retries_total", "Retries of Slack calls"),
+            ("ratelimit_waits", "ratelimit_waits_total", "Waits caused by Slack rate limiting"),
+            ("ratelimit_wait_seconds", "ratelimit_wait_seconds_total", "Seconds waited because of rate limiting"),
+            ("bytes_sent", "bytes_sent_total", "Request payload bytes sent to Slack"),
+        )
+        for key, metric, help_text in counters:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, op in data["operations"].items():
+                lines.append(f'{prefix}_{metric}{{operation="{name}"}} {op[key]}')
+        metric = f"{prefix}_latency_seconds"
+        lines.append(f"# HELP {metric} Latency of Slack calls")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, op in data["operations"].items():
+            cumulative = 0
+            for bound, count in op["latency_buckets"].items():
+                cumulative += count
+                lines.append(f'{metric}_bucket{{operation="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{operation="{name}"}} {op["latency_sum"]}')
+            lines.append(f'{metric}_count{{operation="{name}"}} {op["calls"]}')
+        metric = f"{prefix}_timing_seconds"
+        lines.append(f"# HELP {metric} Time spent loading configuration and usergroups")
+        lines.append(f"# TYPE {metric} gauge")
+        for name, seconds in data["timings"].items():
+            lines.append(f'{metric}{{step="{name}"}} {seconds}')
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str) -> None:
+        write_json_atomic(path, self.to_dict())
+
+    def write_prometheus(self, path: str) -> None:
+        # Escrita atômica: o node_exporter nunca lê um arquivo pela metade
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+def payload_size(kwargs: Dict[str, Any]) -> int:
+    """Approximate size of an API call: the length of its text fields (file contents included) and blocks"""
+    size = 0
+    for value in kwargs.values():
+        if isinstance(value, (str, bytes, bytearray)):
+            size += len(value)
+        elif isinstance(value, (list, dict)):
+            # Blocos: no máximo 50 por mensagem, baratos de serializar
+            size += len(json.dumps(value, ensure_ascii=False, default=str))
+    return size
+
+
+class MeteredClient:
+    """Wraps a Slack client and records latency, errors and approximate payload size of every API call"""
+
+    METHODS = {
+        "chat_postMessage": "chat.postMessage",
+        "chat_update": "chat.update",
+        "usergroups_list": "usergroups.list",
+        "files_upload_v2": "files.upload",
+    }
+
+    def __init__(self, client, metrics: SlackMetrics) -> None:
+        self.client = client
+        self.metrics = metrics
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.client, name)
+        api_method = self.METHODS.get(name)
+        if api_method is None or not callable(attr):
+            return attr
+
+        def call(**kwargs):
+            bytes_sent = payload_size(kwargs)
+            started = time.perf_counter()
+            try:
+                response = attr(**kwargs)
+            except Exception:
+                self.metrics.record_call(api_method, time.perf_counter() - started, False, bytes_sent)
+                raise
+            self.metrics.record_call(api_method, time.perf_counter() - started, True, bytes_sent)
+            return response
+        return call
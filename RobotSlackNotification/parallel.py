@@ -0,0 +1,163 @@
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+import glob
+import os
+import shutil
+import time
+import uuid
+
+from RobotSlackNotification.filelock import FileLock
+from RobotSlackNotification.storage import read_json, write_json_atomic
+
+# Chave, no PabotLib, do ID que identifica a execução para todos os workers
+PABOT_RUN_ID_KEY = "robot_slack_notification_run_id"
+
+# Diretórios de execuções paralelas sem atividade são removidos depois deste prazo
+RUN_RETENTION_DAYS = 7
+
+
+def pabot_run_key(caller_id: Optional[str], remote, lock_timeout: float = 30.0) -> str:
+    """Identifies a pabot run through the PabotLib server shared by its workers.
+
+    The server lives only as long as the run, so the first worker stores a
+    random ID there (under a PabotLib lock) and the others read it; a new
+    run always gets a new ID, however its directories are reused.
+    """
+    caller_id = caller_id or str(os.getpid())
+    deadline = time.monotonic() + lock_timeout
+    while not remote.run_keyword("acquire_lock", [PABOT_RUN_ID_KEY, caller_id], {}):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"PabotLib lock '{PABOT_RUN_ID_KEY}' not acquired in {lock_timeout}s")
+        time.sleep(0.1)
+    try:
+        run_id = remote.run_keyword("get_parallel_value_for_key", [PABOT_RUN_ID_KEY], {})
+        if not run_id:
+            run_id = uuid.uuid4().hex
+            remote.run_keyword("set_parallel_value_for_key", [PABOT_RUN_ID_KEY, run_id], {})
+    finally:
+        remote.run_keyword("release_lock", [PABOT_RUN_ID_KEY, caller_id], {})
+    return f"pabot-{run_id}"
+
+
+def prune_runs(runs_dir: str, retention_days: float = RUN_RETENTION_DAYS, keep: Optional[str] = None) -> None:
+    """Removes the directories of parallel runs with no file written for ``retention_days``"""
+    cutoff = time.time() - retention_days * 86400
+    for run_dir in glob.glob(os.path.join(runs_dir, "pabot-*")):
+        if run_dir == keep:
+            continue
+        try:
+            last_write = max(
+                (os.path.getmtime(os.path.join(root, name)) for root, _, names in os.walk(run_dir) for name in names),
+                default=os.path.getmtime(run_dir)
+            )
+            if last_write < cutoff:
+                shutil.rmtree(run_dir)
+        except OSError:
+            continue
+
+
+class ParallelRun:
+    """Shares one principal message between the worker processes of a parallel run.
+
+    State lives in ``run_dir``: ``state.json`` (message ts, last update time,
+    groups already mentioned) is only touched under a file lock, and every
+    worker publishes its own counters to ``worker-<id>.json``. Any worker
+    can aggregate them, but updates are rate limited run-wide and only the
+    last worker to finish forces one, so the number of Slack calls does not
+    grow with the number of workers.
+    """
+
+    def __init__(self, run_dir: str, worker_id: Optional[str] = None) -> None:
+        self.run_dir = run_dir
+        self.worker_id = worker_id or str(os.getpid())
+        self.state_path = os.path.join(run_dir, "state.json")
+        self.lock_path = os.path.join(run_dir, "state.lock")
+        self.worker_path = os.path.join(run_dir, f"worker-{self.worker_id}.json")
+        self.owner = False
+        self.finished = False
+
+    def _read_state(self) -> Dict[str, Any]:
+        state = read_json(self.state_path)
+        return state if isinstance(state, dict) else {}
+
+    def acquire_principal(self, post: Callable[[], str]) -> str:
+        """Returns the ts of the run's principal message, posting it if this worker is first"""
+        with FileLock(self.lock_path):
+            state = self._read_state()
+            if state.get("ts"):
+                return state["ts"]
+            ts = post()
+            state.update(ts=ts, owner=self.worker_id, created_at=time.time())
+            write_json_atomic(self.state_path, state)
+            self.owner = True
+            return ts
+
+    def publish(self, passed: int, failed: int, skipped: int, running: Iterable = ()) -> None:
+        """Publishes this worker's counters and its running tests as ``[name, started]`` pairs"""
+        write_json_atomic(self.worker_path, {
+            "passed": passed,
+            "failed": failed,
+            "skipped": skipped,
+            "running": [list(test) for test in running],
+            "finished": self.finished
+        })
+
+    def finish(self, passed: int, failed: int, skipped: int) -> None:
+        """Publishes the final counters of this worker"""
+        self.finished = True
+        self.publish(passed, failed, skipped)
+
+    def aggregate(self) -> Dict[str, Any]:
+        """Sums the counters published by every worker of the run and lists their running tests"""
+        totals: Dict[str, Any] = {"passed": 0, "failed": 0, "skipped": 0, "active": 0, "running": []}
+        for path in glob.glob(os.path.join(self.run_dir, "worker-*.json")):
+            data = read_json(path)
+            if not isinstance(data, dict):
+                continue
+            for key in ("passed", "failed", "skipped"):
+                totals[key] += int(data.get(key, 0))
+            if not data.get("finished"):
+                totals["active"] += 1
+                totals["running"].extend(data.get("running") or [])
+        return totals
+
+    def send_update(self, send: Callable[[], None], min_interval: float, force: bool = False) -> bool:
+        """Runs ``send`` unless another worker updated less than ``min_interval`` ago.
+
+        Regular updates only hold the run lock while reading and writing
+        ``last_update``: the Slack call and its retries run outside it, so a
+        slow Slack never stalls the other workers. ``force`` is honoured only
+        once no worker of the run is active; that final update is sent under
+        the lock, and a regular update still on its way when it happens sends
+        the current state again, so the message never ends with a stale total.
+        """
+        with FileLock(self.lock_path):
+            state = self._read_state()
+            now = time.time()
+            generation = state.get("generation", 0) + 1
+            final = force and not self.aggregate()["active"]
+            if not final and now - state.get("last_update", 0) < min_interval:
+                return False
+            state.update(generation=generation, last_update=now)
+            if final:
+                state["final_generation"] = generation
+            write_json_atomic(self.state_path, state)
+            if final:
+                send()
+                return True
+        send()
+        with FileLock(self.lock_path):
+            if self._read_state().get("final_generation", 0) > generation:
+                # A atualização final saiu enquanto esta estava a caminho: reenvia o estado atual
+                send()
+        return True
+
+    def claim_mentions(self, groups: Iterable[str]) -> Set[str]:
+        """Returns the groups no other worker has mentioned yet and marks them as mentioned"""
+        with FileLock(self.lock_path):
+            state = self._read_state()
+            mentioned = set(state.get("mentioned", []))
+            new_groups = set(groups) - mentioned
+            if new_groups:
+                state["mentioned"] = sorted(mentioned | new_groups)
+                write_json_atomic(self.state_path, state)
+            return new_groups
@@ -0,0 +1,166 @@
+from typing import Any, Callable, Dict, Optional
+import os
+import threading
+import time
+
+from RobotSlackNotification.filelock import FileLock
+from RobotSlackNotification.retry import retry_after_seconds, slack_error_code
+from RobotSlackNotification.storage import read_json, token_hash, write_json_atomic
+
+# Chamadas por minuto de cada método, abaixo dos limites (tiers) da Web API do Slack
+DEFAULT_RATE_LIMITS = {
+    "chat.postMessage": 60,
+    "chat.update": 50,
+    "files.upload": 20,
+    "usergroups.list": 20,
+}
+
+
+class TokenBucket:
+    """Token bucket of this process that never waits: callers are told when to try again.
+
+    Used for the budget of each Slack channel, checked by the dispatcher
+    before it starts a call for that channel.
+    """
+
+    def __init__(self, rate: float, burst: float = 5, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = max(1e-6, float(rate))
+        self.burst = max(1.0, float(burst))
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Takes one permit and returns 0, or returns the seconds until one is available"""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + max(0.0, now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class SharedTokenBucket:
+    """Token bucket kept in a file, shared by every process of the host.
+
+    The state (available tokens, last refill and a Retry-After pause) is
+    read and written under a file lock, so concurrent Robot runs using the
+    same token take their permits from the same budget. Waiting happens
+    outside the lock.
+    """
+
+    def __init__(self, path: str, rate: float, burst: float = 5,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep) -> None:
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.rate = max(1e-6, float(rate))
+        self.burst = max(1.0, float(burst))
+        self.clock = clock
+        self.sleep = sleep
+
+    def _read(self, now: float) -> Dict[str, float]:
+        state = read_json(self.path)
+        if not isinstance(state, dict) or "tokens" not in state:
+            return {"tokens": self.burst, "updated": now, "blocked_until": 0.0}
+        return state
+
+    def acquire(self) -> float:
+        """Takes one permit, waiting for it if needed; returns the seconds waited"""
+        waited = 0.0
+        while True:
+            with FileLock(self.lock_path):
+                now = self.clock()
+                state = self._read(now)
+                tokens = min(self.burst, state["tokens"] + max(0.0, now - state["updated"]) * self.rate)
+                blocked = state.get("blocked_until", 0.0) - now
+                if blocked <= 0 and tokens >= 1:
+                    write_json_atomic(self.path, {"tokens": tokens - 1, "updated": now, "blocked_until": 0.0})
+                    return waited
+                write_json_atomic(self.path, {
+                    "tokens": tokens, "updated": now, "blocked_until": state.get("blocked_until", 0.0)
+                })
+                wait = max(blocked, (1 - tokens) / self.rate)
+            self.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """Stops every process from taking permits for ``seconds`` (Slack's Retry-After)"""
+        with FileLock(self.lock_path):
+            now = self.clock()
+            state = self._read(now)
+            state["blocked_until"] = max(state.get("blocked_until", 0.0), now + seconds)
+            write_json_atomic(self.path, state)
+
+
+class RateLimitedClient:
+    """Wraps a Slack client and takes a permit from the host-wide bucket of each API method.
+
+    A rate-limited response pauses the bucket for the Retry-After delay, so
+    the other runs of the host back off too instead of hitting the limit.
+    """
+
+    METHODS = {
+        "chat_postMessage": "chat.postMessage",
+        "chat_update": "chat.update",
+        "usergroups_list": "usergroups.list",
+        "files_upload_v2": "files.upload",
+    }
+
+    def __init__(self, client, cache_dir: str, token: str,
+                 rate_limits: Optional[Dict[str, float]] = None, burst: float = 5, metrics=None) -> None:
+        self.client = client
+        self.metrics = metrics
+        self.directory = os.path.join(cache_dir, "ratelimit")
+        self.token_key = token_hash(token)
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS, **(rate_limits or {}))
+        self.burst = burst
+        self._buckets: Dict[str, SharedTokenBucket] = {}
+        # Espera da última chamada de cada thread, descontada da latência pelo circuit breaker
+        self._local = threading.local()
+
+    def bucket(self, api_method: str) -> Optional[SharedTokenBucket]:
+        bucket = self._buckets.get(api_method)
+        if bucket is None:
+            per_minute = self.rate_limits.get(api_method)
+            if not per_minute:
+                return None
+            path = os.path.join(self.directory, f"{self.token_key}-{api_method}.json")
+            bucket = self._buckets[api_method] = SharedTokenBucket(path, per_minute / 60.0, self.burst)
+        return bucket
+
+    def take_waited(self) -> float:
+        """Seconds the current thread waited for permits since the last call"""
+        waited = getattr(self._local, "waited", 0.0)
+        self._local.waited = 0.0
+        return waited
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.client, name)
+        api_method = self.METHODS.get(name)
+        bucket = self.bucket(api_method) if api_method else None
+        if bucket is None or not callable(attr):
+            return attr
+
+        def call(**kwargs):
+            try:
+                waited = bucket.acquire()
+            except OSError:
+                # Sem acesso ao estado compartilhado: envia sem limitar em vez de falhar
+                waited = 0.0
+            if waited:
+                self._local.waited = getattr(self._local, "waited", 0.0) + waited
+                if self.metrics:
+                    self.metrics.record_timing("rate_limit_wait", waited)
+            try:
+                return attr(**kwargs)
+            except Exception as e:
+                if slack_error_code(e) == "ratelimited":
+                    try:
+                        bucket.pause(retry_after_seconds(e) or 1.0)
+                    except OSError:
+                        pass
+                raise
+        return call
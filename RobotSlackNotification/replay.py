@@ -0,0 +1,212 @@
+"""Sends a notification journal recorded in offline mode to Slack.
+
+Usage: ``robot-slack-replay [--dry-run] [--token TOKEN] JOURNAL [JOURNAL ...]``
+
+The token is read from robot_slack_config.py in the current directory unless
+``--token`` is given. Replay is coalesced: each principal message is posted
+once with its final state, and thread replies are merged into as few posts
+as Slack's block limits allow. Journals given together are replayed as one,
+in the order their records were written: with PABOT_AGGREGATE, the workers of
+a run reply to a message posted from another worker's journal. What was sent
+is kept next to the journal (``<journal>.replayed.json``, or one file per set
+of journals), so replaying them again, or after a failure, only sends what is
+missing.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from RobotSlackNotification import SlackNotificationError, RetryPolicy, load_slack_config, retry_on_slack_error
+from RobotSlackNotification.batching import SLACK_MAX_BLOCKS
+from RobotSlackNotification.journal import read_journal
+from RobotSlackNotification.storage import read_json, write_json_atomic
+
+JOURNAL_TS_PREFIX = "journal-"
+# Arquivo, ao lado do journal, com o que já foi reenviado
+PROGRESS_SUFFIX = ".replayed.json"
+
+
+def read_journals(paths: Sequence[str]) -> List[Dict[str, Any]]:
+    """Records of several journals merged in the order they were written"""
+    records = [record for path in paths for record in read_journal(path)]
+    if len(paths) > 1:
+        records.sort(key=lambda record: record.get("time", 0))
+    return records
+
+
+def progress_path(paths: Sequence[str]) -> str:
+    """File that keeps what was already sent from a set of journals replayed together"""
+    if len(paths) == 1:
+        return paths[0] + PROGRESS_SUFFIX
+    names = sorted(os.path.abspath(path) for path in paths)
+    digest = hashlib.sha1("\n".join(names).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(os.path.dirname(names[0]), f"robot_slack_replay-{digest}{PROGRESS_SUFFIX}")
+
+
+def plan_replay(records) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    """Coalesces journal records.
+
+    Returns (principal messages to post with their final state, last update
+    per already existing message ts, thread replies per thread ts).
+    """
+    principals: Dict[str, Dict[str, Any]] = {}
+    updates: Dict[str, Dict[str, Any]] = {}
+    replies: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        args = record.get("args", {})
+        if record.get("op") == "chat_postMessage":
+            if args.get("thread_ts"):
+                replies.setdefault(args["thread_ts"], []).append(args)
+            else:
+                principals[record["ts"]] = dict(args)
+        elif record.get("op") == "chat_update":
+            ts = args.get("ts")
+            if ts in principals:
+                principals[ts].update(blocks=args.get("blocks"), text=args.get("text"))
+            else:
+                updates[ts] = args
+    ordered = [dict(args, journal_ts=ts) for ts, args in principals.items()]
+    return ordered, updates, replies
+
+
+def merge_replies(replies: List[Dict[str, Any]], max_chars: int = 30000) -> List[Tuple[Dict[str, Any], int]]:
+    """Merges consecutive thread replies into posts within Slack's block and size limits.
+
+    Returns each post with the number of replies it carries.
+    """
+    merged: List[Tuple[Dict[str, Any], int]] = []
+    current: Optional[Dict[str, Any]] = None
+    count = 0
+    chars = 0
+    for reply in replies:
+        blocks = reply.get("blocks") or []
+        size = len(json.dumps(blocks, ensure_ascii=False))
+        if current is not None and (
+            len(current["blocks"]) + len(blocks) > SLACK_MAX_BLOCKS or chars + size > max_chars
+        ):
+            merged.append((current, count))
+            current = None
+        if current is None:
+            current = dict(reply, blocks=list(blocks))
+            count = 1
+            chars = size
+        else:
+            current["blocks"].extend(blocks)
+            count += 1
+            chars += size
+    if current is not None:
+        merged.append((current, count))
+    return merged
+
+
+class JournalReplayer:
+    """Sends a coalesced journal through a Slack client, with the listener retry policy.
+
+    With ``progress_path``, every call that succeeds is recorded there (the
+    real ts of each principal message, the updates sent and how many replies
+    of each thread were posted), and a later replay skips them.
+    """
+
+    def __init__(self, client, retry_policy: Optional[RetryPolicy] = None,
+                 progress_path: Optional[str] = None) -> None:
+        self.client = client
+        self.retry_policy = retry_policy
+        self.progress_path = progress_path
+        saved = read_json(progress_path) if progress_path else None
+        saved = saved if isinstance(saved, dict) else {}
+        self.posted: Dict[str, str] = dict(saved.get("posted") or {})
+        self.updated: Dict[str, bool] = dict(saved.get("updated") or {})
+        self.replied: Dict[str, int] = dict(saved.get("replied") or {})
+        self.sent: Dict[str, int] = {"chat_postMessage": 0, "chat_update": 0}
+
+    @retry_on_slack_error()
+    def _call(self, method: str, **kwargs) -> Any:
+        response = getattr(self.client, method)(**kwargs)
+        self.sent[method] += 1
+        return response
+
+    def _save_progress(self) -> None:
+        if self.progress_path:
+            write_json_atomic(self.progress_path, {
+                "posted": self.posted, "updated": self.updated, "replied": self.replied
+            })
+
+    def replay(self, records) -> Dict[str, int]:
+        principals, updates, replies = plan_replay(records)
+        # Mapeia o ts sintético do journal para o ts real da mensagem publicada
+        for args in principals:
+            journal_ts = args.pop("journal_ts")
+            if journal_ts in self.posted:
+                continue
+            response = self._call("chat_postMessage", **args)
+            self.posted[journal_ts] = response["ts"]
+            self._save_progress()
+        for ts, args in updates.items():
+            if ts and not ts.startswith(JOURNAL_TS_PREFIX) and not self.updated.get(ts):
+                self._call("chat_update", **args)
+                self.updated[ts] = True
+                self._save_progress()
+        for thread_ts, thread_replies in replies.items():
+            if thread_ts not in self.posted and thread_ts.startswith(JOURNAL_TS_PREFIX):
+                # Mensagem principal ausente do journal: não há onde responder
+                continue
+            target = self.posted.get(thread_ts, thread_ts)
+            # Respostas já publicadas num reenvio anterior ficam de fora
+            for reply, count in merge_replies(thread_replies[self.replied.get(thread_ts, 0):]):
+                self._call("chat_postMessage", **dict(reply, thread_ts=target))
+                self.replied[thread_ts] = self.replied.get(thread_ts, 0) + count
+                self._save_progress()
+        return dict(self.sent)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="robot-slack-replay",
+        description="Send a RobotSlackNotification offline journal to Slack."
+    )
+    parser.add_argument("journals", nargs="+", metavar="journal",
+                        help="path of a JSONL journal written in offline mode; "
+                             "the journals of one pabot run must be replayed together")
+    parser.add_argument("--token", help="Slack bot token (default: SLACK_API_TOKEN from robot_slack_config.py)")
+    parser.add_argument("--dry-run", action="store_true", help="only print what would be sent")
+    args = parser.parse_args(argv)
+
+    if args.dry_run:
+        records = read_journals(args.journals)
+        principals, updates, replies = plan_replay(records)
+        posts = sum(len(merge_replies(r)) for r in replies.values())
+        print(f"{len(args.journals)} journal(s), {len(records)} records -> {len(principals)} principal message(s), "
+              f"{len(updates)} update(s), {posts} thread reply post(s)")
+        return 0
+
+    token = args.token
+    retry_policy = None
+    client_args = {}
+    if token is None:
+        slack_config = load_slack_config()
+        if not slack_config:
+            print("robot_slack_config.py not found and no --token given", file=sys.stderr)
+            return 2
+        token = slack_config["token"]
+        retry_policy = RetryPolicy.from_config(slack_config)
+        if slack_config["api_url"]:
+            client_args["base_url"] = slack_config["api_url"]
+
+    import slack_sdk
+    client = slack_sdk.WebClient(token=token, timeout=30, **client_args)
+    records = read_journals(args.journals)
+    replayer = JournalReplayer(client, retry_policy, progress_path=progress_path(args.journals))
+    try:
+        sent = replayer.replay(records)
+    except SlackNotificationError as e:
+        print(f"Replay failed: {str(e)}", file=sys.stderr)
+        return 1
+    print(f"{len(args.journals)} journal(s), {len(records)} records replayed with {sum(sent.values())} Slack call(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
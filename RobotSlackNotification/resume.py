@@ -0,0 +1,138 @@
+from typing import Any, Dict, Iterable, Optional, Sequence, Set
+import glob
+import os
+import time
+
+from RobotSlackNotification.failures import error_fingerprint, normalize_error
+from RobotSlackNotification.storage import read_json, token_hash, write_json_atomic
+
+RUN_ID_ENV = "ROBOT_SLACK_RUN_ID"
+
+# Variáveis que identificam o build no CI e continuam iguais quando os testes falhos são reexecutados
+CI_RUN_ID_VARS = (
+    "GITHUB_RUN_ID",
+    "CI_PIPELINE_ID",
+    "BUILD_TAG",
+    "BUILD_BUILDID",
+    "CIRCLE_WORKFLOW_ID",
+    "BITBUCKET_BUILD_NUMBER",
+    "BUILDKITE_BUILD_ID",
+)
+
+# Opções do Robot que reexecutam apenas os testes/suites que falharam
+RERUN_OPTIONS = ("--rerunfailed", "--rerunfailedsuites", "-R", "-S")
+
+# Estados de execuções antigas são removidos depois deste prazo
+RUN_STATE_RETENTION_DAYS = 30
+
+
+def resolve_run_id(configured: Optional[str] = None) -> Optional[str]:
+    """RUN_ID from the config, ROBOT_SLACK_RUN_ID or the build ID of a known CI"""
+    if configured:
+        return str(configured)
+    if os.environ.get(RUN_ID_ENV):
+        return os.environ[RUN_ID_ENV]
+    for name in CI_RUN_ID_VARS:
+        if os.environ.get(name):
+            return f"{name}={os.environ[name]}"
+    return None
+
+
+def is_rerun(argv: Sequence[str]) -> bool:
+    """True if the Robot command line reruns failed tests or suites"""
+    return any(arg in RERUN_OPTIONS or arg.startswith("--rerunfailed") for arg in argv[1:])
+
+
+class ChannelResume:
+    """What a previous run with the same run ID left in one channel.
+
+    ``not_passed`` maps the tests that did not pass to their status; tests
+    missing from it passed (or are new), which holds for ``--rerunfailed``
+    since only failed tests run again. ``reported`` keeps the fingerprint of
+    the error already posted in the thread for each test.
+    """
+    __slots__ = ("resumed", "not_passed", "reported", "mentioned", "fixed", "still_failing")
+
+    def __init__(self, saved: Optional[Dict[str, Any]] = None) -> None:
+        saved = saved or {}
+        self.resumed = bool(saved)
+        self.not_passed: Dict[str, str] = dict(saved.get("not_passed") or {})
+        self.reported: Dict[str, str] = dict(saved.get("reported") or {})
+        self.mentioned: Set[str] = set(saved.get("mentioned") or [])
+        self.fixed: int = 0
+        self.still_failing: int = 0
+
+    def test_finished(self, test: str, status: str) -> Optional[str]:
+        """Records the new status of ``test`` and returns its previous status, if it did not pass"""
+        previous = self.not_passed.pop(test, None)
+        if previous == "FAIL":
+            if status == "PASS":
+                self.fixed += 1
+            elif status == "FAIL":
+                self.still_failing += 1
+        if status != "PASS":
+            self.not_passed[test] = status
+        return previous
+
+    def already_reported(self, test: str, error: str) -> bool:
+        """True if the same error of ``test`` is already in the thread; otherwise remembers it"""
+        fingerprint = error_fingerprint(normalize_error(error))
+        if self.reported.get(test) == fingerprint:
+            return True
+        self.reported[test] = fingerprint
+        return False
+
+    def claim_mentions(self, groups: Iterable[str]) -> Set[str]:
+        new_groups = set(groups) - self.mentioned
+        self.mentioned |= new_groups
+        return new_groups
+
+
+class RunState:
+    """Principal messages of a run, persisted so a rerun updates them instead of posting new ones.
+
+    One small JSON file per run ID and execution scope; each channel keeps
+    its message ts, counters, non-passed tests and reported errors.
+    """
+
+    def __init__(self, directory: str, run_id: str, scope: str) -> None:
+        self.directory = directory
+        self.run_id = run_id
+        self.path = os.path.join(directory, f"resume-{token_hash(f'{run_id}|{scope}')}.json")
+        self.channels: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> "RunState":
+        data = read_json(self.path)
+        if isinstance(data, dict) and isinstance(data.get("channels"), dict):
+            self.channels = data["channels"]
+        return self
+
+    def channel(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        saved = self.channels.get(channel_id)
+        return saved if isinstance(saved, dict) and saved.get("ts") else None
+
+    def update_channel(self, channel_id: str, ts: str, passed: int, failed: int, skipped: int,
+                       resume: ChannelResume) -> None:
+        self.channels[channel_id] = {
+            "ts": ts,
+            "passed": passed,
+            "failed": failed,
+            "skipped": skipped,
+            "not_passed": resume.not_passed,
+            "reported": resume.reported,
+            "mentioned": sorted(resume.mentioned)
+        }
+
+    def save(self) -> None:
+        write_json_atomic(self.path, {"version": 1, "run_id": self.run_id, "updated": time.time(),
+                                      "channels": self.channels})
+        self._prune()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - RUN_STATE_RETENTION_DAYS * 86400
+        for path in glob.glob(os.path.join(self.directory, "resume-*.json")):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
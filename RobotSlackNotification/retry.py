@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional
+import random
+
+# Erros permanentes: repetir a chamada nunca vai resolver
+DEFAULT_FATAL_ERRORS = frozenset({
+    "account_inactive",
+    "cant_update_message",
+    "channel_not_found",
+    "ekm_access_denied",
+    "invalid_arguments",
+    "invalid_auth",
+    "invalid_blocks",
+    "invalid_blocks_format",
+    "is_archived",
+    "message_not_found",
+    "missing_scope",
+    "msg_too_long",
+    "no_permission",
+    "no_text",
+    "not_authed",
+    "not_in_channel",
+    "restricted_action",
+    "team_access_not_granted",
+    "token_expired",
+    "token_revoked",
+    "too_many_attachments",
+})
+
+
+def slack_error_code(error: Exception) -> Optional[str]:
+    """Returns the Slack ``error`` field of a SlackApiError, if any"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return response.get("error")
+    except Exception:
+        return None
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Reads the Retry-After header sent by Slack on rate-limited responses"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for name, value in headers.items():
+        if name.lower() != "retry-after":
+            continue
+        if isinstance(value, (list, tuple)):
+            value = value[0] if value else None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def is_outage(error: Exception) -> bool:
+    """True for network errors and 5xx responses, which mean Slack is unreachable or down"""
+    if isinstance(error, OSError):
+        return True
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(status, int) and status >= 500
+
+
+@dataclass
+class RetryPolicy:
+    """How Slack calls are retried.
+
+    Fatal errors (bad token, unknown channel, invalid payload...) fail at once.
+    Other Slack and network errors are retried with capped exponential backoff
+    and jitter, or after the Retry-After delay sent by Slack. No retry is
+    scheduled past ``time_budget`` seconds from the first attempt.
+    """
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    jitter: float = 0.5
+    time_budget: Optional[float] = 60.0
+    fatal_errors: FrozenSet[str] = field(default_factory=lambda: DEFAULT_FATAL_ERRORS)
+
+    @classmethod
+    def from_config(cls, slack_config: Dict[str, Any]) -> "RetryPolicy":
+        return cls(
+            max_attempts=slack_config["retry_max_attempts"],
+            base_delay=slack_config["retry_base_delay"],
+            max_delay=slack_config["retry_max_delay"],
+            jitter=slack_config["retry_jitter"],
+            time_budget=slack_config["retry_time_budget"],
+            fatal_errors=DEFAULT_FATAL_ERRORS | frozenset(slack_config["retry_fatal_errors"])
+        )
+
+    def is_retryable(self, error: Exception) -> bool:
+        code = slack_error_code(error)
+        return code not in self.fatal_errors
+
+    def backoff(self, attempt: int) -> float:
+        """Capped exponential delay for the given (zero-based) attempt, with jitter"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        jitter = min(1.0, max(0.0, self.jitter))
+        return delay * (1 - jitter) + random.uniform(0, delay * jitter)
+
+    def next_delay(self, error: Exception, attempt: int) -> float:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return retry_after
+        return self.backoff(attempt)
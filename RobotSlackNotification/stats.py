@@ -0,0 +1,37 @@
+class SuiteStats:
+    """Pass/fail/skip counters and summed test time (s), updated in O(1) per test"""
+    __slots__ = ("passed", "failed", "skipped", "other", "elapsed")
+
+    def __init__(self) -> None:
+        self.passed: int = 0
+        self.failed: int = 0
+        self.skipped: int = 0
+        # Outros status (ex.: NOT RUN) não têm contador próprio, mas entram no total
+        self.other: int = 0
+        self.elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.passed + self.failed + self.skipped + self.other
+
+    def add(self, status: str, elapsed: float = 0.0) -> None:
+        if status == "PASS":
+            self.passed += 1
+        elif status == "FAIL":
+            self.failed += 1
+        elif status == "SKIP":
+            self.skipped += 1
+        else:
+            self.other += 1
+        self.elapsed += elapsed
+
+    def remove(self, status: str) -> None:
+        """Takes back a test counted before (e.g. by the run a rerun resumes)"""
+        if status == "PASS":
+            self.passed = max(0, self.passed - 1)
+        elif status == "FAIL":
+            self.failed = max(0, self.failed - 1)
+        elif status == "SKIP":
+            self.skipped = max(0, self.skipped - 1)
+        else:
+            self.other = max(0, self.other - 1)
@@ -0,0 +1,45 @@
+from typing import Any, Optional
+import hashlib
+import json
+import os
+import tempfile
+
+CACHE_DIR_ENV = "ROBOT_SLACK_CACHE_DIR"
+
+
+def default_cache_dir() -> str:
+    """Per-user cache directory, overridable with ROBOT_SLACK_CACHE_DIR"""
+    if os.environ.get(CACHE_DIR_ENV):
+        return os.environ[CACHE_DIR_ENV]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "robotframework-slacknotification")
+
+
+def token_hash(token: str) -> str:
+    """Short, non-reversible key derived from a Slack token"""
+    return hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:16]
+
+
+def read_json(path: str) -> Optional[Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """Writes ``data`` to a temporary file and renames it over ``path``"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
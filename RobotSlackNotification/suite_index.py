@@ -0,0 +1,74 @@
+from fnmatch import translate
+from typing import Dict, List, Pattern, Tuple
+import re
+
+REGEX_PREFIX = "re:"
+GLOB_CHARS = "*?["
+
+
+class _Node:
+    __slots__ = ("children", "groups")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        self.groups: List[str] = []
+
+
+class SuiteGroupIndex:
+    """Prefix index over SUITE_SLACK_GROUPS, built once per loaded config.
+
+    Plain keys (``"Top.Child"``) are stored in a trie of dotted suite names.
+    Keys containing glob characters (``"Top.*.Api"``) or starting with ``re:``
+    (``"re:.*Smoke$"``) are matched against every level of the suite path.
+    One walk over a suite longname answers both lookups, and results are
+    memoized per longname.
+    """
+
+    def __init__(self, suite_groups: Dict[str, List[str]]) -> None:
+        self._root = _Node()
+        self._patterns: List[Tuple[Pattern, List[str]]] = []
+        self._cache: Dict[str, Tuple[List[str], List[str]]] = {}
+        for key, groups in (suite_groups or {}).items():
+            groups = list(groups)
+            if key.startswith(REGEX_PREFIX):
+                self._patterns.append((re.compile(key[len(REGEX_PREFIX):]), groups))
+            elif any(char in key for char in GLOB_CHARS):
+                self._patterns.append((re.compile(translate(key)), groups))
+            else:
+                node = self._root
+                for part in key.split("."):
+                    node = node.children.setdefault(part, _Node())
+                node.groups.extend(groups)
+
+    def lookup(self, suite_longname: str) -> Tuple[List[str], List[str]]:
+        """Returns (groups of every level of the path, groups of the most specific level)"""
+        cached = self._cache.get(suite_longname)
+        if cached is not None:
+            return cached
+        all_groups: Dict[str, None] = {}
+        most_specific: List[str] = []
+        parts = suite_longname.split(".")
+        node = self._root
+        prefix = ""
+        for part in parts:
+            prefix = f"{prefix}.{part}" if prefix else part
+            level_groups: List[str] = []
+            if node is not None:
+                node = node.children.get(part)
+                if node is not None:
+                    level_groups.extend(node.groups)
+            for pattern, groups in self._patterns:
+                if pattern.fullmatch(prefix):
+                    level_groups.extend(groups)
+            if level_groups:
+                most_specific = level_groups
+                all_groups.update(dict.fromkeys(level_groups))
+        result = (list(all_groups), list(dict.fromkeys(most_specific)))
+        self._cache[suite_longname] = result
+        return result
+
+    def all_groups(self, suite_longname: str) -> List[str]:
+        return self.lookup(suite_longname)[0]
+
+    def most_specific_groups(self, suite_longname: str) -> List[str]:
+        return self.lookup(suite_longname)[1]
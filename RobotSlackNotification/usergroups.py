@@ -0,0 +1,46 @@
+from typing import Dict, Optional
+import os
+import time
+
+from RobotSlackNotification.storage import read_json, token_hash, write_json_atomic
+
+
+class UsergroupCache:
+    """On-disk cache of the usergroup handle -> ID map of a workspace.
+
+    One file per token hash and workspace (``team_id``, for tokens that reach
+    several workspaces of an Enterprise Grid org); entries older than ``ttl``
+    seconds are ignored.
+    """
+
+    def __init__(self, cache_dir: str, token: str, ttl: float = 86400, team_id: Optional[str] = None) -> None:
+        self.ttl = ttl
+        self.team_id = team_id
+        key = f"{token}|{team_id}" if team_id else token
+        self.path = os.path.join(cache_dir, f"usergroups-{token_hash(key)}.json")
+
+    def load(self) -> Optional[Dict[str, str]]:
+        if not self.ttl or self.ttl <= 0:
+            return None
+        data = read_json(self.path)
+        if not isinstance(data, dict):
+            return None
+        if time.time() - data.get("fetched_at", 0) > self.ttl:
+            return None
+        if self.team_id and data.get("team_id") not in (None, self.team_id):
+            return None
+        handles = data.get("handles")
+        return handles if isinstance(handles, dict) else None
+
+    def store(self, handles: Dict[str, str], team_id: Optional[str] = None) -> None:
+        if not self.ttl or self.ttl <= 0:
+            return
+        try:
+            write_json_atomic(self.path, {
+                "fetched_at": time.time(),
+                "team_id": team_id,
+                "handles": handles
+            })
+        except OSError:
+            # Cache é apenas otimização: falha de escrita não deve quebrar a execução
+            pass
@@ -0,0 +1,166 @@
+"""Measures the overhead RobotSlackNotification adds to a Robot Framework run.
+
+Synthetic suites are pushed through the listener hooks against a local fake
+Slack server, and compared with the same loop without the listener.
+
+Usage::
+
+    python -m benchmarks.bench_listener --tests 1000,10000,100000 --latency 0.05
+
+Reports, per suite size: added wall time per test, Slack API calls by
+method, rate-limited answers, bytes sent and peak Python memory.
+"""
+from typing import Any, Dict, List
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from robot.result import TestSuite as ResultSuite
+from robot.running import TestSuite as RunningSuite
+
+from benchmarks.fake_slack import FakeSlackServer
+
+CONFIG_TEMPLATE = '''
+SLACK_API_TOKEN = "xoxb-benchmark"
+SLACK_CHANNEL = "C0BENCH"
+SLACK_API_URL = {api_url!r}
+SUITE_SLACK_GROUPS = {{"Bench": ["grupo_dev"]}}
+ASYNC_DISPATCH = {async_dispatch!r}
+SLACK_TRANSPORT = {transport!r}
+UPDATE_MIN_INTERVAL = {update_interval!r}
+CACHE_DIR = {cache_dir!r}
+'''
+
+
+def build_suites(tests: int, suites: int, fail_every: int):
+    """Builds the running and result models of a synthetic run"""
+    data = RunningSuite(name="Bench")
+    result = ResultSuite(name="Bench")
+    per_suite = max(1, tests // suites)
+    created = 0
+    index = 0
+    while created < tests:
+        data_child = data.suites.create(name=f"Suite {index}")
+        result_child = result.suites.create(name=f"Suite {index}")
+        for _ in range(min(per_suite, tests - created)):
+            failed = fail_every and created % fail_every == 0
+            data_child.tests.create(name=f"Test {created}")
+            result_child.tests.create(
+                name=f"Test {created}",
+                status="FAIL" if failed else "PASS",
+                message=f"Expected 1 but got {created % 7}" if failed else "",
+                elapsed_time=0.01
+            )
+            created += 1
+        index += 1
+    return data, result
+
+
+def drive(listener, data, result) -> None:
+    """Calls the listener hooks in the order Robot Framework does"""
+    start_test = getattr(listener, "start_test", None)
+    listener.start_suite(data, result)
+    for data_child, result_child in zip(data.suites, result.suites):
+        listener.start_suite(data_child, result_child)
+        for data_test, result_test in zip(data_child.tests, result_child.tests):
+            if start_test:
+                start_test(data_test, result_test)
+            listener.end_test(data_test, result_test)
+        listener.end_suite(data_child, result_child)
+    listener.end_suite(data, result)
+    listener.close()
+
+
+class NullListener:
+    def start_suite(self, data, result): pass
+    def end_test(self, data, result): pass
+    def end_suite(self, data, result): pass
+    def close(self): pass
+
+
+def run_case(server: FakeSlackServer, tests: int, args, memory: bool) -> Dict[str, Any]:
+    import RobotSlackNotification
+    # Cada caso começa com a configuração e o cache zerados
+    RobotSlackNotification._CONFIG_CACHE.clear()
+    data, result = build_suites(tests, args.suites, args.fail_every)
+
+    started = time.perf_counter()
+    drive(NullListener(), data, result)
+    baseline = time.perf_counter() - started
+
+    server.reset()
+    if memory:
+        tracemalloc.start()
+    listener = RobotSlackNotification.RobotSlackNotification(test_title="Benchmark")
+    started = time.perf_counter()
+    drive(listener, data, result)
+    elapsed = time.perf_counter() - started
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        "tests": tests,
+        "wall_time_s": round(elapsed, 3),
+        "added_per_test_us": round((elapsed - baseline) / tests * 1e6, 1),
+        "api_calls": dict(server.calls),
+        "api_calls_total": sum(server.calls.values()),
+        "ratelimited": server.ratelimited,
+        "bytes_sent": server.bytes_received,
+        "peak_memory_mb": round(peak / 2 ** 20, 2) if peak is not None else None,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the RobotSlackNotification listener")
+    parser.add_argument("--tests", default="1000,10000,100000", help="comma separated suite sizes")
+    parser.add_argument("--suites", type=int, default=100, help="child suites per run")
+    parser.add_argument("--fail-every", type=int, default=100, help="every Nth test fails (0: none)")
+    parser.add_argument("--latency", type=float, default=0.02, help="fake Slack latency (s)")
+    parser.add_argument("--ratelimit-every", type=int, default=0, help="answer every Nth call with 429")
+    parser.add_argument("--retry-after", type=float, default=0.1)
+    parser.add_argument("--update-interval", type=float, default=1.0, help="UPDATE_MIN_INTERVAL")
+    parser.add_argument("--async-dispatch", action="store_true", help="enable ASYNC_DISPATCH")
+    parser.add_argument("--transport", choices=("sync", "async"), default="sync", help="SLACK_TRANSPORT")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.tests.split(",") if size]
+    results = []
+    with FakeSlackServer(latency=args.latency, ratelimit_every=args.ratelimit_every,
+                         retry_after=args.retry_after) as server:
+        workdir = tempfile.mkdtemp(prefix="slack-bench-")
+        with open(os.path.join(workdir, "robot_slack_config.py"), "w", encoding="utf-8") as f:
+            f.write(CONFIG_TEMPLATE.format(
+                api_url=server.url,
+                async_dispatch=args.async_dispatch,
+                transport=args.transport,
+                update_interval=args.update_interval,
+                cache_dir=os.path.join(workdir, "cache")
+            ))
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for tests in sizes:
+                row = run_case(server, tests, args, memory=False)
+                if not args.no_memory:
+                    row["peak_memory_mb"] = run_case(server, tests, args, memory=True)["peak_memory_mb"]
+                results.append(row)
+                print(json.dumps(row))
+                sys.stdout.flush()
+        finally:
+            os.chdir(previous_cwd)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
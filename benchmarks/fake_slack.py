@@ -0,0 +1,174 @@
+"""Local stand-in for the Slack Web API, for benchmarks and offline testing.
+
+Implements the methods used by RobotSlackNotification (chat.postMessage,
+chat.update, usergroups.list and the files upload flow) with configurable
+latency and rate limiting. Point the library at it with
+``SLACK_API_URL = "http://127.0.0.1:<port>/api/"`` in robot_slack_config.py.
+
+Run standalone: ``python -m benchmarks.fake_slack --port 8765 --latency 0.05``
+"""
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+import argparse
+import itertools
+import json
+import threading
+import time
+
+
+class FakeSlackServer:
+    """Threaded HTTP server answering like Slack.
+
+    ``latency`` delays every response (seconds). When ``ratelimit_every`` is
+    N > 0, every Nth API call is answered with HTTP 429, ``ratelimited`` and
+    a ``Retry-After`` of ``retry_after`` seconds. While ``down`` is True,
+    every call is answered with HTTP 503. With ``keep_requests``, the method
+    and parameters of every answered call are kept in ``requests``, in the
+    order they arrived (tests use it; benchmarks leave it off).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 ratelimit_every: int = 0, retry_after: float = 1, keep_requests: bool = False) -> None:
+        self.latency = latency
+        self.ratelimit_every = ratelimit_every
+        self.retry_after = retry_after
+        self.keep_requests = keep_requests
+        self.down = False
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+        self.calls: Counter = Counter()
+        self.ratelimited: int = 0
+        self.bytes_received: int = 0
+        self._ts = itertools.count(1)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    def start(self) -> "FakeSlackServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.requests.clear()
+            self.ratelimited = 0
+            self.bytes_received = 0
+
+    def __enter__(self) -> "FakeSlackServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _answer(self, method: str, params: Dict[str, Any]):
+        """Returns (status, headers, body) for an API call"""
+        if self.down:
+            return 503, {}, {"ok": False, "error": "service_unavailable"}
+        with self._lock:
+            self.calls[method] += 1
+            total = sum(self.calls.values())
+            limited = self.ratelimit_every > 0 and total % self.ratelimit_every == 0
+            if limited:
+                self.ratelimited += 1
+            ts = f"{int(time.time())}.{next(self._ts):06d}"
+            if self.keep_requests and not limited:
+                self.requests.append((method, params))
+        if limited:
+            return 429, {"Retry-After": str(self.retry_after)}, {"ok": False, "error": "ratelimited"}
+        channel = params.get("channel", "C0FAKE")
+        if method == "chat.postMessage":
+            return 200, {}, {"ok": True, "channel": channel, "ts": ts, "message": {"ts": ts}}
+        if method == "chat.update":
+            return 200, {}, {"ok": True, "channel": channel, "ts": params.get("ts")}
+        if method == "usergroups.list":
+            return 200, {}, {"ok": True, "usergroups": [
+                {"id": "S0FAKEDEV", "handle": "grupo_dev", "team_id": "T0FAKE"},
+                {"id": "S0FAKETEST", "handle": "grupo_test", "team_id": "T0FAKE"}
+            ]}
+        if method == "files.getUploadURLExternal":
+            file_id = f"F{ts.replace('.', '')}"
+            return 200, {}, {"ok": True, "file_id": file_id, "upload_url": f"{self.url}upload/{file_id}"}
+        if method == "files.completeUploadExternal":
+            return 200, {}, {"ok": True, "files": [{"id": "F0FAKE", "title": "file"}]}
+        if method == "auth.test":
+            return 200, {}, {"ok": True, "team_id": "T0FAKE", "user_id": "U0FAKE"}
+        return 200, {}, {"ok": False, "error": "unknown_method"}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                with server._lock:
+                    server.bytes_received += len(body)
+                if server.latency:
+                    time.sleep(server.latency)
+                url = urlparse(self.path)
+                if url.path.startswith("/api/upload/"):
+                    self._send(200, {}, b"OK", "text/plain")
+                    return
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if body:
+                    if (self.headers.get("Content-Type") or "").startswith("application/json"):
+                        params.update(json.loads(body))
+                    else:
+                        params.update({k: v[0] for k, v in parse_qs(body.decode("utf-8")).items()})
+                method = url.path.rsplit("/", 1)[-1]
+                status, headers, payload = server._answer(method, params)
+                self._send(status, headers, json.dumps(payload).encode("utf-8"), "application/json")
+
+            def _send(self, status: int, headers: Dict[str, str], body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _handle
+            do_POST = _handle
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Slack Web API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--ratelimit-every", type=int, default=0, help="answer every Nth call with 429")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After value of 429 answers")
+    args = parser.parse_args()
+    server = FakeSlackServer(args.host, args.port, args.latency, args.ratelimit_every, args.retry_after)
+    print(f"Fake Slack API listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(dict(server.calls))
+
+
+if __name__ == "__main__":
+    main()
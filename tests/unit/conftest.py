@@ -0,0 +1,112 @@
+import json
+import sys
+
+import pytest
+from robot.result import TestSuite as ResultSuite
+from robot.running import TestSuite as RunningSuite
+
+import RobotSlackNotification
+from RobotSlackNotification.resume import CI_RUN_ID_VARS, RUN_ID_ENV
+from benchmarks.fake_slack import FakeSlackServer
+
+# Configuração mínima dos testes: sem esperas longas, sem threads além das do próprio teste
+BASE_CONFIG = {
+    "SLACK_API_TOKEN": "xoxb-test",
+    "SLACK_CHANNEL": "C0MAIN",
+    "SUITE_SLACK_GROUPS": {"Top": ["grupo_dev"]},
+    "UPDATE_MIN_INTERVAL": 0,
+    "RETRY_MAX_ATTEMPTS": 2,
+    "RETRY_BASE_DELAY": 0.01,
+    "RETRY_JITTER": 0,
+    "HEARTBEAT_INTERVAL": None,
+    "DURATION_HISTORY": False,
+}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def slack():
+    with FakeSlackServer(keep_requests=True) as server:
+        yield server
+
+
+@pytest.fixture
+def make_listener(tmp_path, monkeypatch, slack):
+    """Returns a factory of listeners reading a robot_slack_config.py written to tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["robot", "tests"])
+    for name in (RUN_ID_ENV,) + CI_RUN_ID_VARS:
+        monkeypatch.delenv(name, raising=False)
+
+    def make(**settings):
+        config = dict(BASE_CONFIG, SLACK_API_URL=slack.url, CACHE_DIR=str(tmp_path / "cache"), **settings)
+        (tmp_path / "robot_slack_config.py").write_text(
+            "".join(f"{name} = {value!r}\n" for name, value in config.items())
+        )
+        RobotSlackNotification._CONFIG_CACHE.clear()
+        return RobotSlackNotification.RobotSlackNotification()
+
+    yield make
+    RobotSlackNotification._CONFIG_CACHE.clear()
+
+
+class SuiteRun:
+    """Drives the listener hooks of one suite the way Robot calls them"""
+
+    def __init__(self, listener, name: str = "Top") -> None:
+        self.listener = listener
+        self.data = RunningSuite(name=name)
+        self.result = ResultSuite(name=name)
+
+    def __enter__(self) -> "SuiteRun":
+        self.data.tests.create(name="placeholder")
+        self.listener.start_suite(self.data, self.result)
+        return self
+
+    def test(self, name: str, status: str = "PASS", message: str = "") -> None:
+        data = self.data.tests.create(name=name)
+        result = self.result.tests.create(name=name, status=status, message=message)
+        self.listener.start_test(data, result)
+        self.listener.end_test(data, result)
+
+    def __exit__(self, *exc_info) -> None:
+        self.listener.end_suite(self.data, self.result)
+
+
+def run_suite(listener, tests, name: str = "Top") -> None:
+    """Runs a suite with ``tests`` as (name, status, message) and closes the listener"""
+    with SuiteRun(listener, name) as suite:
+        for test in tests:
+            suite.test(*test)
+    listener.close()
+
+
+def thread_posts(server, channel=None):
+    """Text of the replies posted in threads, in the order Slack received them"""
+    return [
+        _blocks_text(params) for method, params in server.requests
+        if method == "chat.postMessage" and params.get("thread_ts")
+        and (channel is None or params.get("channel") == channel)
+    ]
+
+
+def principal_posts(server):
+    return [params for method, params in server.requests
+            if method == "chat.postMessage" and not params.get("thread_ts")]
+
+
+def _blocks_text(params) -> str:
+    blocks = params.get("blocks")
+    return blocks if isinstance(blocks, str) else json.dumps(blocks, ensure_ascii=False)
@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from RobotSlackNotification.async_transport import AsyncSlackTransport  # noqa: E402
+
+
+def test_calls_block_like_web_client_and_respect_max_in_flight(slack):
+    slack.latency = 0.1
+    transport = AsyncSlackTransport("xoxb-test", base_url=slack.url, max_in_flight=2)
+    try:
+        assert transport.chat_postMessage(channel="C0MAIN", text="hi")["ok"]
+        started = time.monotonic()
+        futures = [transport.submit("chat_postMessage", channel="C0MAIN", text=str(index)) for index in range(6)]
+        assert all(future.result(5)["ok"] for future in futures)
+        # Seis chamadas, duas por vez: ao menos três rodadas de latência
+        assert time.monotonic() - started >= 0.3
+    finally:
+        transport.close()
+    assert slack.calls["chat.postMessage"] == 7
+
+
+def test_request_timeout_is_raised_as_a_network_error(slack):
+    slack.latency = 2
+    transport = AsyncSlackTransport("xoxb-test", base_url=slack.url, timeout=0.2)
+    try:
+        # Como no WebClient, o timeout chega como OSError e segue a política de retry
+        with pytest.raises(OSError):
+            transport.chat_postMessage(channel="C0MAIN", text="hi")
+    finally:
+        transport.close()
+
+
+def test_closed_transport_refuses_new_calls(slack):
+    transport = AsyncSlackTransport("xoxb-test", base_url=slack.url)
+    transport.close()
+    with pytest.raises(RuntimeError):
+        transport.submit("chat_postMessage", channel="C0MAIN", text="hi")
@@ -0,0 +1,51 @@
+import json
+
+from RobotSlackNotification.batching import FailureBatcher
+
+
+def test_batch_is_released_when_full(clock):
+    batcher = FailureBatcher(max_failures=3, max_interval=60, clock=clock)
+    assert batcher.add("T1", "error 1") == []
+    assert batcher.add("T2", "error 2") == []
+    assert batcher.add("T3", "error 3") == []
+    ready = batcher.add("T4", "error 4")
+    assert len(ready) == 1
+    text = json.dumps(ready[0])
+    assert "T1" in text and "T3" in text and "T4" not in text
+
+
+def test_batch_is_due_after_the_interval(clock):
+    batcher = FailureBatcher(max_failures=10, max_interval=5, clock=clock)
+    batcher.add("T1", "error")
+    clock.now = 4.9
+    assert batcher.take_due() is None
+    clock.now = 5.0
+    assert "T1" in json.dumps(batcher.take_due())
+    assert batcher.take_due() is None
+
+
+def test_consecutive_failures_with_the_same_error_are_grouped(clock):
+    batcher = FailureBatcher(max_failures=2, max_interval=60, clock=clock)
+    for name in ("T1", "T2", "T3"):
+        assert batcher.add(name, "same error") == []
+    batch = batcher.take()
+    assert json.dumps(batch).count("same error") == 1
+
+
+def test_long_error_keeps_head_and_tail(clock):
+    batcher = FailureBatcher(max_error_chars=100, error_tail_chars=20, clock=clock)
+    batcher.add("T1", "head" + "x" * 1000 + "the tail")
+    text = json.dumps(batcher.take())
+    assert "head" in text and "the tail" in text
+    assert "x" * 200 not in text
+
+
+def test_batch_carries_the_full_text_of_the_errors_it_truncated(clock):
+    long_error = "head" + "x" * 1000 + "the tail"
+    batcher = FailureBatcher(max_error_chars=100, error_tail_chars=20, attach_truncated=True, clock=clock)
+    batcher.add("T1", long_error)
+    batcher.add("T2", "short error")
+    batcher.add("T3", long_error.upper(), duplicate_of="T0")
+    batch = batcher.take()
+    assert batch.attachments == [("T1", long_error)]
+    assert "Same error as: T0" in json.dumps(batch)
@@ -0,0 +1,63 @@
+import time
+
+from RobotSlackNotification.channels import ChannelRouter
+from RobotSlackNotification.ratelimit import TokenBucket
+
+from conftest import SuiteRun, principal_posts, thread_posts
+
+
+def test_most_specific_channel_wins():
+    router = ChannelRouter({"Top.Api": "C0API", "Top.Api.Admin*": "C0ADMIN"}, "C0MAIN")
+    assert router.channel_for("Top.Api.Users") == "C0API"
+    assert router.channel_for("Top.Api.Admin Panel") == "C0ADMIN"
+    assert router.channel_for("Top.Web") == "C0MAIN"
+
+
+def test_without_routes_everything_goes_to_the_default_channel():
+    router = ChannelRouter({}, "C0MAIN")
+    assert not router.enabled
+    assert router.channel_for("Top.Api") == "C0MAIN"
+
+
+def test_token_bucket_refills_over_time(clock):
+    bucket = TokenBucket(rate=1, burst=2, clock=clock)
+    assert [bucket.try_acquire(), bucket.try_acquire()] == [0.0, 0.0]
+    assert bucket.try_acquire() == 1.0
+    clock.now = 1.0
+    assert bucket.try_acquire() == 0.0
+
+
+def test_each_routed_suite_gets_its_own_message_and_thread(make_listener, slack):
+    listener = make_listener(SUITE_SLACK_CHANNELS={"Top.Api": "C0API"}, FAILURE_BATCH_SIZE=1)
+    top = SuiteRun(listener, "Top")
+    with top:
+        with SuiteRun(listener, "Top.Api") as api:
+            api.test("Get user", "FAIL", "404")
+        with SuiteRun(listener, "Top.Web") as web:
+            web.test("Login", "FAIL", "timeout")
+    listener.close()
+    assert sorted(params["channel"] for params in principal_posts(slack)) == ["C0API", "C0MAIN"]
+    assert any("Get user" in post for post in thread_posts(slack, "C0API"))
+    assert not any("Login" in post for post in thread_posts(slack, "C0API"))
+    assert any("Login" in post for post in thread_posts(slack, "C0MAIN"))
+
+
+def test_idle_ticks_do_not_spend_the_channel_budget(make_listener):
+    listener = make_listener(ASYNC_DISPATCH=True, CHANNEL_RATE_LIMIT=60, RATE_LIMIT_BURST=5, UPDATE_MIN_INTERVAL=0.05)
+    with SuiteRun(listener):
+        assert listener.dispatcher.flush(5)
+        state = listener._current_channel()
+        state.budget.tokens = state.budget.burst
+        # Vários ticks sem lote nem atualização pendente
+        time.sleep(0.5)
+        assert state.budget.try_acquire() == 0.0
+        assert state.budget.tokens >= state.budget.burst - 1
+    listener.close()
+
+
+def test_channel_budget_needs_the_dispatcher(make_listener, capfd):
+    listener = make_listener(CHANNEL_RATE_LIMIT=60)
+    with SuiteRun(listener):
+        assert listener._current_channel().budget is None
+    listener.close()
+    assert "CHANNEL_RATE_LIMIT requires ASYNC_DISPATCH" in capfd.readouterr().out
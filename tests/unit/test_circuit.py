@@ -0,0 +1,112 @@
+import time
+
+from RobotSlackNotification.circuit import CircuitBreaker
+
+from conftest import SuiteRun, thread_posts
+
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+
+
+def test_slow_call_counts_as_failure(clock):
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_seconds=2, clock=clock)
+    breaker.record_success(latency=5)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_lets_a_single_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 30
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.closed
+
+
+def test_failed_probe_opens_the_circuit_again(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_released_probe_lets_the_next_call_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+def _spool_failures(listener, state, count):
+    for index in range(count):
+        listener._circuit_spool.append(
+            (listener._post_thread_message, (None, [_section(f"spooled {index}")], state.ts, state.channel_id))
+        )
+
+
+def _section(text):
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+def test_spool_larger_than_the_queue_drains_on_the_worker(make_listener, slack):
+    # drop_newest: com o defeito, o teste falha em vez de travar junto com o dispatcher
+    listener = make_listener(ASYNC_DISPATCH=True, DISPATCH_QUEUE_SIZE=5, DISPATCH_OVERFLOW="drop_newest",
+                             DISPATCH_FLUSH_TIMEOUT=2, UPDATE_MIN_INTERVAL=0.05)
+    with SuiteRun(listener) as suite:
+        assert listener.dispatcher.flush(5)
+        state = suite.listener._current_channel()
+        # O tick esvazia a fila de espera na thread do dispatcher: enviar para a própria fila cheia travaria
+        _spool_failures(listener, state, 20)
+        assert listener.dispatcher.flush(5)
+        deadline = time.monotonic() + 5
+        while listener._circuit_spool and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert listener.dispatcher.flush(5)
+    listener.close()
+    spooled = [post for post in thread_posts(slack) if "spooled" in post]
+    assert len(spooled) == 20
+    assert all(f'"spooled {index}"' in post for index, post in enumerate(spooled))
+
+
+def test_long_spool_drains_without_recursion(make_listener):
+    listener = make_listener(CIRCUIT_SPOOL_SIZE=5000)
+    sent = []
+    with SuiteRun(listener):
+        for index in range(3000):
+            listener._circuit_spool.append((sent.append, (index,)))
+        listener._dispatch(sent.append, "next")
+    listener.close()
+    assert sent == list(range(3000)) + ["next"]
+
+
+def test_calls_refused_while_slack_is_down_are_sent_when_it_returns(make_listener, slack):
+    listener = make_listener(
+        FAILURE_BATCH_SIZE=1, RETRY_MAX_ATTEMPTS=1, CIRCUIT_FAILURE_THRESHOLD=1, CIRCUIT_RESET_TIMEOUT=0.1
+    )
+    with SuiteRun(listener) as suite:
+        slack.down = True
+        for index in range(5):
+            suite.test(f"Down {index}", "FAIL", f"error {index}")
+        slack.down = False
+        time.sleep(0.15)
+        suite.test("Back", "FAIL", "error back")
+    listener.close()
+    posts = thread_posts(slack)
+    for name in ("Down 0", "Down 1", "Down 2", "Down 3", "Down 4", "Back"):
+        assert sum(f"Top.{name}" in post for post in posts) == 1
+    assert listener.circuit_breaker.closed
+    assert not listener._circuit_spool
@@ -0,0 +1,34 @@
+from RobotSlackNotification.coalescing import UpdateCoalescer
+
+
+def test_first_update_is_sent_at_once(clock):
+    coalescer = UpdateCoalescer(min_interval=1.0, clock=clock)
+    assert coalescer.offer("first") == "first"
+
+
+def test_updates_within_the_interval_collapse_into_the_latest(clock):
+    coalescer = UpdateCoalescer(min_interval=1.0, clock=clock)
+    coalescer.offer("first")
+    clock.now = 0.2
+    assert coalescer.offer("second") is None
+    clock.now = 0.5
+    assert coalescer.offer("third") is None
+    assert coalescer.take_due() is None
+    clock.now = 1.0
+    assert coalescer.take_due() == "third"
+    assert coalescer.take_due() is None
+
+
+def test_forced_update_is_sent_inside_the_interval(clock):
+    coalescer = UpdateCoalescer(min_interval=1.0, clock=clock)
+    coalescer.offer("first")
+    clock.now = 0.1
+    assert coalescer.offer("final", force=True) == "final"
+
+
+def test_take_releases_the_pending_update_regardless_of_the_interval(clock):
+    coalescer = UpdateCoalescer(min_interval=1.0, clock=clock)
+    coalescer.offer("first")
+    coalescer.offer("second")
+    assert coalescer.take() == "second"
+    assert coalescer.take() is None
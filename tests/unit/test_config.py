@@ -0,0 +1,33 @@
+import os
+
+import RobotSlackNotification
+from RobotSlackNotification import load_slack_config
+
+
+def _write_config(path, mtime, channel, **settings):
+    settings = dict(SLACK_API_TOKEN="xoxb-test", SLACK_CHANNEL=channel, **settings)
+    path.write_text("".join(f"{name} = {value!r}\n" for name, value in settings.items()))
+    # mtime explícito: sistemas de arquivos com resolução de 1 s não distinguiriam as duas escritas
+    os.utime(path, (mtime, mtime))
+
+
+def test_config_is_parsed_once_per_process(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(RobotSlackNotification, "_CONFIG_CACHE", {})
+    config_file = tmp_path / "robot_slack_config.py"
+    _write_config(config_file, 1000, "C0FIRST")
+    first = load_slack_config()
+    _write_config(config_file, 2000, "C0SECOND")
+    assert load_slack_config() is first
+    assert load_slack_config(reload=True)["channel_id"] == "C0SECOND"
+
+
+def test_auto_reload_picks_up_changes_only_when_the_file_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(RobotSlackNotification, "_CONFIG_CACHE", {})
+    config_file = tmp_path / "robot_slack_config.py"
+    _write_config(config_file, 1000, "C0FIRST", CONFIG_AUTO_RELOAD=True)
+    first = load_slack_config()
+    assert load_slack_config() is first
+    _write_config(config_file, 2000, "C0SECOND", CONFIG_AUTO_RELOAD=True)
+    assert load_slack_config()["channel_id"] == "C0SECOND"
@@ -0,0 +1,131 @@
+import threading
+import time
+
+from RobotSlackNotification.dispatcher import SlackDispatcher
+
+
+def test_calls_run_in_submission_order():
+    calls = []
+    dispatcher = SlackDispatcher()
+    for index in range(50):
+        dispatcher.submit(calls.append, index)
+    assert dispatcher.close(5)
+    assert calls == list(range(50))
+
+
+def test_drop_newest_discards_the_call_being_submitted():
+    gate = threading.Event()
+    calls = []
+    dispatcher = SlackDispatcher(max_size=2, overflow="drop_newest")
+    dispatcher.submit(gate.wait, 5)
+    time.sleep(0.05)
+    assert dispatcher.submit(calls.append, 1)
+    assert dispatcher.submit(calls.append, 2)
+    assert not dispatcher.submit(calls.append, 3)
+    gate.set()
+    assert dispatcher.close(5)
+    assert calls == [1, 2]
+    assert dispatcher.dropped == 1
+
+
+def test_drop_oldest_makes_room_for_the_new_call():
+    gate = threading.Event()
+    calls = []
+    dispatcher = SlackDispatcher(max_size=2, overflow="drop_oldest")
+    dispatcher.submit(gate.wait, 5)
+    time.sleep(0.05)
+    for index in (1, 2, 3):
+        assert dispatcher.submit(calls.append, index)
+    gate.set()
+    assert dispatcher.close(5)
+    assert calls == [2, 3]
+    assert dispatcher.dropped == 1
+
+
+def test_calls_with_the_same_key_keep_their_order_across_workers():
+    calls = {key: [] for key in "abcd"}
+    running = set()
+    overlaps = []
+    lock = threading.Lock()
+
+    def call(key, index):
+        with lock:
+            if key in running:
+                overlaps.append(key)
+            running.add(key)
+        time.sleep(0.001)
+        with lock:
+            running.discard(key)
+        calls[key].append(index)
+
+    dispatcher = SlackDispatcher(workers=4)
+    for index in range(40):
+        for key in calls:
+            dispatcher.submit(call, key, index, order_key=key)
+    assert dispatcher.close(10)
+    assert not overlaps
+    assert all(indexes == list(range(40)) for indexes in calls.values())
+
+
+def test_throttled_key_does_not_hold_back_other_keys():
+    calls = []
+    budget = {"noisy": 2}
+
+    def throttle(key):
+        if key != "noisy":
+            return 0.0
+        if budget["noisy"]:
+            budget["noisy"] -= 1
+            return 0.0
+        return 0.05
+
+    dispatcher = SlackDispatcher(workers=1, throttle=throttle)
+    for index in range(5):
+        dispatcher.submit(calls.append, ("noisy", index), order_key="noisy")
+    dispatcher.submit(calls.append, ("quiet", 0), order_key="quiet")
+    deadline = time.monotonic() + 2
+    while ("quiet", 0) not in calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert calls == [("noisy", 0), ("noisy", 1), ("quiet", 0)]
+    budget["noisy"] = 10
+    assert dispatcher.close(5)
+    assert [index for key, index in calls if key == "noisy"] == list(range(5))
+
+
+def test_ordered_block_waits_for_the_running_call_with_its_key():
+    events = []
+    started = threading.Event()
+
+    def slow_call():
+        started.set()
+        time.sleep(0.1)
+        events.append("call")
+
+    dispatcher = SlackDispatcher(workers=2)
+    dispatcher.submit(slow_call, order_key="thread")
+    started.wait(2)
+    with dispatcher.ordered("thread") as acquire:
+        events.append("block")
+    assert acquire()
+    assert events == ["call", "block"]
+    assert dispatcher.close(5)
+
+
+def test_tick_runs_on_the_worker_while_the_queue_is_idle():
+    ticks = []
+    dispatcher = SlackDispatcher(tick=lambda: ticks.append(threading.current_thread().name), tick_interval=0.05)
+    time.sleep(0.3)
+    assert dispatcher.close(5)
+    assert ticks and set(ticks) == {"RobotSlackNotification-dispatcher"}
+
+
+def test_ordered_block_takes_a_permit_only_when_asked():
+    permits = []
+    dispatcher = SlackDispatcher(throttle=lambda key: permits.append(key) or 0.0)
+    with dispatcher.ordered("thread"):
+        pass
+    assert permits == []
+    with dispatcher.ordered("thread") as acquire:
+        assert acquire()
+    assert permits == ["thread"]
+    assert dispatcher.close(5)
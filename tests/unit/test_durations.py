@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from RobotSlackNotification.durations import DurationHistory, ProgressEstimator, format_duration
+
+from conftest import SuiteRun
+
+
+def _history(path, durations):
+    history = DurationHistory(str(path))
+    for test, duration in durations.items():
+        history.record(test, duration)
+    return history
+
+
+def test_eta_comes_from_the_history_and_follows_the_pace_of_the_run(tmp_path, clock):
+    history = _history(tmp_path / "durations.json", {"T1": 10.0, "T2": 30.0})
+    progress = ProgressEstimator(3, history, ["T1", "T2", "T3"], clock=clock)
+    # T3 não tem histórico: conta como a média dos testes conhecidos
+    assert progress.eta() == 60.0
+    clock.now = 20.0
+    progress.test_finished("T1")
+    # T1 levou o dobro do previsto: o restante também deve levar o dobro
+    assert progress.percent == 33
+    assert progress.eta() == pytest.approx(100.0)
+
+
+def test_eta_without_history_extrapolates_the_finished_tests(clock):
+    progress = ProgressEstimator(4, clock=clock)
+    assert progress.eta() is None
+    clock.now = 30.0
+    progress.test_finished("T1")
+    assert progress.eta() == 90.0
+
+
+def test_save_merges_the_runs_of_several_workers(tmp_path):
+    path = tmp_path / "durations.json"
+    _history(path, {"T1": 10.0}).save()
+    _history(path, {"T2": 20.0}).save()
+    merged = DurationHistory(str(path)).load()
+    assert (merged.mean("T1"), merged.mean("T2")) == (10.0, 20.0)
+
+
+def test_least_recently_run_tests_are_evicted(tmp_path):
+    path = tmp_path / "durations.json"
+    history = DurationHistory(str(path), max_entries=2, retention_days=None)
+    for index, test in enumerate(("T1", "T2", "T3")):
+        history.record(test, 1.0)
+        history._updated[test][3] = 1000.0 + index
+    history.save()
+    assert sorted(json.loads(path.read_text())["tests"]) == ["T2", "T3"]
+
+
+def test_duration_format():
+    assert [format_duration(seconds) for seconds in (42, 125, 3725)] == ["42s", "2m 05s", "1h 02m"]
+
+
+def test_principal_message_shows_the_progress(make_listener, slack):
+    listener = make_listener(DURATION_HISTORY=True, SHOW_PROGRESS=True)
+    suite = SuiteRun(listener)
+    for name in ("T1", "T2", "T3"):
+        suite.data.tests.create(name=name)
+    # Quatro testes na suite, contando o placeholder criado pelo SuiteRun
+    with suite:
+        suite.test("T1")
+        updates = [json.dumps(params["blocks"]) for method, params in slack.requests if method == "chat.update"]
+        assert "25%" in updates[-1]
+    listener.close()
@@ -0,0 +1,42 @@
+from RobotSlackNotification.failure_store import FailureHistory
+
+from conftest import run_suite, thread_posts
+
+
+def _run(path, run_key, failures=(), passes=(), scope="C0MAIN|Top"):
+    history = FailureHistory(str(path), scope, run_key)
+    counts = [history.record_failure(test, error) for test, error in failures]
+    fixed = [test for test in passes if history.record_pass(test)]
+    history.close()
+    return counts, fixed
+
+
+def test_failure_is_known_across_runs_despite_volatile_details(tmp_path):
+    path = tmp_path / "history.sqlite"
+    assert _run(path, "run-1", [("T1", "Timeout after 30 s at 0x7f3a")]) == ([0], [])
+    assert _run(path, "run-2", [("T1", "Timeout after 45 s at 0x1b2c")]) == ([1], [])
+    counts, _ = _run(path, "run-3", [("T1", "Timeout after 10 s at 0x0"), ("T1", "Timeout after 10 s at 0x0")])
+    assert counts == [2, 2]
+    assert _run(path, "run-4", [("T1", "Element not found")]) == ([0], [])
+
+
+def test_only_tests_that_failed_in_the_previous_run_are_fixed(tmp_path):
+    path = tmp_path / "history.sqlite"
+    _run(path, "run-1", [("T1", "boom")])
+    _run(path, "run-2", [("T2", "boom")])
+    assert _run(path, "run-3", passes=["T1", "T2"]) == ([], ["T2"])
+
+
+def test_scopes_keep_their_own_history(tmp_path):
+    path = tmp_path / "history.sqlite"
+    _run(path, "run-1", [("T1", "boom")], scope="C0MAIN|Top")
+    assert _run(path, "run-2", [("T1", "boom")], scope="C0OTHER|Top") == ([0], [])
+
+
+def test_known_failure_takes_a_single_line_in_the_thread(make_listener, slack):
+    run_suite(make_listener(FAILURE_HISTORY=True), [("T1", "FAIL", "boom 1")])
+    slack.reset()
+    run_suite(make_listener(FAILURE_HISTORY=True), [("T1", "FAIL", "boom 2")])
+    posts = thread_posts(slack)
+    assert any("Known failures" in post and "1 previous run(s)" in post for post in posts)
+    assert not any("boom" in post for post in posts)
@@ -0,0 +1,43 @@
+import io
+
+from robot import run
+
+from RobotSlackNotification.from_output import main, parse_output
+from RobotSlackNotification.journal import read_journal
+
+SUITE = """*** Test Cases ***
+T1
+    No Operation
+T2
+    Fail    error 2
+T3
+    Skip    not now
+T4
+    Fail    error 4
+"""
+
+
+def _output(tmp_path):
+    (tmp_path / "top.robot").write_text(SUITE)
+    run(str(tmp_path / "top.robot"), outputdir=str(tmp_path), log=None, report=None,
+        stdout=io.StringIO(), stderr=io.StringIO())
+    return str(tmp_path / "output.xml")
+
+
+def test_failures_are_handed_over_while_parsing(tmp_path):
+    failures = []
+    summary = parse_output(_output(tmp_path), max_error_chars=100,
+                           on_failure=lambda name, message, fingerprint: failures.append((name, message)))
+    assert failures == [("Top.T2", "error 2"), ("Top.T4", "error 4")]
+    assert (summary.stats.passed, summary.stats.failed, summary.stats.skipped) == (1, 2, 1)
+    assert summary.top_status == "FAIL"
+
+
+def test_report_is_written_to_the_journal(make_listener, tmp_path):
+    make_listener()
+    journal = str(tmp_path / "report.jsonl")
+    assert main([_output(tmp_path), "--journal", journal]) == 0
+    records = list(read_journal(journal))
+    assert "thread_ts" not in records[0]["args"]
+    replies = "".join(str(record["args"]["blocks"]) for record in records[1:])
+    assert 0 < replies.index("Top.T2") < replies.index("Top.T4")
@@ -0,0 +1,58 @@
+import json
+import threading
+import time
+
+from RobotSlackNotification.heartbeat import Heartbeat
+from RobotSlackNotification.messages import RUNNING_TESTS_LISTED
+
+from conftest import SuiteRun
+
+
+def test_heartbeat_beats_until_stopped_and_reports_errors():
+    beats = []
+    errors = []
+    beaten = threading.Event()
+
+    def beat():
+        beats.append(1)
+        if len(beats) >= 3:
+            beaten.set()
+        raise RuntimeError("boom")
+
+    heartbeat = Heartbeat(1, beat, on_error=errors.append)
+    heartbeat.interval = 0.01
+    heartbeat.start()
+    assert beaten.wait(2)
+    heartbeat.stop()
+    count = len(beats)
+    time.sleep(0.05)
+    assert len(beats) == count
+    assert len(errors) >= 3 and all(isinstance(error, RuntimeError) for error in errors)
+
+
+def test_running_tests_are_listed_longest_first_with_a_warning(make_listener):
+    listener = make_listener(LONG_RUNNING_TEST_SECONDS=600)
+    with SuiteRun(listener):
+        state = listener.channels["C0MAIN"]
+        now = time.time()
+        state.running["Top.Quick"] = ("Quick", now - 5)
+        state.running["Top.Slow"] = ("Slow", now - 700)
+        assert listener._running_text(state) == "Slow for 11m ⚠️ long-running, Quick for <1m"
+        for index in range(RUNNING_TESTS_LISTED + 2):
+            state.running[f"Top.T{index}"] = (f"T{index}", now)
+        assert listener._running_text(state).endswith(", and 4 more")
+        state.running.clear()
+    listener.close()
+
+
+def test_heartbeat_refreshes_the_message_while_a_test_runs(make_listener, slack):
+    listener = make_listener()
+    with SuiteRun(listener) as suite:
+        data = suite.data.tests.create(name="Slow")
+        listener.start_test(data, suite.result.tests.create(name="Slow"))
+        slack.reset()
+        listener._heartbeat()
+        updates = [json.dumps(params["blocks"]) for method, params in slack.requests if method == "chat.update"]
+        assert updates and "Slow for <1m" in updates[-1]
+        listener.end_test(data, suite.result.tests[-1])
+    listener.close()
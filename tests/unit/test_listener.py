@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+
+import pytest
+
+import RobotSlackNotification
+
+from conftest import SuiteRun, principal_posts, run_suite, thread_posts
+
+
+def test_sync_mode_posts_due_batch_before_the_suite_ends(make_listener, slack):
+    listener = make_listener(FAILURE_BATCH_INTERVAL=0.05)
+    with SuiteRun(listener) as suite:
+        suite.test("Broken", "FAIL", "boom")
+        time.sleep(0.1)
+        suite.test("Next", "PASS")
+        # Sem dispatcher, o lote vencido sai no fim do teste seguinte, não só no fim da suite
+        assert any("Top.Broken" in post for post in thread_posts(slack))
+    listener.close()
+
+
+def test_heartbeat_and_listener_release_each_failure_once_and_in_order(make_listener, slack):
+    listener = make_listener(FAILURE_BATCH_INTERVAL=0.001)
+    done = threading.Event()
+
+    def heartbeat():
+        while not done.is_set():
+            listener._post_due_batches()
+
+    with SuiteRun(listener) as suite:
+        batcher = listener.channels["C0MAIN"].batcher
+        take_due = batcher.take_due
+
+        def slow_take_due():
+            # Alarga a janela entre tirar o lote e enviá-lo, onde o listener poderia passar à frente
+            batch = take_due()
+            if batch:
+                time.sleep(0.005)
+            return batch
+
+        batcher.take_due = slow_take_due
+        thread = threading.Thread(target=heartbeat)
+        thread.start()
+        for index in range(40):
+            suite.test(f"T{index}", "FAIL", f"error {index}")
+            time.sleep(0.002)
+        done.set()
+        thread.join(5)
+    listener.close()
+    posts = thread_posts(slack)
+    failures = [index for post in posts for index in range(40) if f'Scenario: Top.T{index}"' in post]
+    assert failures == list(range(40))
+
+
+def test_failures_of_a_run_are_posted_in_the_thread_of_its_message(make_listener, slack):
+    listener = make_listener(FAILURE_BATCH_SIZE=2)
+    run_suite(listener, [("T1", "PASS", ""), ("T2", "FAIL", "error 2"), ("T3", "FAIL", "error 3")])
+    principal = principal_posts(slack)
+    assert len(principal) == 1
+    posts = thread_posts(slack)
+    assert any("Top.T2" in post and "Top.T3" in post for post in posts)
+    assert any("S0FAKEDEV" in post for post in posts)
+
+
+def test_async_transport_keeps_the_order_of_each_thread(make_listener, slack):
+    pytest.importorskip("aiohttp")
+    slack.latency = 0.01
+    listener = make_listener(SLACK_TRANSPORT="async", ASYNC_MAX_IN_FLIGHT=4, FAILURE_BATCH_SIZE=1)
+    run_suite(listener, [(f"T{index}", "FAIL", f"error {index}") for index in range(12)])
+    posts = thread_posts(slack)
+    failures = [index for post in posts for index in range(12) if f'Scenario: Top.T{index}"' in post]
+    assert failures == list(range(12))
+    # A menção aos grupos é a última resposta da thread
+    assert "S0FAKEDEV" in posts[-1]
+
+
+def test_fixed_test_is_reported_in_the_channel_that_ran_it(make_listener, slack):
+    settings = dict(FAILURE_HISTORY=True, SUITE_SLACK_CHANNELS={"Top.Api v1.2": "C0API"})
+    run_suite(make_listener(**settings), [("Get user", "FAIL", "boom")], name="Top.Api v1.2")
+    slack.reset()
+    run_suite(make_listener(**settings), [("Get user", "PASS", "")], name="Top.Api v1.2")
+    assert any("Get user" in post for post in thread_posts(slack, "C0API"))
+    assert not any("Get user" in post for post in thread_posts(slack, "C0MAIN"))
+
+
+def test_usergroups_are_cached_and_refetched_once_for_an_unknown_handle(make_listener, slack):
+    run_suite(make_listener(), [("T1", "FAIL", "boom")])
+    assert slack.calls["usergroups.list"] == 1
+    slack.reset()
+    run_suite(make_listener(), [("T1", "FAIL", "boom")])
+    assert slack.calls["usergroups.list"] == 0
+    slack.reset()
+    groups = {"Top": ["grupo_dev", "grupo_novo"]}
+    run_suite(make_listener(SUITE_SLACK_GROUPS=groups), [("T1", "FAIL", "boom")])
+    assert slack.calls["usergroups.list"] == 1
+
+
+def test_repeated_error_refers_to_the_first_test_and_full_text_follows_its_batch(make_listener, slack):
+    long_error = "Element not found " + "x" * 500
+    listener = make_listener(ERROR_MAX_CHARS=100, ERROR_TAIL_CHARS=20, ERROR_UPLOAD_FULL=True, FAILURE_BATCH_SIZE=2)
+    run_suite(listener, [("T1", "FAIL", long_error), ("T2", "FAIL", "Timeout"), ("T3", "FAIL", long_error)])
+    methods = [method for method, params in slack.requests]
+    # Um arquivo só: o T3 repete o erro do T1 e aponta para ele
+    assert methods.count("files.completeUploadExternal") == 1
+    texts = [json.dumps(params.get("blocks")) for method, params in slack.requests]
+    batch_with_t1 = next(index for index, text in enumerate(texts) if 'Top.T1"' in text)
+    assert batch_with_t1 < methods.index("files.getUploadURLExternal")
+    posts = thread_posts(slack)
+    assert not any("x" * 200 in post for post in posts)
+    assert any("Same error as: Top.T1" in post for post in posts)
+
+
+
+def test_listener_without_send_message_needs_no_config(tmp_path, monkeypatch, slack):
+    monkeypatch.chdir(tmp_path)
+    RobotSlackNotification._CONFIG_CACHE.clear()
+    listener = RobotSlackNotification.RobotSlackNotification(send_message=False)
+    run_suite(listener, [("T1", "FAIL", "boom")])
+    assert listener.config is None and listener.client is None
+    assert slack.requests == []
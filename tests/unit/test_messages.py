@@ -0,0 +1,25 @@
+import json
+
+from RobotSlackNotification.messages import PrincipalMessageRenderer
+
+
+def _render(renderer, context, failed=0):
+    return renderer.render(context, "https://ci/1", ("red_circle", "Failed"), "Running", 3, 3 - failed, failed, 0)
+
+
+def test_renderer_keeps_only_the_recent_headers():
+    renderer = PrincipalMessageRenderer()
+    for index in range(PrincipalMessageRenderer.MAX_TEMPLATES + 10):
+        _render(renderer, f"Suite {index}")
+    assert len(renderer._templates) == PrincipalMessageRenderer.MAX_TEMPLATES
+    assert ("Suite 0", "https://ci/1") not in renderer._templates
+
+
+def test_reused_header_renders_the_current_counters():
+    renderer = PrincipalMessageRenderer()
+    _render(renderer, "Top")
+    _render(renderer, "Other")
+    text = json.dumps(_render(renderer, "Top", failed=2))
+    assert "Top" in text and "Other" not in text
+    assert list(renderer._templates)[-1] == ("Top", "https://ci/1")
+    assert json.dumps(_render(PrincipalMessageRenderer(), "Top", failed=2)) == text
@@ -0,0 +1,57 @@
+import json
+
+from RobotSlackNotification.metrics import MeteredClient, SlackMetrics, payload_size
+
+from conftest import run_suite
+
+
+class FakeClient:
+    def chat_postMessage(self, **kwargs):
+        return {"ok": True, "ts": "1.0"}
+
+    def files_upload_v2(self, **kwargs):
+        raise ConnectionError("reset")
+
+
+def test_metered_client_records_calls_and_errors():
+    metrics = SlackMetrics()
+    client = MeteredClient(FakeClient(), metrics)
+    client.chat_postMessage(channel="C0MAIN", text="hello")
+    try:
+        client.files_upload_v2(channel="C0MAIN", content="x" * 1000)
+    except ConnectionError:
+        pass
+    operations = metrics.to_dict()["operations"]
+    assert operations["chat.postMessage"]["calls"] == 1
+    assert operations["files.upload"]["errors"] == 1
+    assert operations["files.upload"]["bytes_sent"] >= 1000
+
+
+def test_payload_size_does_not_serialize_file_contents():
+    blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": "hi"}}]
+    size = payload_size({"channel": "C0MAIN", "blocks": blocks, "content": "x" * 5_000_000})
+    assert size == len("C0MAIN") + len(json.dumps(blocks, ensure_ascii=False)) + 5_000_000
+
+
+def test_prometheus_output_has_counters_and_histogram():
+    metrics = SlackMetrics()
+    metrics.record_call("chat.update", 0.2, True, 100)
+    metrics.record_retry("chat.update", 1.0, True)
+    text = metrics.to_prometheus()
+    assert 'robot_slack_calls_total{operation="chat.update"} 1' in text
+    assert 'robot_slack_ratelimit_waits_total{operation="chat.update"} 1' in text
+    assert 'robot_slack_latency_seconds_bucket{operation="chat.update",le="0.25"} 1' in text
+
+
+def test_client_is_only_metered_with_a_metrics_output(make_listener, tmp_path):
+    listener = make_listener()
+    run_suite(listener, [("T1", "PASS", "")])
+    assert not isinstance(listener.client, MeteredClient)
+
+    path = tmp_path / "metrics.json"
+    listener = make_listener(METRICS_JSON_PATH=str(path))
+    run_suite(listener, [("T1", "PASS", "")])
+    assert isinstance(listener.client, MeteredClient)
+    operations = json.loads(path.read_text())["operations"]
+    assert operations["chat.postMessage"]["calls"] >= 1
+    assert operations["chat.postMessage"]["bytes_sent"] > 0
@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+
+from RobotSlackNotification.parallel import ParallelRun, pabot_run_key, prune_runs
+
+
+class FakePabotLib:
+    """In-process stand-in for the PabotLib remote server of one pabot run"""
+
+    def __init__(self) -> None:
+        self.values = {}
+        self.locks = {}
+        self._lock = threading.Lock()
+
+    def run_keyword(self, name, args, kwargs):
+        with self._lock:
+            if name == "acquire_lock":
+                if self.locks.get(args[0]) not in (None, args[1]):
+                    return False
+                self.locks[args[0]] = args[1]
+                return True
+            if name == "release_lock":
+                self.locks.pop(args[0], None)
+            elif name == "get_parallel_value_for_key":
+                return self.values.get(args[0], "")
+            elif name == "set_parallel_value_for_key":
+                self.values[args[0]] = args[1]
+            return None
+
+
+def test_workers_of_a_run_share_its_key():
+    pabotlib = FakePabotLib()
+    keys = set()
+    threads = [
+        threading.Thread(target=lambda caller: keys.add(pabot_run_key(caller, pabotlib)), args=(f"worker-{index}",))
+        for index in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(keys) == 1
+    assert keys.pop().startswith("pabot-")
+
+
+def test_new_run_gets_a_new_key():
+    # Duas execuções no mesmo diretório (e mesmo PID do pabot) não podem compartilhar a mensagem
+    first = pabot_run_key("1", FakePabotLib())
+    second = pabot_run_key("1", FakePabotLib())
+    assert first != second
+
+
+def test_only_the_first_worker_posts_the_principal_message(tmp_path):
+    posts = []
+    workers = [ParallelRun(str(tmp_path), f"w{index}") for index in range(3)]
+    timestamps = {worker.acquire_principal(lambda: posts.append(1) or "123.456") for worker in workers}
+    assert timestamps == {"123.456"}
+    assert len(posts) == 1
+    assert [worker.owner for worker in workers] == [True, False, False]
+
+
+def test_aggregate_sums_the_counters_of_every_worker(tmp_path):
+    first = ParallelRun(str(tmp_path), "w1")
+    second = ParallelRun(str(tmp_path), "w2")
+    first.publish(3, 1, 0, running=[("Slow test", 10.0)])
+    second.finish(2, 0, 1)
+    totals = first.aggregate()
+    assert (totals["passed"], totals["failed"], totals["skipped"]) == (5, 1, 1)
+    assert totals["active"] == 1
+    assert totals["running"] == [["Slow test", 10.0]]
+
+
+def test_updates_are_rate_limited_across_workers(tmp_path):
+    sent = []
+    first = ParallelRun(str(tmp_path), "w1")
+    second = ParallelRun(str(tmp_path), "w2")
+    first.publish(1, 0, 0)
+    second.publish(1, 0, 0)
+    assert first.send_update(lambda: sent.append("w1"), min_interval=60)
+    assert not second.send_update(lambda: sent.append("w2"), min_interval=60)
+    assert sent == ["w1"]
+
+
+def test_only_the_last_worker_to_finish_forces_an_update(tmp_path):
+    sent = []
+    first = ParallelRun(str(tmp_path), "w1")
+    second = ParallelRun(str(tmp_path), "w2")
+    first.publish(1, 0, 0)
+    second.publish(1, 0, 0)
+    assert first.send_update(lambda: sent.append("w1"), min_interval=60)
+    first.finish(1, 0, 0)
+    # Outro worker ainda está ativo: o fim deste não fura o intervalo
+    assert not first.send_update(lambda: sent.append("w1 final"), min_interval=60, force=True)
+    second.finish(1, 0, 0)
+    assert second.send_update(lambda: sent.append("w2 final"), min_interval=60, force=True)
+    assert sent == ["w1", "w2 final"]
+
+
+def test_update_in_flight_during_the_final_one_does_not_leave_a_stale_total(tmp_path):
+    first = ParallelRun(str(tmp_path), "w1")
+    second = ParallelRun(str(tmp_path), "w2")
+    first.publish(1, 0, 0)
+    second.publish(1, 0, 0)
+    messages = []
+
+    def slow_send():
+        totals = first.aggregate()
+        if not messages:
+            # Enquanto esta atualização está a caminho, todos terminam e a final é enviada
+            first.finish(1, 0, 0)
+            second.finish(2, 0, 0)
+            second.send_update(lambda: messages.append(second.aggregate()), min_interval=60, force=True)
+        messages.append(totals)
+
+    assert first.send_update(slow_send, min_interval=0)
+    assert messages[-1]["active"] == 0
+    assert messages[-1]["passed"] == 3
+
+
+def test_slow_send_does_not_hold_the_run_lock(tmp_path):
+    other = ParallelRun(str(tmp_path), "w2")
+    claimed = []
+
+    def slow_send():
+        thread = threading.Thread(target=lambda: claimed.append(other.claim_mentions({"grupo_dev"})), daemon=True)
+        thread.start()
+        thread.join(2)
+
+    ParallelRun(str(tmp_path), "w1").send_update(slow_send, min_interval=0)
+    assert claimed == [{"grupo_dev"}]
+
+
+def test_prune_removes_only_old_runs(tmp_path):
+    runs_dir = tmp_path / "runs"
+    old, recent, current = (runs_dir / name for name in ("pabot-old", "pabot-recent", "pabot-current"))
+    for run_dir in (old, recent, current):
+        run_dir.mkdir(parents=True)
+        (run_dir / "state.json").write_text("{}")
+    long_ago = time.time() - 30 * 86400
+    for path in (old / "state.json", old, current / "state.json", current):
+        os.utime(path, (long_ago, long_ago))
+    prune_runs(str(runs_dir), retention_days=7, keep=str(current))
+    assert sorted(path.name for path in runs_dir.iterdir()) == ["pabot-current", "pabot-recent"]
@@ -0,0 +1,53 @@
+import time
+
+import pytest
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+from RobotSlackNotification.ratelimit import RateLimitedClient, SharedTokenBucket
+from RobotSlackNotification.storage import read_json
+
+
+class SleepingClock:
+    """Fake clock whose sleep only advances the time"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _bucket(tmp_path, clock):
+    return SharedTokenBucket(str(tmp_path / "bucket.json"), rate=1.0, burst=2, clock=clock, sleep=clock.sleep)
+
+
+def test_processes_of_the_host_share_one_budget(tmp_path):
+    clock = SleepingClock()
+    first, second = _bucket(tmp_path, clock), _bucket(tmp_path, clock)
+    assert first.acquire() == 0.0
+    assert second.acquire() == 0.0
+    assert first.acquire() == pytest.approx(1.0)
+    assert second.acquire() == pytest.approx(1.0)
+
+
+def test_retry_after_pauses_every_process(tmp_path):
+    clock = SleepingClock()
+    first, second = _bucket(tmp_path, clock), _bucket(tmp_path, clock)
+    first.pause(5)
+    assert second.acquire() == pytest.approx(5.0)
+    assert first.acquire() == 0.0
+
+
+def test_rate_limited_response_pauses_the_method_bucket(tmp_path, slack):
+    slack.ratelimit_every = 1
+    slack.retry_after = 7
+    client = RateLimitedClient(WebClient(token="xoxb-test", base_url=slack.url), str(tmp_path), "xoxb-test")
+    with pytest.raises(SlackApiError):
+        client.chat_postMessage(channel="C0MAIN", text="hi")
+    state = read_json(client.bucket("chat.postMessage").path)
+    assert state["blocked_until"] - time.time() == pytest.approx(7, abs=1)
+    assert client.bucket("chat.update").path != client.bucket("chat.postMessage").path
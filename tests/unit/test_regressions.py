@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from RobotSlackNotification.durations import DurationHistory
+from RobotSlackNotification.messages import build_regressions_message
+
+from conftest import SuiteRun, thread_posts
+
+
+def _history(tmp_path, durations):
+    history = DurationHistory(str(tmp_path / "durations.json"), alpha=0.5)
+    for duration in durations:
+        history.record("T1", duration)
+    return history
+
+
+def test_slowdown_needs_enough_runs_ratio_and_margin(tmp_path):
+    history = _history(tmp_path, [10.0, 10.2, 9.8, 10.1, 9.9])
+    assert history.regression("T1", 30.0) is not None
+    # Acima da média, mas sem a proporção mínima ou fora do ruído habitual
+    assert history.regression("T1", 14.0) is None
+    assert history.regression("T1", 30.0, min_runs=6) is None
+    assert history.regression("T2", 30.0) is None
+
+
+def test_tiny_tests_are_not_reported_for_small_absolute_slowdowns(tmp_path):
+    history = _history(tmp_path, [0.1] * 5)
+    assert history.regression("T1", 0.9) is None
+    assert history.regression("T1", 1.5) is not None
+
+
+def test_regressions_are_listed_from_the_largest_slowdown():
+    blocks = build_regressions_message([("Top.A", 20.0, 10.0), ("Top.B", 50.0, 10.0)])
+    text = blocks[0]["text"]["text"]
+    assert text.index("Top.B") < text.index("Top.A")
+
+
+def test_slower_test_is_reported_in_the_thread(make_listener, slack):
+    settings = dict(DURATION_HISTORY=True, REGRESSION_MIN_RUNS=2)
+    for elapsed in (1.0, 1.0, 10.0):
+        slack.reset()
+        listener = make_listener(**settings)
+        with SuiteRun(listener) as suite:
+            data = suite.data.tests.create(name="T1")
+            result = suite.result.tests.create(name="T1", status="PASS")
+            result.elapsed_time = timedelta(seconds=elapsed)
+            listener.start_test(data, result)
+            listener.end_test(data, result)
+        listener.close()
+        posts = thread_posts(slack)
+        assert any("Top.T1" in post for post in posts) == (elapsed == 10.0)
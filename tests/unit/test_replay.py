@@ -0,0 +1,102 @@
+import glob
+
+import pytest
+from slack_sdk import WebClient
+
+from RobotSlackNotification import SlackNotificationError
+from RobotSlackNotification.journal import JournalClient, read_journal
+from RobotSlackNotification.replay import PROGRESS_SUFFIX, JournalReplayer, main
+from RobotSlackNotification.retry import RetryPolicy
+
+from conftest import principal_posts, run_suite, thread_posts
+
+# Falhas suficientes para que as respostas da thread não caibam num único post (50 blocos)
+TESTS = [("T1", "PASS", "")] + [(f"T{index}", "FAIL", f"error {index}") for index in range(2, 22)]
+
+
+class FlakyClient:
+    """Slack client that loses the connection on its ``fail_at``-th call"""
+
+    def __init__(self, client, fail_at: int) -> None:
+        self.client = client
+        self.fail_at = fail_at
+        self.calls = 0
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+
+        def call(**kwargs):
+            self.calls += 1
+            if self.calls == self.fail_at:
+                raise ConnectionError("connection reset")
+            return method(**kwargs)
+        return call
+
+
+@pytest.fixture
+def journals(make_listener, slack, tmp_path):
+    """Two offline runs, each with its own journal"""
+    for _ in range(2):
+        run_suite(make_listener(OFFLINE_MODE=True, FAILURE_BATCH_SIZE=1), TESTS)
+    assert slack.requests == []
+    return sorted(glob.glob(str(tmp_path / "robot_slack_journal-*.jsonl")))
+
+
+def test_each_offline_run_writes_its_own_journal(journals):
+    assert len(journals) == 2
+    for path in journals:
+        assert sum(record["op"] == "chat_postMessage" for record in read_journal(path)) > 1
+
+
+def test_replay_sends_every_run_once(journals, slack):
+    assert main(journals) == 0
+    assert len(principal_posts(slack)) == 2
+    posts = thread_posts(slack)
+    for name in ("T2", "T11", "T21"):
+        assert sum(f'Top.{name}"' in post for post in posts) == 2
+    sent = len(slack.requests)
+    assert main(journals) == 0
+    assert len(slack.requests) == sent
+
+
+def test_interrupted_replay_resumes_where_it_stopped(journals, slack):
+    path = journals[0]
+    client = WebClient(token="xoxb-test", base_url=slack.url)
+    JournalReplayer(client).replay(list(read_journal(path)))
+    expected = [(method, params.get("thread_ts") is None) for method, params in slack.requests]
+    assert len(expected) >= 3
+    slack.reset()
+
+    flaky = FlakyClient(client, fail_at=2)
+    with pytest.raises(SlackNotificationError):
+        JournalReplayer(flaky, RetryPolicy(max_attempts=1), progress_path=path + PROGRESS_SUFFIX).replay(
+            list(read_journal(path))
+        )
+    JournalReplayer(client, progress_path=path + PROGRESS_SUFFIX).replay(list(read_journal(path)))
+    assert [(method, params.get("thread_ts") is None) for method, params in slack.requests] == expected
+
+
+def test_replies_from_another_worker_journal_reach_the_shared_thread(tmp_path, slack, make_listener):
+    # Com PABOT_AGGREGATE, só o primeiro worker publica a mensagem; os outros respondem ao ts dela
+    make_listener()
+    owner = JournalClient(str(tmp_path / "robot_slack_journal-{run_id}.jsonl"))
+    worker = JournalClient(str(tmp_path / "robot_slack_journal-{run_id}.jsonl"))
+    ts = owner.chat_postMessage(channel="C0MAIN", blocks=[_section("started")], text="run")["ts"]
+    worker.chat_postMessage(channel="C0MAIN", blocks=[_section("failure in worker")], text="run", thread_ts=ts)
+    worker.chat_update(channel="C0MAIN", ts=ts, blocks=[_section("final totals")], text="run")
+    owner.close()
+    worker.close()
+
+    assert main([worker.path, owner.path]) == 0
+    principal = principal_posts(slack)
+    assert len(principal) == 1 and "final totals" in str(principal[0]["blocks"])
+    replies = [params for method, params in slack.requests if params.get("thread_ts")]
+    assert len(replies) == 1 and "failure in worker" in str(replies[0]["blocks"])
+    assert not replies[0]["thread_ts"].startswith("journal-")
+    sent = len(slack.requests)
+    assert main([owner.path, worker.path]) == 0
+    assert len(slack.requests) == sent
+
+
+def _section(text):
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
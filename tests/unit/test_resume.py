@@ -0,0 +1,65 @@
+import sys
+
+from RobotSlackNotification.resume import ChannelResume, RunState, is_rerun
+
+from conftest import principal_posts, run_suite, thread_posts
+
+
+def test_rerun_options_are_detected():
+    assert is_rerun(["robot", "--rerunfailed", "output.xml", "tests"])
+    assert is_rerun(["robot", "--rerunfailed=output.xml", "tests"])
+    assert is_rerun(["robot", "-R", "output.xml", "tests"])
+    assert not is_rerun(["robot", "--outputdir", "results", "tests"])
+
+
+def test_rerun_counts_fixed_and_still_failing_tests():
+    resume = ChannelResume({"ts": "1.0", "not_passed": {"T1": "FAIL", "T2": "FAIL"}})
+    assert resume.test_finished("T1", "PASS") == "FAIL"
+    assert resume.test_finished("T2", "FAIL") == "FAIL"
+    assert resume.test_finished("T3", "PASS") is None
+    assert (resume.fixed, resume.still_failing) == (1, 1)
+    assert resume.not_passed == {"T2": "FAIL"}
+
+
+def test_same_error_is_reported_once():
+    resume = ChannelResume()
+    assert not resume.already_reported("T1", "Element 'id=7' not found")
+    assert resume.already_reported("T1", "Element 'id=7' not found")
+    assert not resume.already_reported("T1", "Timeout")
+
+
+def test_run_state_survives_a_new_process(tmp_path):
+    resume = ChannelResume()
+    resume.test_finished("T1", "FAIL")
+    state = RunState(str(tmp_path), "build-1", "scope")
+    state.update_channel("C0MAIN", "1.0", 2, 1, 0, resume)
+    state.save()
+    saved = RunState(str(tmp_path), "build-1", "scope").load().channel("C0MAIN")
+    assert saved["ts"] == "1.0" and saved["not_passed"] == {"T1": "FAIL"}
+    assert RunState(str(tmp_path), "build-2", "scope").load().channel("C0MAIN") is None
+
+
+def test_rerun_updates_the_message_of_the_first_run(make_listener, slack, monkeypatch):
+    tests = [("T1", "PASS", ""), ("T2", "FAIL", "boom")]
+    run_suite(make_listener(RUN_ID="build-1"), tests)
+    first_ts = [params for method, params in slack.requests if method == "chat.update"][-1]["ts"]
+    slack.reset()
+    monkeypatch.setattr(sys, "argv", ["robot", "--rerunfailed", "output.xml", "tests"])
+    listener = make_listener(RUN_ID="build-1")
+    run_suite(listener, [("T2", "PASS", "")])
+    assert principal_posts(slack) == []
+    assert {params["ts"] for method, params in slack.requests if method == "chat.update"} == {first_ts}
+    state = listener.channels["C0MAIN"]
+    assert (state.stats.passed, state.stats.failed) == (2, 0)
+    assert not any("boom" in post for post in thread_posts(slack))
+
+
+def test_full_run_with_the_same_id_posts_a_new_message(make_listener, slack):
+    tests = [("T1", "PASS", ""), ("T2", "FAIL", "boom")]
+    run_suite(make_listener(RUN_ID="build-1"), tests)
+    slack.reset()
+    listener = make_listener(RUN_ID="build-1")
+    run_suite(listener, tests)
+    assert len(principal_posts(slack)) == 1
+    state = listener.channels["C0MAIN"]
+    assert (state.stats.passed, state.stats.failed) == (1, 1)
@@ -0,0 +1,93 @@
+import pytest
+from slack_sdk.errors import SlackApiError
+
+from RobotSlackNotification import CircuitOpenError, SlackNotificationError, retry_on_slack_error
+from RobotSlackNotification.circuit import CircuitBreaker
+from RobotSlackNotification.metrics import SlackMetrics
+from RobotSlackNotification.retry import RetryPolicy
+
+
+class FakeResponse(dict):
+    def __init__(self, error: str, status_code: int = 200, headers=None) -> None:
+        super().__init__(ok=False, error=error)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def slack_error(error: str, status_code: int = 200, headers=None) -> SlackApiError:
+    return SlackApiError(error, FakeResponse(error, status_code, headers))
+
+
+class Sender:
+    """Stands in for the listener: the decorator reads its policy, metrics and breaker"""
+
+    def __init__(self, errors, breaker=None) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+        self.retry_policy = RetryPolicy(max_attempts=3, base_delay=0, jitter=0)
+        self.metrics = SlackMetrics()
+        self.circuit_breaker = breaker
+
+    @retry_on_slack_error()
+    def send(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_network_error_is_retried():
+    sender = Sender([ConnectionError("reset"), slack_error("internal_error", 500)])
+    assert sender.send() == "ok"
+    assert sender.calls == 3
+
+
+def test_fatal_error_is_not_retried():
+    sender = Sender([slack_error("channel_not_found")])
+    with pytest.raises(SlackNotificationError, match="Non-retryable"):
+        sender.send()
+    assert sender.calls == 1
+
+
+def test_gives_up_after_max_attempts():
+    sender = Sender([ConnectionError("down")] * 5)
+    with pytest.raises(SlackNotificationError, match="after 3 attempts"):
+        sender.send()
+    assert sender.calls == 3
+
+
+def test_retry_after_of_rate_limited_response_is_honoured():
+    policy = RetryPolicy(base_delay=10, jitter=0)
+    error = slack_error("ratelimited", 429, {"Retry-After": "2"})
+    assert policy.next_delay(error, 0) == 2.0
+
+
+def test_retry_is_not_scheduled_past_the_time_budget():
+    sender = Sender([ConnectionError("down")] * 3)
+    sender.retry_policy = RetryPolicy(max_attempts=5, base_delay=10, jitter=0, time_budget=1)
+    with pytest.raises(SlackNotificationError, match="budget"):
+        sender.send()
+    assert sender.calls == 1
+
+
+def test_open_circuit_skips_the_call():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    sender = Sender([ConnectionError("down")] * 5, breaker)
+    with pytest.raises(CircuitOpenError):
+        sender.send()
+    assert breaker.state == CircuitBreaker.OPEN
+    calls = sender.calls
+    with pytest.raises(CircuitOpenError):
+        sender.send()
+    assert sender.calls == calls
+
+
+def test_unexpected_error_releases_the_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    sender = Sender([ValueError("bug in the caller")], breaker)
+    with pytest.raises(ValueError):
+        sender.send()
+    # Sem o release() o circuito ficaria meio aberto esperando uma sonda que nunca termina
+    assert sender.send() == "ok"
+    assert breaker.closed
@@ -0,0 +1,27 @@
+from RobotSlackNotification.stats import SuiteStats
+
+from conftest import run_suite
+
+
+def test_counters_follow_added_and_removed_tests():
+    stats = SuiteStats()
+    for status in ("PASS", "PASS", "FAIL", "SKIP"):
+        stats.add(status, 1.5)
+    stats.remove("PASS")
+    assert (stats.total, stats.passed, stats.failed, stats.skipped) == (3, 1, 1, 1)
+    assert stats.elapsed == 6.0
+
+
+def test_other_statuses_count_only_in_the_total():
+    stats = SuiteStats()
+    stats.add("PASS")
+    stats.add("NOT RUN")
+    assert (stats.total, stats.passed, stats.failed, stats.skipped) == (2, 1, 0, 0)
+    stats.remove("NOT RUN")
+    assert stats.total == 1
+
+
+def test_listener_counts_every_test_it_saw(make_listener):
+    listener = make_listener()
+    run_suite(listener, [("T1", "PASS", ""), ("T2", "FAIL", "boom"), ("T3", "SKIP", ""), ("T4", "NOT RUN", "")])
+    assert (listener.count_total, listener.count_pass, listener.count_failed, listener.count_skipped) == (4, 1, 1, 1)
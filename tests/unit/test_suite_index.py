@@ -0,0 +1,22 @@
+from RobotSlackNotification.suite_index import SuiteGroupIndex
+
+
+def test_plain_keys_match_every_level_of_the_path():
+    index = SuiteGroupIndex({"Top": ["qa"], "Top.Api": ["api"], "Top.Web": ["web"]})
+    assert index.all_groups("Top.Api.Users") == ["qa", "api"]
+    assert index.most_specific_groups("Top.Api.Users") == ["api"]
+    assert index.all_groups("Other.Api") == []
+
+
+def test_glob_and_regex_keys_match_suite_prefixes():
+    index = SuiteGroupIndex({"Top.*.Smoke": ["smoke"], "re:.*Payments$": ["payments"], "Top": ["qa"]})
+    assert index.all_groups("Top.Api.Smoke") == ["qa", "smoke"]
+    assert index.most_specific_groups("Top.Legacy.Payments.Refund") == ["payments"]
+    assert index.all_groups("Top.Api") == ["qa"]
+
+
+def test_lookups_are_memoized_per_longname():
+    index = SuiteGroupIndex({"Top": ["qa", "qa"]})
+    first = index.lookup("Top.Api")
+    assert index.lookup("Top.Api") is first
+    assert first == (["qa"], ["qa"])
@@ -0,0 +1,38 @@
+import json
+import time
+
+from RobotSlackNotification.usergroups import UsergroupCache
+
+
+def test_cached_handles_are_reused_until_they_expire(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("RobotSlackNotification.usergroups.time.time", lambda: now[0])
+    cache = UsergroupCache(str(tmp_path), "xoxb-test", ttl=60)
+    assert cache.load() is None
+    cache.store({"grupo_dev": "S0DEV"})
+    assert UsergroupCache(str(tmp_path), "xoxb-test", ttl=60).load() == {"grupo_dev": "S0DEV"}
+    now[0] += 61
+    assert cache.load() is None
+
+
+def test_each_token_and_workspace_has_its_own_file(tmp_path):
+    paths = {
+        UsergroupCache(str(tmp_path), "xoxb-a").path,
+        UsergroupCache(str(tmp_path), "xoxb-b").path,
+        UsergroupCache(str(tmp_path), "xoxb-a", team_id="T0OTHER").path,
+    }
+    assert len(paths) == 3
+    assert not any("xoxb" in path for path in paths)
+
+
+def test_disabled_or_corrupt_cache_is_ignored(tmp_path):
+    disabled = UsergroupCache(str(tmp_path), "xoxb-test", ttl=0)
+    disabled.store({"grupo_dev": "S0DEV"})
+    assert disabled.load() is None
+    cache = UsergroupCache(str(tmp_path), "xoxb-test")
+    with open(cache.path, "w") as f:
+        f.write("{not json")
+    assert cache.load() is None
+    with open(cache.path, "w") as f:
+        json.dump({"fetched_at": time.time(), "handles": []}, f)
+    assert cache.load() is None